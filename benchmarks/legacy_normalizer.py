@@ -0,0 +1,44 @@
+"""Per-call cost of converting legacy toast() arguments / 转换旧版toast()参数的单次调用开销
+
+Pure Python, runs without WinRT / 纯Python，无需WinRT即可运行:
+    python benchmarks/legacy_normalizer.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from windows11toast.legacy import legacy_spec  # noqa: E402
+from windows11toast.spec import ToastSpec  # noqa: E402
+
+CASES = {
+    'plain': dict(title='Hello', body='World'),
+    'parameterized': dict(title='Hello', body='World', image_src='hero.png', icon_src='icon.png',
+                          button_content='OK', input_id='reply'),
+    'legacy dicts': dict(
+        title='Hello', body='World',
+        icon={'src': 'icon.png', 'placement': 'appLogoOverride', 'hint-crop': 'circle'},
+        image={'src': 'hero.png', 'placement': 'hero'},
+        progress={'title': 'Download', 'status': 'Running', 'value': '0.5', 'valueStringOverride': '1/2'},
+        audio={'src': 'ms-winsoundevent:Notification.Reminder', 'loop': 'true'},
+        inputs=[{'id': 'name', 'placeHolderContent': 'Name'}, {'id': 'email', 'placeholder': 'Email'}],
+        selections=[['Yes', 'No'], {'input': {'id': 'when'}, 'selection': ['Now', 'Later']}],
+        buttons=['Accept', {'activationType': 'protocol', 'arguments': 'http:decline', 'content': 'Decline'}],
+    ),
+}
+
+
+def main(number: int = 20000) -> None:
+    print(f'{"case":<16}{"legacy_spec()":>16}{"ToastSpec()":>16}')
+    for name, kwargs in CASES.items():
+        legacy = min(timeit.repeat(lambda: legacy_spec(**kwargs), number=number, repeat=5)) / number
+        spec = legacy_spec(**kwargs)
+        fields = spec.as_dict()
+        direct = min(timeit.repeat(lambda: ToastSpec(**fields), number=number, repeat=5)) / number
+        print(f'{name:<16}{legacy * 1e6:>13.2f} us{direct * 1e6:>13.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,9 @@ A Pythonic library for creating Windows 10/11 toast notifications.
 一个用于创建 Windows 10/11 通知的 Pythonic 库。
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 # Import enums / 导入枚举
 from .enums import (
     ImagePlacement,
@@ -17,29 +20,190 @@ from .enums import (
 # Import constants / 导入常量
 from .constants import DEFAULT_APP_ID
 
-# Import core notification functions / 导入核心通知函数
-from .notification import (
-    notify,
-    toast,
-    toast_async,
-    atoast,
-    clear_toast
+# Import notification specs / 导入通知规格
+from .spec import (
+    ToastSpec,
+    ButtonSpec,
+    InputSpec,
+    SelectionSpec
+)
+
+# Import duplicate suppression / 导入重复抑制
+from .dedup import (
+    Deduplicator,
+    enable_dedup,
+    disable_dedup,
+    get_deduplicator
+)
+
+# Import rate limiting / 导入限流
+from .ratelimit import (
+    RateLimiter,
+    RateLimitExceeded,
+    enable_rate_limit,
+    disable_rate_limit,
+    get_rate_limiter
+)
+
+# Import render cache / 导入渲染缓存
+from .render_cache import (
+    RenderCache,
+    enable_render_cache,
+    disable_render_cache,
+    get_render_cache
+)
+
+# Import scheduler / 导入调度器
+from .scheduler import (
+    ToastScheduler,
+    get_scheduler
+)
+
+# Import payload validation / 导入负载校验
+from .validation import (
+    ToastPayloadError,
+    validate_payload,
+    estimate_payload_size,
+    enable_validation,
+    disable_validation,
+    get_validation_mode
+)
+
+# Import image asset pipeline / 导入图片资源管道
+from .assets import (
+    ImageAssetCache,
+    enable_image_pipeline,
+    disable_image_pipeline
+)
+
+# Import remote image cache / 导入远程图片缓存
+from .remote import (
+    RemoteImageCache,
+    RemoteImageTooLarge,
+    enable_remote_images,
+    disable_remote_images
 )
 
-# Import progress notification functions / 导入进度通知函数
-from .progress import (
-    notify_progress,
-    update_progress
+# Import timing instrumentation / 导入计时工具
+from .instrumentation import (
+    add_timing_hook,
+    remove_timing_hook,
+    enable_timing_buffer,
+    get_timings,
+    disable_timings
 )
 
-# Import media functions / 导入媒体函数
-from .media import (
-    play_sound,
-    speak,
-    recognize,
-    available_recognizer_languages
+# Import delivery metrics / 导入投递指标
+from .metrics import (
+    MetricsRegistry,
+    enable_metrics,
+    disable_metrics,
+    get_metrics
 )
 
+# Import WinRT executor settings / 导入WinRT执行器设置
+from .executor import (
+    enable_winrt_executor,
+    disable_winrt_executor,
+    get_winrt_executor
+)
+
+# Import shared progress state / 导入共享进度状态
+from .shared_progress import (
+    SharedProgressStore,
+    enable_shared_progress,
+    disable_shared_progress,
+    get_shared_progress
+)
+
+# Import traffic recording / 导入流量记录
+from .recording import (
+    Recorder,
+    enable_recording,
+    disable_recording,
+    get_recorder,
+    read_recording,
+    replay
+)
+
+# Import daemon client (no WinRT) / 导入守护进程客户端（无WinRT）
+from .client import (
+    ToastClient,
+    send_toast,
+    default_address
+)
+
+# WinRT-backed names are imported on first access, so WinRT-free modules such as the daemon
+# client can be used without loading WinRT / 依赖WinRT的名称在首次访问时才导入，
+# 因此守护进程客户端等不依赖WinRT的模块无需加载WinRT即可使用
+_LAZY_IMPORTS = {
+    # Core notification functions / 核心通知函数
+    'notify': '.notification',
+    'notify_async': '.notification',
+    'toast': '.notification',
+    'toast_async': '.notification',
+    'atoast': '.notification',
+    'clear_toast': '.notification',
+    'cancel_scheduled': '.notification',
+    # Progress notification functions / 进度通知函数
+    'notify_progress': '.progress',
+    'update_progress': '.progress',
+    'update_progress_async': '.progress',
+    'toast_progress': '.progress',
+    'ProgressManager': '.progress_manager',
+    'ProgressBar': '.progress_manager',
+    'PoolProgress': '.progress_pool',
+    'ProgressReporter': '.progress_pool',
+    # Notification history functions / 通知历史函数
+    'list_toasts': '.history',
+    'clear_many': '.history',
+    'prune_toasts': '.history',
+    # Digest mode / 摘要模式
+    'DigestNotifier': '.digest',
+    'default_digest_renderer': '.digest',
+    # Daemon / 守护进程
+    'serve': '.daemon',
+    'ToastDaemon': '.daemon',
+    # Registered XML templates / 已注册的XML模板
+    'TemplateCache': '.templates',
+    'register_template': '.templates',
+    'unregister_template': '.templates',
+    'invalidate_templates': '.templates',
+    'get_template_cache': '.templates',
+    # Media functions / 媒体函数
+    'play_sound': '.media',
+    'speak': '.media',
+    'recognize': '.media',
+    'recognize_frames': '.media',
+    'available_recognizer_languages': '.media',
+}
+
+if TYPE_CHECKING:
+    from .notification import notify, notify_async, toast, toast_async, atoast, clear_toast, cancel_scheduled
+    from .progress import notify_progress, update_progress, update_progress_async, toast_progress
+    from .progress_manager import ProgressManager, ProgressBar
+    from .progress_pool import PoolProgress, ProgressReporter
+    from .history import list_toasts, clear_many, prune_toasts
+    from .digest import DigestNotifier, default_digest_renderer
+    from .daemon import serve, ToastDaemon
+    from .templates import (TemplateCache, register_template, unregister_template, invalidate_templates,
+                            get_template_cache)
+    from .media import play_sound, speak, recognize, recognize_frames, available_recognizer_languages
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 # Define __all__ for public API / 定义公共API
 __all__ = [
     # Enums / 枚举
@@ -51,19 +215,114 @@ __all__ = [
     'OcrLanguage',
     # Constants / 常量
     'DEFAULT_APP_ID',
+    # Notification specs / 通知规格
+    'ToastSpec',
+    'ButtonSpec',
+    'InputSpec',
+    'SelectionSpec',
     # Core functions / 核心函数
     'notify',
+    'notify_async',
     'toast',
     'toast_async',
     'atoast',
     'clear_toast',
+    'cancel_scheduled',
     # Progress functions / 进度函数
     'notify_progress',
     'update_progress',
+    'update_progress_async',
+    'toast_progress',
+    'ProgressManager',
+    'ProgressBar',
+    'PoolProgress',
+    'ProgressReporter',
+    # History functions / 历史函数
+    'list_toasts',
+    'clear_many',
+    'prune_toasts',
+    # Duplicate suppression / 重复抑制
+    'Deduplicator',
+    'enable_dedup',
+    'disable_dedup',
+    'get_deduplicator',
+    # Rate limiting / 限流
+    'RateLimiter',
+    'RateLimitExceeded',
+    'enable_rate_limit',
+    'disable_rate_limit',
+    'get_rate_limiter',
+    # Render cache / 渲染缓存
+    'RenderCache',
+    'enable_render_cache',
+    'disable_render_cache',
+    'get_render_cache',
+    # Shared progress state / 共享进度状态
+    'SharedProgressStore',
+    'enable_shared_progress',
+    'disable_shared_progress',
+    'get_shared_progress',
+    # Traffic recording / 流量记录
+    'Recorder',
+    'enable_recording',
+    'disable_recording',
+    'get_recorder',
+    'read_recording',
+    'replay',
+    # WinRT executor / WinRT执行器
+    'enable_winrt_executor',
+    'disable_winrt_executor',
+    'get_winrt_executor',
+    # Registered XML templates / 已注册的XML模板
+    'TemplateCache',
+    'register_template',
+    'unregister_template',
+    'invalidate_templates',
+    'get_template_cache',
+    # Scheduler / 调度器
+    'ToastScheduler',
+    'get_scheduler',
+    # Digest mode / 摘要模式
+    'DigestNotifier',
+    'default_digest_renderer',
+    # Payload validation / 负载校验
+    'ToastPayloadError',
+    'validate_payload',
+    'estimate_payload_size',
+    'enable_validation',
+    'disable_validation',
+    'get_validation_mode',
+    # Image asset pipeline / 图片资源管道
+    'ImageAssetCache',
+    'enable_image_pipeline',
+    'disable_image_pipeline',
+    # Remote image cache / 远程图片缓存
+    'RemoteImageCache',
+    'RemoteImageTooLarge',
+    'enable_remote_images',
+    'disable_remote_images',
+    # Timing instrumentation / 计时工具
+    'add_timing_hook',
+    'remove_timing_hook',
+    'enable_timing_buffer',
+    'get_timings',
+    'disable_timings',
+    # Delivery metrics / 投递指标
+    'MetricsRegistry',
+    'enable_metrics',
+    'disable_metrics',
+    'get_metrics',
+    # Daemon / 守护进程
+    'serve',
+    'ToastDaemon',
+    'ToastClient',
+    'send_toast',
+    'default_address',
     # Media functions / 媒体函数
     'play_sound',
     'speak',
     'recognize',
+    'recognize_frames',
     'available_recognizer_languages',
 ]
 
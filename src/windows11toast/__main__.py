@@ -0,0 +1,7 @@
+"""Allow running the library with `python -m windows11toast` / 允许通过`python -m windows11toast`运行"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,244 @@
+"""Image asset pipeline: resize, recompress and cache toast images / 图片资源管道：缩放、重新压缩并缓存通知图片"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .enums import ImagePlacement, IconPlacement, IconCrop
+
+# Display sizes at 200% scaling (width, height) / 200%缩放下的显示尺寸（宽，高）
+HERO_SIZE = (728, 360)
+INLINE_SIZE = (728, 728)
+APP_LOGO_SIZE = (96, 96)
+
+_PLACEMENT_SIZES = {
+    ImagePlacement.HERO: HERO_SIZE,
+    ImagePlacement.INLINE: INLINE_SIZE,
+    ImagePlacement.APP_LOGO_OVERRIDE: APP_LOGO_SIZE,
+    IconPlacement.APP_LOGO_OVERRIDE_AND_HERO: HERO_SIZE,
+}
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('LOCALAPPDATA') or tempfile.gettempdir()) / 'windows11toast' / 'images'
+
+# Remembered source digests / 记住的源文件摘要数量
+MAX_DIGESTS = 1024
+
+
+def _import_pil():
+    """Import Pillow or raise a helpful ImportError / 导入Pillow，失败时抛出有提示的ImportError"""
+    try:
+        from PIL import Image, ImageDraw, ImageOps
+    except ImportError as e:
+        raise ImportError("The image asset pipeline requires Pillow: pip install 'windows11toast[images]'") from e
+    return Image, ImageDraw, ImageOps
+
+
+def _image_errors() -> Tuple[type, ...]:
+    """Errors Pillow raises for unreadable, corrupt or oversized images / Pillow对无法读取、损坏或过大图片抛出的异常"""
+    Image = _import_pil()[0]
+    return OSError, ValueError, SyntaxError, Image.DecompressionBombError
+
+
+class ImageAssetCache:
+    """
+    Produce display-sized copies of toast images in a content-addressed on-disk cache.
+    在基于内容寻址的磁盘缓存中生成适合显示尺寸的通知图片副本。
+
+    Sources are keyed by the SHA-256 of their bytes, so the same picture under different paths is
+    processed once. A source file is only re-hashed when its size or modification time changes.
+    When the cache grows beyond `max_bytes`, least recently used files are deleted.
+    源文件以其内容的SHA-256为键，因此不同路径下的同一图片只处理一次。只有当源文件大小或修改时间变化时才重新计算哈希。
+    缓存超过`max_bytes`时删除最近最少使用的文件。
+
+    Args / 参数:
+        cache_dir: Cache directory / 缓存目录
+        max_bytes: Maximum total size of cached files / 缓存文件的最大总大小
+        jpeg_quality: Quality of recompressed JPEG files / 重新压缩JPEG文件的质量
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_bytes: int = 64 * 1024 * 1024,
+                 jpeg_quality: int = 85):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.jpeg_quality = jpeg_quality
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> content digest, least recently used first / (路径, 大小, 修改时间) -> 内容摘要，最久未使用的在前
+        self._digests: 'OrderedDict[Tuple[str, int, int], str]' = OrderedDict()
+        self._total = sum(f.stat().st_size for f in self.cache_dir.iterdir() if f.is_file())
+
+    def _digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()[:32]
+        with self._lock:
+            self._digests[key] = digest
+            while len(self._digests) > MAX_DIGESTS:
+                self._digests.popitem(last=False)
+        return digest
+
+    def prepare(self, src: str, size: Tuple[int, int], circle: bool = False) -> str:
+        """
+        Return the path of a copy of src fitted into size, creating it if needed.
+        返回适配到指定尺寸的src副本路径，必要时创建。
+
+        Args / 参数:
+            src: Local image path / 本地图片路径
+            size: Maximum (width, height) / 最大（宽，高）
+            circle: Crop to a circle with a transparent background / 裁剪为透明背景的圆形
+
+        Returns / 返回:
+            Absolute path of the cached file / 缓存文件的绝对路径
+        """
+        path = Path(src).absolute()
+        digest = self._digest(path)
+        suffix = '-circle' if circle else ''
+        name = f'{digest}-{size[0]}x{size[1]}{suffix}'
+        with self._lock:
+            for ext in ('.png', '.jpg'):
+                cached = self.cache_dir / (name + ext)
+                if cached.is_file():
+                    # Mark as recently used / 标记为最近使用
+                    os.utime(cached)
+                    return str(cached)
+
+        Image, ImageDraw, ImageOps = _import_pil()
+        with Image.open(path) as image:
+            image = ImageOps.exif_transpose(image)
+            if circle:
+                side = min(image.size)
+                image = ImageOps.fit(image, (side, side)).convert('RGBA')
+                image.thumbnail(size)
+                mask = Image.new('L', image.size, 0)
+                ImageDraw.Draw(mask).ellipse((0, 0, image.size[0] - 1, image.size[1] - 1), fill=255)
+                image.putalpha(mask)
+            else:
+                image.thumbnail(size)
+            has_alpha = circle or image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+            tmp = self.cache_dir / f'{name}.{threading.get_ident()}.tmp'
+            try:
+                if has_alpha:
+                    target = self.cache_dir / (name + '.png')
+                    image.save(tmp, 'PNG', optimize=True)
+                else:
+                    target = self.cache_dir / (name + '.jpg')
+                    image.convert('RGB').save(tmp, 'JPEG', quality=self.jpeg_quality, optimize=True)
+            except BaseException:
+                # Do not leave a partial file behind / 不留下不完整的文件
+                tmp.unlink(missing_ok=True)
+                raise
+        os.replace(tmp, target)
+
+        with self._lock:
+            self._total += target.stat().st_size
+            if self._total > self.max_bytes:
+                self._evict(keep=target)
+        return str(target)
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used files until under max_bytes (lock must be held) / 删除最近最少使用的文件直到低于max_bytes（须持有锁）"""
+        files = sorted((f for f in self.cache_dir.iterdir() if f.is_file() and f != keep),
+                       key=lambda f: f.stat().st_mtime)
+        for f in files:
+            if self._total <= self.max_bytes:
+                break
+            try:
+                size = f.stat().st_size
+                f.unlink()
+                self._total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Delete every cached file / 删除所有缓存文件"""
+        with self._lock:
+            for f in self.cache_dir.iterdir():
+                if f.is_file():
+                    f.unlink()
+            self._total = 0
+            self._digests.clear()
+
+
+# Active asset cache used by notify(), None when disabled / notify()使用的资源缓存，禁用时为None
+_asset_cache: Optional[ImageAssetCache] = None
+_circle_icons = False
+
+
+def enable_image_pipeline(cache_dir: Optional[Union[str, Path]] = None, max_bytes: int = 64 * 1024 * 1024,
+                          jpeg_quality: int = 85, circle_icons: bool = False) -> ImageAssetCache:
+    """
+    Resize local image_src/icon_src files to their display size before notify() shows them.
+    在notify()显示之前，将本地image_src/icon_src文件缩放到显示尺寸。
+
+    Requires Pillow (pip install 'windows11toast[images]').
+    需要Pillow（pip install 'windows11toast[images]'）。
+
+    Args / 参数:
+        cache_dir: Cache directory (default %LOCALAPPDATA%/windows11toast/images) / 缓存目录（默认%LOCALAPPDATA%/windows11toast/images）
+        max_bytes: Maximum total size of cached files / 缓存文件的最大总大小
+        jpeg_quality: Quality of recompressed JPEG files / 重新压缩JPEG文件的质量
+        circle_icons: Pre-crop icons with IconCrop.CIRCLE into circles / 将IconCrop.CIRCLE的图标预先裁剪为圆形
+
+    Returns / 返回:
+        The active ImageAssetCache / 活动的ImageAssetCache
+    """
+    global _asset_cache, _circle_icons
+    _import_pil()
+    _asset_cache = ImageAssetCache(cache_dir, max_bytes, jpeg_quality)
+    _circle_icons = circle_icons
+    return _asset_cache
+
+
+def disable_image_pipeline() -> None:
+    """Stop processing images in notify() / 停止在notify()中处理图片"""
+    global _asset_cache
+    _asset_cache = None
+
+
+def _is_local(src: str) -> bool:
+    return not src.startswith(('http:', 'https:', 'ms-appx:', 'ms-appdata:')) and os.path.isfile(src)
+
+
+def prepare_image(image_src: str, placement: Optional[ImagePlacement] = None) -> str:
+    """
+    Return a display-sized copy of a local image, or image_src unchanged if the pipeline is disabled or fails.
+    返回本地图片的显示尺寸副本；如果管道未启用或处理失败，则原样返回image_src。
+    """
+    cache = _asset_cache
+    if cache is None or not _is_local(image_src):
+        return image_src
+    try:
+        return cache.prepare(image_src, _PLACEMENT_SIZES.get(placement, INLINE_SIZE))
+    except _image_errors():
+        # Unreadable, corrupt, oversized or unsupported image, let Windows handle it /
+        # 无法读取、损坏、过大或不支持的图片，交由Windows处理
+        return image_src
+
+
+def prepare_icon(icon_src: str, placement: Optional[IconPlacement] = None,
+                 hint_crop: Optional[IconCrop] = None) -> str:
+    """
+    Return a display-sized (optionally circle-cropped) copy of a local icon, or icon_src unchanged.
+    返回本地图标的显示尺寸副本（可选圆形裁剪），否则原样返回icon_src。
+    """
+    cache = _asset_cache
+    if cache is None or not _is_local(icon_src):
+        return icon_src
+    circle = _circle_icons and hint_crop in (None, IconCrop.CIRCLE)
+    try:
+        return cache.prepare(icon_src, _PLACEMENT_SIZES.get(placement, APP_LOGO_SIZE), circle)
+    except _image_errors():
+        return icon_src
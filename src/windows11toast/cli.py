@@ -0,0 +1,173 @@
+"""Command-line interface / 命令行接口
+
+One-shot / 单次:
+    python -m windows11toast "Title" "Body" --image hero.png --button OK
+
+Streaming JSON lines from stdin / 从标准输入流式读取JSON行:
+    producer | python -m windows11toast --stdin
+
+Local daemon for windows11toast.client / 供windows11toast.client使用的本地守护进程:
+    python -m windows11toast --daemon --rate 5
+
+Each line is a JSON object of notify() keyword arguments. An optional "op" key selects
+"notify" (default), "notify_progress", "update_progress" or "clear_toast". One JSON result
+per line is written to stdout; failures are reported and the stream continues. "deliver_at" is an
+ISO 8601 time such as "2030-01-01T09:00:00+08:00" and "delay" a number of seconds.
+每行是一个notify()关键字参数的JSON对象。可选的"op"键选择"notify"（默认）、"notify_progress"、
+"update_progress"或"clear_toast"。每行向标准输出写入一个JSON结果；失败会被报告，流继续处理。
+"deliver_at"为ISO 8601时间，例如"2030-01-01T09:00:00+08:00"，"delay"为秒数。
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import Optional, Dict, List, Any, TextIO
+
+from .enums import ImagePlacement, IconPlacement, IconCrop, AudioEvent, ToastDuration
+from .constants import DEFAULT_APP_ID
+from .notification import notify, clear_toast
+from .progress import notify_progress, update_progress
+
+_OPERATIONS = {
+    'notify': notify,
+    'notify_progress': notify_progress,
+    'update_progress': update_progress,
+    'clear_toast': clear_toast,
+}
+
+# Keyword arguments converted to enums / 转换为枚举的关键字参数
+_ENUM_FIELDS = {
+    'image_placement': ImagePlacement,
+    'icon_placement': IconPlacement,
+    'icon_hint_crop': IconCrop,
+    'duration': ToastDuration,
+}
+
+
+# Arguments that configure the CLI itself / 配置CLI本身的参数
+_CLI_ONLY = ('stdin', 'daemon', 'address', 'rate', 'burst')
+
+
+def _convert(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert JSON values to the types notify() expects / 将JSON值转换为notify()期望的类型"""
+    for name, enum in _ENUM_FIELDS.items():
+        value = spec.get(name)
+        if isinstance(value, str):
+            spec[name] = enum(value)
+    audio = spec.get('audio')
+    if isinstance(audio, str) and audio.upper() in AudioEvent.__members__:
+        # Allow names like "REMINDER" / 允许使用"REMINDER"等名称
+        spec['audio'] = AudioEvent[audio.upper()]
+    deliver_at = spec.get('deliver_at')
+    if isinstance(deliver_at, str):
+        # fromisoformat() only accepts a trailing 'Z' from Python 3.11 / fromisoformat()从Python 3.11起才接受结尾的'Z'
+        spec['deliver_at'] = datetime.fromisoformat(deliver_at[:-1] + '+00:00' if deliver_at.endswith('Z') else deliver_at)
+    if spec.get('delay') is not None:
+        spec['delay'] = float(spec['delay'])
+    return spec
+
+
+def run_spec(spec: Dict[str, Any]) -> Any:
+    """
+    Run one notification spec.
+    执行一个通知规格。
+
+    Args / 参数:
+        spec: Keyword arguments with an optional 'op' key / 带可选'op'键的关键字参数
+
+    Returns / 返回:
+        Result of the selected operation / 所选操作的结果
+    """
+    if not isinstance(spec, dict):
+        raise TypeError('each line must be a JSON object')
+    spec = dict(spec)
+    op = spec.pop('op', 'notify')
+    if op not in _OPERATIONS:
+        raise ValueError(f"unknown op '{op}', expected one of {list(_OPERATIONS)}")
+    return _OPERATIONS[op](**_convert(spec))
+
+
+def stream(lines: TextIO, out: TextIO) -> int:
+    """
+    Send one notification per JSON line until the input ends.
+    每个JSON行发送一条通知，直到输入结束。
+
+    Returns / 返回:
+        Number of lines that failed / 失败的行数
+    """
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            spec = json.loads(line)
+            result = run_spec(spec)
+            report = {'line': number, 'ok': True}
+            if result is None and spec.get('op', 'notify') != 'clear_toast':
+                # Dropped by dedup or the rate limiter / 被去重或限流器丢弃
+                report['suppressed'] = True
+        except Exception as e:
+            failures += 1
+            report = {'line': number, 'ok': False, 'error': f'{type(e).__name__}: {e}'}
+        out.write(json.dumps(report, ensure_ascii=False) + '\n')
+        out.flush()
+    return failures
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser / 构建参数解析器"""
+    parser = argparse.ArgumentParser(prog='windows11toast', description='Show Windows toast notifications.')
+    parser.add_argument('title', nargs='?', help='notification title')
+    parser.add_argument('body', nargs='?', help='notification body')
+    parser.add_argument('--stdin', action='store_true', help='read JSON-lines notification specs from stdin')
+    parser.add_argument('--daemon', action='store_true', help='serve windows11toast.client requests until interrupted')
+    parser.add_argument('--address', help='daemon named pipe / socket address (default: per user)')
+    parser.add_argument('--rate', type=float, help='daemon rate limit in toasts per second per app_id')
+    parser.add_argument('--burst', type=int, default=10, help='daemon rate limit burst size')
+    parser.add_argument('--on-click', help='URL opened when the toast is clicked')
+    parser.add_argument('--image', dest='image_src', help='image path or URL')
+    parser.add_argument('--image-placement', choices=[e.value for e in ImagePlacement])
+    parser.add_argument('--icon', dest='icon_src', help='icon path or URL')
+    parser.add_argument('--icon-placement', choices=[e.value for e in IconPlacement])
+    parser.add_argument('--icon-crop', dest='icon_hint_crop', choices=[e.value for e in IconCrop])
+    parser.add_argument('--audio', help='AudioEvent name (e.g. REMINDER), ms-winsoundevent URI, file or URL')
+    parser.add_argument('--audio-loop', action='store_true')
+    parser.add_argument('--duration', choices=[e.value for e in ToastDuration])
+    parser.add_argument('--button', dest='buttons', action='append', help='button content (repeatable)')
+    parser.add_argument('--app-id', default=DEFAULT_APP_ID)
+    parser.add_argument('--tag')
+    parser.add_argument('--group')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of `python -m windows11toast`.
+    `python -m windows11toast`的入口。
+
+    Returns / 返回:
+        Process exit code / 进程退出码
+    """
+    args = build_parser().parse_args(argv)
+    if args.daemon:
+        from .daemon import serve
+        serve(args.address, rate=args.rate, burst=args.burst)
+        return 0
+    if args.stdin:
+        # JSON lines are UTF-8 regardless of the console code page / 无论控制台代码页如何，JSON行均为UTF-8
+        sys.stdin.reconfigure(encoding='utf-8')
+        sys.stdout.reconfigure(encoding='utf-8')
+        return 1 if stream(sys.stdin, sys.stdout) else 0
+    if args.title is None:
+        build_parser().error('a title or --stdin is required')
+
+    spec = {name: value for name, value in vars(args).items() if value not in (None, False)
+            and name not in _CLI_ONLY}
+    try:
+        run_spec(spec)
+    except Exception as e:
+        print(f'windows11toast: {type(e).__name__}: {e}', file=sys.stderr)
+        return 1
+    return 0
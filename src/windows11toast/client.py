@@ -0,0 +1,120 @@
+"""Thin client for the local toast daemon, without WinRT / 本地通知守护进程的轻量客户端（不依赖WinRT）
+
+Protocol / 协议:
+    Every message is one multiprocessing.connection frame (4-byte big-endian length followed by
+    the payload) holding a UTF-8 JSON object:
+    每条消息是一个multiprocessing.connection帧（4字节大端长度加负载），内容为UTF-8 JSON对象：
+
+        {"specs": [{"title": "Hello", "body": "World"}, ...], "reply": false}
+
+    Each spec holds notify() keyword arguments and an optional "op" (see cli.run_spec).
+    When "reply" is true the daemon answers with {"results": [{"ok": true}, ...]}.
+    每个spec包含notify()关键字参数和可选的"op"（见cli.run_spec）。当"reply"为true时，
+    守护进程回复{"results": [{"ok": true}, ...]}。
+"""
+
+import json
+import os
+import sys
+import tempfile
+from multiprocessing.connection import Client
+from typing import Optional, Dict, List, Any, Iterable
+
+
+def default_address() -> str:
+    """
+    Return the per-user daemon address: a named pipe on Windows, a Unix socket elsewhere.
+    返回按用户区分的守护进程地址：Windows上为命名管道，其他平台为Unix套接字。
+    """
+    if sys.platform == 'win32':
+        return r'\\.\pipe\windows11toast-' + os.environ.get('USERNAME', 'default')
+    return os.path.join(tempfile.gettempdir(), f'windows11toast-{os.getuid()}.sock')
+
+
+class ToastClient:
+    """
+    Persistent connection to the toast daemon.
+    到通知守护进程的持久连接。
+
+    Args / 参数:
+        address: Daemon address (default default_address()) / 守护进程地址（默认default_address()）
+        authkey: Shared secret, must match the daemon's / 共享密钥，必须与守护进程一致
+
+    Example / 示例:
+        with ToastClient() as client:
+            for line in log:
+                client.send('New log line', line)
+    """
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None):
+        self._connection = Client(address or default_address(), authkey=authkey)
+
+    def send_many(self, specs: Iterable[Dict[str, Any]], wait: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Send several notification specs in one frame.
+        在一个帧中发送多个通知规格。
+
+        Args / 参数:
+            specs: notify() keyword arguments, each with an optional 'op' / notify()关键字参数，每个可带可选的'op'
+            wait: Wait for the daemon to send them and return per-spec results / 等待守护进程发送并返回每个规格的结果
+
+        Returns / 返回:
+            List of {'ok': bool, 'error': str} results if wait is True, otherwise None / wait为True时返回结果列表，否则返回None
+        """
+        message = {'specs': list(specs), 'reply': wait}
+        self._connection.send_bytes(json.dumps(message, ensure_ascii=False).encode('utf-8'))
+        if not wait:
+            return None
+        return json.loads(self._connection.recv_bytes().decode('utf-8'))['results']
+
+    def send(self, title: Optional[str] = None, body: Optional[str] = None, wait: bool = False,
+             **spec: Any) -> Optional[Dict[str, Any]]:
+        """
+        Send one notification.
+        发送一条通知。
+
+        Args / 参数:
+            title: Notification title text / 通知标题文本
+            body: Notification body text / 通知正文文本
+            wait: Wait for the daemon to send it and return the result / 等待守护进程发送并返回结果
+            **spec: Other notify() keyword arguments (JSON-serializable) / 其他notify()关键字参数（可JSON序列化）
+        """
+        if title is not None:
+            spec['title'] = title
+        if body is not None:
+            spec['body'] = body
+        results = self.send_many([spec], wait)
+        return results[0] if results else None
+
+    def close(self) -> None:
+        """Close the connection / 关闭连接"""
+        self._connection.close()
+
+    def __enter__(self) -> 'ToastClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def send_toast(title: Optional[str] = None, body: Optional[str] = None,
+               address: Optional[str] = None, authkey: Optional[bytes] = None,
+               wait: bool = False, **spec: Any) -> Optional[Dict[str, Any]]:
+    """
+    Send one notification through the toast daemon without importing WinRT.
+    不导入WinRT，通过通知守护进程发送一条通知。
+
+    Args / 参数:
+        title: Notification title text / 通知标题文本
+        body: Notification body text / 通知正文文本
+        address: Daemon address (default default_address()) / 守护进程地址（默认default_address()）
+        authkey: Shared secret, must match the daemon's / 共享密钥，必须与守护进程一致
+        wait: Wait for the daemon to send it and return the result / 等待守护进程发送并返回结果
+        **spec: Other notify() keyword arguments (JSON-serializable) / 其他notify()关键字参数（可JSON序列化）
+
+    Example / 示例:
+        from windows11toast.client import send_toast
+        send_toast('Backup finished', 'All files copied', tag='backup', group='jobs')
+    """
+    with ToastClient(address, authkey) as client:
+        return client.send(title, body, wait, **spec)
@@ -10,3 +10,11 @@ DEFAULT_XML_TEMPLATE = """
 </toast>
 """
 
+
+# Windows toast payload limits / Windows 通知负载限制
+MAX_PAYLOAD_BYTES = 5 * 1024
+MAX_TITLE_LINES = 2
+MAX_TEXT_LINES = 4
+MAX_BUTTONS = 5
+MAX_INPUTS = 5
+MAX_SELECTION_ITEMS = 5
@@ -0,0 +1,324 @@
+"""Local toast daemon serving notification requests over a named pipe / Unix socket / 通过命名管道或Unix套接字提供通知服务的本地守护进程"""
+
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client, deliver_challenge, answer_challenge
+from typing import Optional, Dict, List, Tuple, Any
+
+from .cli import run_spec
+from .client import default_address
+from .constants import DEFAULT_APP_ID
+from .ratelimit import RateLimiter, LIMIT_BLOCK
+
+# Operations that show a toast and go through the daemon's rate limiter / 会显示通知、需经过守护进程限流器的操作
+_SHOWING_OPS = ('notify', 'notify_progress')
+
+# Result of requests that cannot be run any more / 无法再执行的请求的结果
+_SHUTTING_DOWN = {'ok': False, 'error': 'daemon shutting down'}
+
+
+class _Request:
+    """Specs received in one frame, plus their results when a reply is wanted / 一帧中收到的规格，以及需要回复时的结果"""
+
+    __slots__ = ('specs', 'results', 'done')
+
+    def __init__(self, specs: List[Dict[str, Any]], reply: bool):
+        self.specs = specs
+        self.results = [] if reply else None
+        self.done = threading.Event() if reply else None
+
+    def finish(self, results: List[Dict[str, Any]]) -> None:
+        """Hand the results to a waiting client thread / 将结果交给等待中的客户端线程"""
+        if self.results is not None:
+            self.results.extend(results)
+            self.done.set()
+
+    def cancel(self) -> None:
+        """Finish without running, because the daemon is shutting down / 因守护进程关闭而不执行直接结束"""
+        self.finish([dict(_SHUTTING_DOWN) for _ in self.specs])
+
+
+class _Deadline:
+    """Connection wrapper whose reads fail once a deadline has passed / 超过截止时间后读取失败的连接包装"""
+
+    __slots__ = ('_connection', '_deadline')
+
+    def __init__(self, connection, timeout: float):
+        self._connection = connection
+        self._deadline = time.monotonic() + timeout
+
+    def send_bytes(self, *args: Any) -> None:
+        self._connection.send_bytes(*args)
+
+    def recv_bytes(self, *args: Any) -> bytes:
+        if not self._connection.poll(max(0.0, self._deadline - time.monotonic())):
+            raise AuthenticationError('authentication timed out')
+        return self._connection.recv_bytes(*args)
+
+
+def _coalesce(specs: List[Any]) -> List[Tuple[Any, List[int]]]:
+    """
+    Merge runs of update_progress specs for the same toast into one update.
+    将同一通知的连续update_progress规格合并为一次更新。
+
+    Only updates separated by updates of other toasts are merged; any other operation ends the run.
+    仅合并被其他通知的更新隔开的更新；任何其他操作都会结束合并。
+
+    Returns / 返回:
+        List of (spec to run, indices of the specs it stands for) / (要执行的规格, 其代表的规格索引)列表
+    """
+    runs: List[Tuple[Any, List[int]]] = []
+    # (tag, group, app_id) -> index of the open run / (tag, group, app_id) -> 未结束合并的索引
+    open_runs: Dict[Tuple[Any, Any, Any], int] = {}
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict) or spec.get('op') != 'update_progress':
+            open_runs.clear()
+            runs.append((spec, [index]))
+            continue
+        key = (spec.get('tag'), spec.get('group'), spec.get('app_id'))
+        at = open_runs.get(key)
+        if at is None:
+            open_runs[key] = len(runs)
+            runs.append((spec, [index]))
+            continue
+        merged, indices = runs[at]
+        # None means "unchanged" for update_progress / 对update_progress而言None表示"不变"
+        merged = dict(merged)
+        merged.update((name, value) for name, value in spec.items() if value is not None)
+        runs[at] = (merged, indices + [index])
+    return runs
+
+
+class ToastDaemon:
+    """
+    Keep WinRT warm in one process and show toasts sent by ToastClient/send_toast.
+    在一个进程中保持WinRT就绪，并显示由ToastClient/send_toast发送的通知。
+
+    One thread per client connection authenticates the client and decodes frames; a single sender
+    thread runs queued requests in batches of up to `batch_size`, so rate limiting and WinRT access
+    happen in one place. Within a batch, consecutive update_progress requests for the same toast are
+    merged into one update. When `max_queue` requests are waiting, client threads stop reading, which
+    pushes back on the clients.
+    每个客户端连接由一个线程完成认证并解码帧；单个发送线程按最多`batch_size`条的批次执行排队的请求，
+    因此限流和WinRT访问集中在一处。同一批次中同一通知的连续update_progress请求会合并为一次更新。
+    等待中的请求达到`max_queue`时，客户端线程停止读取，从而对客户端形成背压。
+
+    Args / 参数:
+        address: Listen address (default default_address()) / 监听地址（默认default_address()）
+        authkey: Shared secret clients must present / 客户端必须提供的共享密钥
+        rate: Toasts per second per app_id, None for no limit. Applies to this daemon only / 每个app_id每秒的通知数，None表示不限。仅作用于此守护进程
+        burst: Toasts allowed in a burst per app_id / 每个app_id允许的突发通知数
+        batch_size: Maximum requests run per batch / 每批最多执行的请求数
+        max_queue: Maximum requests waiting to be run / 最多等待执行的请求数
+        handshake_timeout: Seconds a client has to complete authentication / 客户端完成认证的时限（秒）
+
+    Raises / 异常:
+        OSError: From serve_forever() if another daemon is listening on address / 如果另一个守护进程正在监听address，由serve_forever()抛出
+    """
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None,
+                 rate: Optional[float] = None, burst: int = 10, batch_size: int = 64,
+                 max_queue: int = 1024, handshake_timeout: float = 5.0):
+        self.address = address or default_address()
+        self.authkey = authkey
+        self.batch_size = batch_size
+        self.handshake_timeout = handshake_timeout
+        # The daemon's own limiter, the process-wide one is left alone / 守护进程自己的限流器，不影响进程级限流器
+        self.rate_limiter = RateLimiter(rate, burst, LIMIT_BLOCK) if rate is not None else None
+        self._queue: 'queue.Queue[Optional[_Request]]' = queue.Queue(max_queue)
+        self._listener = None
+        self._closed = threading.Event()
+        # Serializes queueing with the sender's final drain / 使入队与发送线程最后的清空互斥
+        self._queue_lock = threading.Lock()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket left by a previous daemon, refusing if one is still listening / 删除之前守护进程遗留的套接字，如仍有守护进程在监听则拒绝"""
+        if sys.platform == 'win32' or not os.path.exists(self.address):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.address)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.address)
+            return
+        finally:
+            probe.close()
+        raise OSError(f'another toast daemon is listening on {self.address}')
+
+    def serve_forever(self) -> None:
+        """Accept connections until close() is called / 接受连接直到调用close()"""
+        self._remove_stale_socket()
+        # Clients authenticate on their own thread, not on the accept loop / 客户端在各自线程中认证，而不是在接受循环中
+        self._listener = Listener(self.address)
+        sender = threading.Thread(target=self._send_loop, name='windows11toast-daemon-sender', daemon=True)
+        sender.start()
+        try:
+            while not self._closed.is_set():
+                try:
+                    connection = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    if self._closed.is_set():
+                        break
+                    # Aborted client / 客户端中止
+                    continue
+                if self._closed.is_set():
+                    connection.close()
+                    break
+                threading.Thread(target=self._handle, args=(connection,),
+                                 name='windows11toast-daemon-client', daemon=True).start()
+        finally:
+            # New requests are refused from here on / 从此处开始拒绝新请求
+            self._closed.set()
+            self._queue.put(None)
+            self._listener.close()
+
+    def close(self) -> None:
+        """
+        Stop accepting connections and requests.
+        停止接受连接和请求。
+
+        Requests already queued are still run; requests sent afterwards get a 'daemon shutting down' error.
+        已排队的请求仍会执行；之后发送的请求会收到'daemon shutting down'错误。
+        """
+        self._closed.set()
+        if self._listener is not None:
+            try:
+                # Wake the accept loop, closing the listener alone does not / 唤醒接受循环，仅关闭监听器无法唤醒
+                Client(self.address).close()
+            except OSError:
+                self._listener.close()
+
+    def _authenticate(self, connection) -> bool:
+        if self.authkey is None:
+            return True
+        deadline = _Deadline(connection, self.handshake_timeout)
+        try:
+            deliver_challenge(deadline, self.authkey)
+            answer_challenge(deadline, self.authkey)
+        except (AuthenticationError, EOFError, OSError):
+            # Wrong key, too slow or aborted client / 密钥错误、超时或客户端中止
+            return False
+        return True
+
+    def _handle(self, connection) -> None:
+        with connection:
+            if not self._authenticate(connection):
+                return
+            while True:
+                try:
+                    frame = connection.recv_bytes()
+                except (EOFError, OSError):
+                    return
+                try:
+                    message = json.loads(frame.decode('utf-8'))
+                except ValueError:
+                    # Whether a reply was wanted is unknown, send none / 无法得知是否需要回复，不回复
+                    continue
+                reply = isinstance(message, dict) and bool(message.get('reply'))
+                specs = message.get('specs') if isinstance(message, dict) else None
+                if not isinstance(specs, list):
+                    if reply:
+                        connection.send_bytes(json.dumps({'results': [
+                            {'ok': False, 'error': 'TypeError: specs must be a list'}]}).encode('utf-8'))
+                    continue
+                request = _Request(specs, reply)
+                if not self._enqueue(request):
+                    if reply:
+                        request.cancel()
+                        connection.send_bytes(json.dumps({'results': request.results}).encode('utf-8'))
+                    return
+                if reply:
+                    request.done.wait()
+                    connection.send_bytes(json.dumps({'results': request.results}, ensure_ascii=False).encode('utf-8'))
+
+    def _enqueue(self, request: _Request) -> bool:
+        """Queue a request, waiting while the queue is full; False once closed / 将请求入队，队列已满时等待；关闭后返回False"""
+        while True:
+            with self._queue_lock:
+                if self._closed.is_set():
+                    return False
+                try:
+                    self._queue.put(request, timeout=0.05)
+                    return True
+                except queue.Full:
+                    pass
+
+    def _run(self, spec: Any) -> Dict[str, Any]:
+        try:
+            if self.rate_limiter is not None and isinstance(spec, dict) and spec.get('op', 'notify') in _SHOWING_OPS:
+                self.rate_limiter.submit(spec.get('app_id', DEFAULT_APP_ID), run_spec, spec)
+            else:
+                run_spec(spec)
+            return {'ok': True}
+        except Exception as e:
+            return {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+
+    def _send_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            if stop:
+                # Requests behind the sentinel, and any still being queued, are not run /
+                # 结束标记之后的请求以及仍在入队的请求不会执行
+                batch, leftover = batch[:batch.index(None)], batch[batch.index(None) + 1:]
+                with self._queue_lock:
+                    while True:
+                        try:
+                            leftover.append(self._queue.get_nowait())
+                        except queue.Empty:
+                            break
+                for request in leftover:
+                    if request is not None:
+                        request.cancel()
+            specs = [spec for request in batch for spec in request.specs]
+            results: List[Optional[Dict[str, Any]]] = [None] * len(specs)
+            for spec, indices in _coalesce(specs):
+                result = self._run(spec)
+                for index in indices:
+                    results[index] = result
+            start = 0
+            for request in batch:
+                end = start + len(request.specs)
+                request.finish(results[start:end])
+                start = end
+            if stop:
+                return
+
+
+def serve(address: Optional[str] = None, authkey: Optional[bytes] = None,
+          rate: Optional[float] = None, burst: int = 10, batch_size: int = 64) -> None:
+    """
+    Run the toast daemon until interrupted.
+    运行通知守护进程直到被中断。
+
+    Args / 参数:
+        address: Listen address (default default_address()) / 监听地址（默认default_address()）
+        authkey: Shared secret clients must present / 客户端必须提供的共享密钥
+        rate: Toasts per second per app_id, None for no limit / 每个app_id每秒的通知数，None表示不限
+        burst: Toasts allowed in a burst per app_id / 每个app_id允许的突发通知数
+        batch_size: Maximum toasts sent per batch / 每批最多发送的通知数
+
+    Example / 示例:
+        # Server / 服务端
+        python -m windows11toast --daemon --rate 5
+
+        # Client / 客户端
+        from windows11toast.client import send_toast
+        send_toast('Hello', 'World')
+    """
+    daemon = ToastDaemon(address, authkey, rate, burst, batch_size)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.close()
@@ -0,0 +1,118 @@
+"""Duplicate suppression for notification storms / 通知风暴的重复抑制"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Duplicate handling modes / 重复处理模式
+DEDUP_DROP = 'drop'
+DEDUP_UPDATE = 'update'
+
+
+class Deduplicator:
+    """
+    Track recently shown notifications by content fingerprint.
+    按内容指纹跟踪最近显示的通知。
+
+    A notification is a duplicate when a notification with the same (title, body, tag, app_id)
+    was first shown less than `window` seconds ago. The window is fixed: it starts at the first
+    occurrence and repeats do not extend it, so a steady storm still shows one toast per window.
+    Only the integer hash of each fingerprint is kept, and at most `max_entries` fingerprints are
+    remembered (least recently seen are evicted first).
+    若相同(title, body, tag, app_id)的通知首次显示距今不到`window`秒，则视为重复。时间窗口是固定的：
+    从首次出现开始计算，重复不会延长窗口，因此持续的通知风暴每个窗口仍会显示一条通知。
+    每个指纹仅保存其整数哈希值，最多记住`max_entries`个指纹（最久未出现的优先淘汰）。
+
+    Args / 参数:
+        window: Suppression window in seconds / 抑制时间窗口（秒）
+        mode: 'drop' to discard duplicates, 'update' to replace the toast in place with a repeat count / 'drop'丢弃重复项，'update'原地替换通知并显示重复次数
+        max_entries: Maximum number of remembered fingerprints / 最多记住的指纹数量
+    """
+
+    def __init__(self, window: float = 5.0, mode: str = DEDUP_DROP, max_entries: int = 1024):
+        if mode not in (DEDUP_DROP, DEDUP_UPDATE):
+            raise ValueError(f"mode must be '{DEDUP_DROP}' or '{DEDUP_UPDATE}', got '{mode}'")
+        if window <= 0:
+            raise ValueError('window must be positive')
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.window = window
+        self.mode = mode
+        self.max_entries = max_entries
+        # fingerprint -> [first_seen, repeat_count]
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    @staticmethod
+    def fingerprint(title: Optional[str], body: Optional[str], tag: Optional[str], app_id: str) -> int:
+        """Compute the content fingerprint of a notification / 计算通知的内容指纹"""
+        return hash((title, body, tag, app_id))
+
+    def check(self, fingerprint: int) -> int:
+        """
+        Record a notification and return how many times it was seen in the current window.
+        记录一条通知，并返回其在当前时间窗口内出现的次数。
+
+        Returns / 返回:
+            1 for a new notification, greater than 1 for a duplicate / 新通知返回1，重复通知返回大于1的值
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(fingerprint)
+            if entry is not None and now - entry[0] < self.window:
+                # Keep the first-seen time so the window does not slide / 保留首次出现时间，使窗口不会滑动
+                entry[1] += 1
+                self._seen.move_to_end(fingerprint)
+                self.suppressed += 1
+                return entry[1]
+            self._seen[fingerprint] = [now, 1]
+            self._seen.move_to_end(fingerprint)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+            return 1
+
+    def clear(self) -> None:
+        """Forget all remembered fingerprints / 清除所有已记录的指纹"""
+        with self._lock:
+            self._seen.clear()
+            self.suppressed = 0
+
+
+# Active deduplicator used by notify(), None when disabled / notify()使用的活动去重器，禁用时为None
+_deduplicator: Optional[Deduplicator] = None
+
+
+def enable_dedup(window: float = 5.0, mode: str = DEDUP_DROP, max_entries: int = 1024) -> Deduplicator:
+    """
+    Enable duplicate suppression for notify().
+    为notify()启用重复抑制。
+
+    Args / 参数:
+        window: Suppression window in seconds / 抑制时间窗口（秒）
+        mode: 'drop' to discard duplicates (notify() returns None), 'update' to replace the toast in place with a repeat count / 'drop'丢弃重复项（notify()返回None），'update'原地替换通知并显示重复次数
+        max_entries: Maximum number of remembered fingerprints / 最多记住的指纹数量
+
+    Returns / 返回:
+        The active Deduplicator / 活动的Deduplicator
+
+    Example / 示例:
+        enable_dedup(window=10, mode='update')
+        for _ in range(20):
+            notify('Disk full', 'C: has 0 bytes free')  # One toast showing '(×20)' / 一条显示'(×20)'的通知
+    """
+    global _deduplicator
+    _deduplicator = Deduplicator(window, mode, max_entries)
+    return _deduplicator
+
+
+def disable_dedup() -> None:
+    """Disable duplicate suppression for notify() / 为notify()禁用重复抑制"""
+    global _deduplicator
+    _deduplicator = None
+
+
+def get_deduplicator() -> Optional[Deduplicator]:
+    """Return the active Deduplicator, or None if disabled / 返回活动的Deduplicator，禁用时返回None"""
+    return _deduplicator
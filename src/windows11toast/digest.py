@@ -0,0 +1,192 @@
+"""Digest mode: aggregate bursts of events into one summary toast / 摘要模式：将突发事件聚合为一条摘要通知"""
+
+import threading
+import time
+from typing import Optional, List, Tuple, Callable, Any
+
+from .constants import DEFAULT_APP_ID
+from .notification import notify
+from .scheduler import get_scheduler
+
+
+def default_digest_renderer(count: int, events: List[Tuple[str, Optional[str]]]) -> Tuple[str, str]:
+    """
+    Render a digest as ('17 new alerts', first event lines).
+    将摘要渲染为('17 new alerts', 前几条事件)。
+
+    Args / 参数:
+        count: Total number of events in the digest / 摘要中的事件总数
+        events: First (title, body) events kept for display / 保留用于显示的前几条(title, body)事件
+
+    Returns / 返回:
+        (title, body) of the summary toast / 摘要通知的(title, body)
+    """
+    lines = [f'{title}: {body}' if body else title for title, body in events]
+    if count > len(events):
+        lines.append(f'… and {count - len(events)} more')
+    return f'{count} new alert' + ('s' if count != 1 else ''), '\n'.join(lines)
+
+
+class DigestNotifier:
+    """
+    Collect events arriving within a time window and show them as a single summary toast.
+    收集时间窗口内到达的事件，并以单条摘要通知显示。
+
+    The first event opens a window; the summary is shown when the window ends or when
+    `max_batch` events are waiting, whichever comes first. Events arriving later in the same
+    window update that summary in place by tag, without a second popup. Only the first `max_lines`
+    events are kept.
+    第一个事件开启一个窗口；窗口结束或等待中的事件达到`max_batch`时显示摘要，以先到者为准。
+    同一窗口内之后到达的事件按标签原地更新该摘要，不会再次弹出。仅保留前`max_lines`条事件。
+
+    Args / 参数:
+        window: Aggregation window in seconds / 聚合时间窗口（秒）
+        max_batch: Show the summary early once this many events are waiting / 等待中的事件达到此数量时提前显示摘要
+        max_lines: Number of events kept for display / 保留用于显示的事件数
+        renderer: Callable (count, events) -> (title, body) / 可调用对象 (count, events) -> (title, body)
+        app_id: Application ID / 应用程序ID
+        tag_prefix: Prefix of the per-window summary tag / 每个窗口摘要标签的前缀
+        group: Notification group / 通知组
+        **notify_options: Extra keyword arguments passed to notify() / 传递给notify()的额外关键字参数
+
+    Example / 示例:
+        digest = DigestNotifier(window=5, group='alerts')
+        for alert in alerts:
+            digest.add(alert.name, alert.message)
+    """
+
+    def __init__(self, window: float = 5.0, max_batch: int = 100, max_lines: int = 3,
+                 renderer: Optional[Callable[[int, List[Tuple[str, Optional[str]]]], Tuple[str, str]]] = None,
+                 app_id: str = DEFAULT_APP_ID, tag_prefix: str = 'digest', group: Optional[str] = None,
+                 **notify_options: Any):
+        if window <= 0:
+            raise ValueError('window must be positive')
+        if max_batch < 1:
+            raise ValueError('max_batch must be at least 1')
+        self.window = window
+        self.max_batch = max_batch
+        self.max_lines = max_lines
+        self.renderer = renderer or default_digest_renderer
+        self.app_id = app_id
+        self.tag_prefix = tag_prefix
+        self.group = group
+        self.notify_options = notify_options
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._window_id = 0
+        self._window_end = None
+        self._events: List[Tuple[str, Optional[str]]] = []
+        self._count = 0
+        self._unflushed = 0
+        self._snapshot_id = 0
+        self._shown_id = 0
+        self._shown_tag = None
+
+    @property
+    def tag(self) -> str:
+        """Tag of the current window's summary toast / 当前窗口摘要通知的标签"""
+        return f'{self.tag_prefix}-{self._window_id}'
+
+    def _timer_tag(self) -> str:
+        # Scheduler tag of the window timer, distinct from the toast tag / 窗口计时器的调度器标签，与通知标签不同
+        return f'{self.tag}-window'
+
+    def add(self, title: str, body: Optional[str] = None) -> None:
+        """
+        Add an event to the current digest.
+        向当前摘要添加一个事件。
+
+        Args / 参数:
+            title: Event title / 事件标题
+            body: Event body (optional) / 事件正文（可选）
+        """
+        now = time.time()
+        flush_now = False
+        previous = None
+        with self._lock:
+            if self._window_end is None or now >= self._window_end:
+                if self._unflushed:
+                    # The previous window ended before its timer fired / 上一个窗口已结束但其计时器尚未触发
+                    previous = self._take()
+                self._window_id += 1
+                self._window_end = now + self.window
+                self._events = []
+                self._count = 0
+                self._unflushed = 0
+                get_scheduler().call_at(self._window_end, self._on_window_end, self._window_id,
+                                        tag=self._timer_tag())
+            if len(self._events) < self.max_lines:
+                self._events.append((title, body))
+            self._count += 1
+            self._unflushed += 1
+            if self._unflushed >= self.max_batch:
+                flush_now = True
+        if previous is not None:
+            self._show(*previous)
+        if flush_now:
+            self.flush()
+
+    def _take(self) -> Tuple[int, int, List[Tuple[str, Optional[str]]], str]:
+        """Snapshot the current window for display (lock must be held) / 获取当前窗口的快照用于显示（须持有锁）"""
+        self._unflushed = 0
+        self._snapshot_id += 1
+        return self._snapshot_id, self._count, list(self._events), self.tag
+
+    def _show(self, snapshot_id: int, count: int, events: List[Tuple[str, Optional[str]]], tag: str):
+        # Snapshots are shown in order, one at a time / 快照按顺序逐个显示
+        with self._send_lock:
+            if snapshot_id <= self._shown_id:
+                # A newer snapshot was shown already / 已显示更新的快照
+                return None
+            self._shown_id = snapshot_id
+            title, body = self.renderer(count, events)
+            # Replacing a shown summary must not pop up again / 替换已显示的摘要时不应再次弹出
+            result = notify(title, body, app_id=self.app_id, tag=tag, group=self.group,
+                            suppress_popup=tag == self._shown_tag, **self.notify_options)
+            if result is not None:
+                self._shown_tag = tag
+            return result
+
+    def flush(self):
+        """
+        Show or update the summary toast of the current window now.
+        立即显示或更新当前窗口的摘要通知。
+
+        Returns / 返回:
+            ToastNotification object, or None if there was nothing to show / ToastNotification对象，如果没有内容可显示则返回None
+        """
+        with self._lock:
+            if not self._unflushed:
+                return None
+            snapshot = self._take()
+        return self._show(*snapshot)
+
+    def _on_window_end(self, window_id: int) -> None:
+        # Check and snapshot under one lock so a newer window is never flushed early /
+        # 在同一把锁内检查并获取快照，避免提前刷新更新的窗口
+        with self._lock:
+            if window_id != self._window_id or not self._unflushed:
+                return
+            snapshot = self._take()
+        self._show(*snapshot)
+
+    def close(self):
+        """
+        Show the pending summary now and stop the window timer.
+        立即显示待显示的摘要并停止窗口计时器。
+
+        Returns / 返回:
+            ToastNotification object, or None if there was nothing to show / ToastNotification对象，如果没有内容可显示则返回None
+        """
+        with self._lock:
+            if self._window_end is not None:
+                get_scheduler().cancel(self._timer_tag())
+                self._window_end = None
+            snapshot = self._take() if self._unflushed else None
+        return self._show(*snapshot) if snapshot is not None else None
+
+    def __enter__(self) -> 'DigestNotifier':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
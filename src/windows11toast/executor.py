@@ -0,0 +1,80 @@
+"""Bounded executor for the blocking WinRT calls of async entry points / 异步入口中阻塞WinRT调用的有界执行器"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Any
+
+# Default number of WinRT worker threads / 默认的WinRT工作线程数
+DEFAULT_MAX_WORKERS = 4
+
+_lock = threading.Lock()
+# Worker count, 0 keeps WinRT calls inline on the event loop / 工作线程数，0表示在事件循环中内联执行WinRT调用
+_max_workers = DEFAULT_MAX_WORKERS
+# Created on first use / 首次使用时创建
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def enable_winrt_executor(max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+    """
+    Run the blocking WinRT calls of async entry points on a dedicated thread pool (the default).
+    在专用线程池中执行异步入口的阻塞WinRT调用（默认行为）。
+
+    Document loading, notifier creation and show() then no longer stall the event loop. Event
+    handlers are still subscribed before the toast is shown and results are delivered on the loop.
+    这样文档加载、通知器创建和show()不再阻塞事件循环。事件处理器仍在通知显示前订阅，结果仍在事件循环中投递。
+
+    Args / 参数:
+        max_workers: Maximum number of WinRT worker threads / WinRT工作线程的最大数量
+
+    Example / 示例:
+        enable_winrt_executor(max_workers=2)
+        await toast_async('Build finished')
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be at least 1')
+    global _max_workers, _executor
+    with _lock:
+        old, _executor = _executor, None
+        _max_workers = max_workers
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def disable_winrt_executor() -> None:
+    """Keep WinRT calls inline on the event loop thread / 在事件循环线程中内联执行WinRT调用"""
+    global _max_workers, _executor
+    with _lock:
+        old, _executor = _executor, None
+        _max_workers = 0
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def get_winrt_executor() -> Optional[ThreadPoolExecutor]:
+    """Return the WinRT executor, or None when calls run inline / 返回WinRT执行器，内联执行时返回None"""
+    global _executor
+    if not _max_workers:
+        return None
+    with _lock:
+        if _executor is None and _max_workers:
+            _executor = ThreadPoolExecutor(_max_workers, thread_name_prefix='windows11toast-winrt')
+        return _executor
+
+
+async def run_blocking(func: Callable, *args: Any, limit: Optional[asyncio.Semaphore] = None, **kwargs: Any) -> Any:
+    """
+    Run func(*args, **kwargs) on the WinRT executor, or inline when it is disabled.
+    在WinRT执行器中执行func(*args, **kwargs)，禁用时内联执行。
+
+    Args / 参数:
+        limit: Semaphore held while func runs, to cap concurrent calls (optional) / 执行func期间持有的信号量，用于限制并发调用（可选）
+    """
+    if limit is not None:
+        async with limit:
+            return await run_blocking(func, *args, **kwargs)
+    executor = get_winrt_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,116 @@
+"""Notification history (Action Center) functions / 通知历史（操作中心）函数"""
+
+from typing import Optional, Dict, List, Callable, Iterable, Tuple, Any
+from winrt.windows.ui.notifications import ToastNotificationManager
+
+from .constants import DEFAULT_APP_ID
+
+
+def _entry(notification) -> Dict[str, Any]:
+    """Convert a ToastNotification from history to a dictionary / 将历史中的ToastNotification转换为字典"""
+    return {
+        'tag': notification.tag or None,
+        'group': notification.group or None,
+        'expiration_time': notification.expiration_time,
+        'notification': notification
+    }
+
+
+def list_toasts(app_id: str = DEFAULT_APP_ID,
+                tag: Optional[str] = None,
+                group: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List toast notifications currently shown in Action Center.
+    列出当前显示在操作中心的通知。
+
+    Args / 参数:
+        app_id: Application ID / 应用程序ID
+        tag: Only list notifications with this tag (optional) / 仅列出具有此标签的通知（可选）
+        group: Only list notifications in this group (optional) / 仅列出此组中的通知（可选）
+
+    Returns / 返回:
+        List of dictionaries with 'tag', 'group', 'expiration_time' and 'notification' keys
+        包含'tag'、'group'、'expiration_time'和'notification'键的字典列表
+
+    Example / 示例:
+        for entry in list_toasts():
+            print(entry['tag'], entry['group'], entry['expiration_time'])
+    """
+    entries = [_entry(n) for n in ToastNotificationManager.history.get_history(app_id)]
+    if tag is not None:
+        entries = [e for e in entries if e['tag'] == tag]
+    if group is not None:
+        entries = [e for e in entries if e['group'] == group]
+    return entries
+
+
+def clear_many(items: Iterable[Tuple[str, Optional[str]]], app_id: str = DEFAULT_APP_ID) -> int:
+    """
+    Remove many notifications from Action Center in one batch.
+    批量从操作中心删除多个通知。
+
+    Args / 参数:
+        items: Iterable of (tag, group) pairs. A None tag removes the whole group / (tag, group)对的可迭代对象。tag为None时删除整个组
+        app_id: Application ID / 应用程序ID
+
+    Returns / 返回:
+        Number of removal calls made / 执行的删除调用次数
+
+    Raises / 异常:
+        AttributeError: If a pair has a tag but no group / 如果某对提供了tag但没有提供group
+
+    Example / 示例:
+        clear_many([('disk-full', 'alerts'), ('cpu-high', 'alerts')])
+    """
+    pairs = list(items)
+    for tag, group in pairs:
+        if not group:
+            # Cannot remove notification only using tag. Group is required. / 不能仅使用tag删除通知。需要提供group。
+            raise AttributeError('group value is required to clear a toast')
+
+    history = ToastNotificationManager.history
+    removed_groups = set()
+    count = 0
+    for tag, group in pairs:
+        if tag is None:
+            if group in removed_groups:
+                continue
+            removed_groups.add(group)
+            history.remove_group(group, app_id)
+        elif group in removed_groups:
+            # Already removed together with its group / 已随其所在组一起删除
+            continue
+        else:
+            history.remove(tag, group, app_id)
+        count += 1
+    return count
+
+
+def prune_toasts(predicate: Callable[[Dict[str, Any]], bool], app_id: str = DEFAULT_APP_ID) -> List[Dict[str, Any]]:
+    """
+    Remove every notification in Action Center that matches a predicate.
+    删除操作中心中所有满足条件的通知。
+
+    Args / 参数:
+        predicate: Called with each entry from list_toasts(); return True to remove it / 对list_toasts()的每个条目调用；返回True则删除
+        app_id: Application ID / 应用程序ID
+
+    Returns / 返回:
+        List of removed entries. Entries without both tag and group are skipped / 已删除的条目列表。缺少tag或group的条目会被跳过
+
+    Example / 示例:
+        # Retract every alert of a resolved incident / 撤回已解决事件的所有告警
+        prune_toasts(lambda e: e['group'] == 'incident-42')
+    """
+    history = ToastNotificationManager.history
+    removed = []
+    # Snapshot before removing so the view is not mutated while iterating / 删除前先取快照，避免迭代时视图被修改
+    for entry in [_entry(n) for n in history.get_history(app_id)]:
+        if not predicate(entry):
+            continue
+        if not (entry['tag'] and entry['group']):
+            # Removal requires both tag and group (see clear_toast) / 删除需要同时提供tag和group（见clear_toast）
+            continue
+        history.remove(entry['tag'], entry['group'], app_id)
+        removed.append(entry)
+    return removed
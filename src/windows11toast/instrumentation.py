@@ -0,0 +1,113 @@
+"""Per-phase timing instrumentation for notify() / notify()的分阶段计时
+
+notify() records how long each phase takes:
+notify()会记录每个阶段的耗时：
+
+    normalize      Argument normalization, dedup and validation / 参数规范化、去重和校验
+    images         Remote image download and image resizing / 远程图片下载和图片缩放
+    build          XML document build / XML文档构建
+    progress_data  Progress data binding / 进度数据绑定
+    notifier       Notifier acquisition / 获取通知器
+    show           notifier.show (or scheduling) / notifier.show（或定时）
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, List, Callable, Any
+
+_hooks: List[Callable[[Dict[str, Any]], None]] = []
+_buffer: Optional[deque] = None
+_lock = threading.Lock()
+
+
+class PhaseTimer:
+    """Measure consecutive phases of one notify() call / 测量一次notify()调用的连续阶段"""
+
+    __slots__ = ('phases', '_start', '_last')
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """End the current phase and start the next one / 结束当前阶段并开始下一个阶段"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def finish(self, app_id: str, tag: Optional[str]) -> None:
+        """Deliver the record to the buffer and hooks / 将记录交付给缓冲区和回调"""
+        record = {
+            'timestamp': time.time(),
+            'app_id': app_id,
+            'tag': tag,
+            'phases': self.phases,
+            'total': self._last - self._start,
+        }
+        if _buffer is not None:
+            _buffer.append(record)
+        for hook in list(_hooks):
+            try:
+                hook(record)
+            except Exception:
+                # A failing hook must not break notify() / 回调失败不能影响notify()
+                pass
+
+
+def start_timer() -> Optional[PhaseTimer]:
+    """Return a PhaseTimer if instrumentation is enabled, otherwise None / 如果启用了计时则返回PhaseTimer，否则返回None"""
+    if _buffer is None and not _hooks:
+        return None
+    return PhaseTimer()
+
+
+def add_timing_hook(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Call callback with a timing record after every notify().
+    每次notify()后使用计时记录调用callback。
+
+    The record is a dictionary with 'timestamp', 'app_id', 'tag', 'phases' (phase name -> seconds) and 'total'.
+    记录是包含'timestamp'、'app_id'、'tag'、'phases'（阶段名 -> 秒）和'total'的字典。
+
+    Args / 参数:
+        callback: Callable receiving the record / 接收记录的可调用对象
+
+    Example / 示例:
+        add_timing_hook(lambda r: tracer.record('notify', r['total'], **r['phases']))
+    """
+    with _lock:
+        _hooks.append(callback)
+
+
+def remove_timing_hook(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """Remove a callback added with add_timing_hook / 移除通过add_timing_hook添加的回调"""
+    with _lock:
+        if callback in _hooks:
+            _hooks.remove(callback)
+
+
+def enable_timing_buffer(size: int = 1000) -> deque:
+    """
+    Keep the last `size` timing records in an in-process ring buffer.
+    在进程内环形缓冲区中保留最近`size`条计时记录。
+
+    Returns / 返回:
+        The ring buffer (a collections.deque) / 环形缓冲区（collections.deque）
+    """
+    global _buffer
+    _buffer = deque(maxlen=size)
+    return _buffer
+
+
+def get_timings() -> List[Dict[str, Any]]:
+    """Return the records in the ring buffer, oldest first / 返回环形缓冲区中的记录，最旧的在前"""
+    return list(_buffer) if _buffer is not None else []
+
+
+def disable_timings() -> None:
+    """Remove every hook and the ring buffer / 移除所有回调和环形缓冲区"""
+    global _buffer
+    with _lock:
+        _hooks.clear()
+    _buffer = None
@@ -0,0 +1,248 @@
+"""Table-driven normalizer for the legacy dict-style toast() arguments / 旧版字典式toast()参数的表驱动规范化器"""
+
+from typing import Optional, Dict, List, Tuple, Callable, Union, Any
+
+from .enums import ImagePlacement, IconPlacement, IconCrop, ToastDuration
+from .constants import DEFAULT_APP_ID
+from .spec import ToastSpec, InputSpec, SelectionSpec
+
+
+def _enum_table(enum) -> Dict[str, Any]:
+    """Map every accepted spelling of each member to the member / 将每个成员的所有可接受写法映射到该成员"""
+    table = {}
+    for member in enum:
+        for key in (member.name, member.name.lower(), member.name.lower().replace('_', '-'), member.value):
+            table[key] = member
+    return table
+
+
+# Precomputed enum lookup tables / 预先计算的枚举查找表
+_IMAGE_PLACEMENTS = _enum_table(ImagePlacement)
+_ICON_PLACEMENTS = _enum_table(IconPlacement)
+_ICON_CROPS = _enum_table(IconCrop)
+
+
+def _lookup(table: Dict[str, Any], value: Optional[str]):
+    """O(1) enum lookup; unknown values are ignored like before / O(1)枚举查找；与之前一样忽略未知值"""
+    if not value:
+        return None
+    member = table.get(value)
+    if member is None:
+        # Unusual spellings such as 'App-Logo-Override' / 少见的写法，例如'App-Logo-Override'
+        member = table.get(value.replace('-', '_').upper())
+    return member
+
+
+def _icon(value: Union[str, Dict[str, str]], fields: Dict[str, Any]) -> None:
+    if fields['icon_src']:
+        return
+    if isinstance(value, str):
+        fields['icon_src'] = value
+        return
+    fields['icon_src'] = value.get('src')
+    if not fields['icon_placement']:
+        fields['icon_placement'] = _lookup(_ICON_PLACEMENTS, value.get('placement'))
+    if not fields['icon_hint_crop']:
+        fields['icon_hint_crop'] = _lookup(_ICON_CROPS, value.get('hint-crop'))
+
+
+def _image(value: Union[str, Dict[str, str]], fields: Dict[str, Any]) -> None:
+    if fields['image_src']:
+        return
+    if isinstance(value, str):
+        fields['image_src'] = value
+        return
+    fields['image_src'] = value.get('src')
+    if not fields['image_placement']:
+        fields['image_placement'] = _lookup(_IMAGE_PLACEMENTS, value.get('placement'))
+
+
+def _progress(value: Dict[str, Any], fields: Dict[str, Any]) -> None:
+    # Parameterized form takes precedence / 参数化形式优先
+    if (fields['progress_title'] is not None or fields['progress_status'] is not None
+            or fields['progress_value'] is not None or fields['progress_value_string_override'] is not None):
+        return
+    fields['progress_title'] = value.get('title')
+    fields['progress_status'] = value.get('status')
+    if 'value' in value:
+        fields['progress_value'] = float(value['value'])
+    fields['progress_value_string_override'] = value.get('valueStringOverride')
+
+
+def _audio(value: Union[str, Dict[str, Any]], fields: Dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        fields['audio'] = value.get('src')
+        if not fields['audio_loop']:
+            fields['audio_loop'] = value.get('loop') == 'true' or value.get('loop') is True
+    else:
+        fields['audio'] = value
+
+
+def _add_input(value: Union[str, Dict[str, str]], fields: Dict[str, Any]) -> None:
+    if isinstance(value, str):
+        fields['inputs'].append(InputSpec(value, value))
+    elif value.get('id'):
+        # Inputs without an ID are skipped like before / 与之前一样跳过没有ID的输入
+        fields['inputs'].append(InputSpec(value['id'], value.get('placeHolderContent') or value.get('placeholder')))
+
+
+def _input(value: Union[str, Dict[str, str]], fields: Dict[str, Any]) -> None:
+    # Ignored when input_id/input_placeholder are given / 提供了input_id/input_placeholder时忽略
+    if not fields['_input_param']:
+        _add_input(value, fields)
+        fields['_input_param'] = True
+
+
+def _inputs(value: List[Union[str, Dict[str, str]]], fields: Dict[str, Any]) -> None:
+    # Ignored when input_id/input_placeholder or input are given / 提供了input_id/input_placeholder或input时忽略
+    if not fields['_input_param']:
+        for item in value:
+            _add_input(item, fields)
+
+
+def _is_option(value: Any) -> bool:
+    """Whether value is one option of a selection: text, (id, content) or {'id', 'content'} /
+    value是否为选择框的一个选项：文本、(id, content)或{'id', 'content'}"""
+    return isinstance(value, (str, tuple)) or (isinstance(value, dict) and 'selection' not in value
+                                               and 'input' not in value)
+
+
+def _next_selection_id(fields: Dict[str, Any]) -> str:
+    return 'selection' if not fields['selections'] else f"selection{len(fields['selections']) + 1}"
+
+
+def _selection_spec(value: Union[List[str], Dict[str, Any]], default_id: str) -> SelectionSpec:
+    if isinstance(value, dict):
+        return SelectionSpec(value.get('input', {}).get('id', default_id), value.get('selection', []))
+    return SelectionSpec(default_id, value)
+
+
+def _selection(value: Union[List[str], Dict[str, Any]], fields: Dict[str, Any]) -> None:
+    # Ignored when selection_id is given / 提供了selection_id时忽略
+    if not fields['_selection_id']:
+        fields['selections'].append(_selection_spec(value, 'selection'))
+
+
+def _selections(value: List[Any], fields: Dict[str, Any]) -> None:
+    if all(_is_option(item) for item in value):
+        # A flat list of options is one selection / 平铺的选项列表是一个选择框
+        if fields['_selection_id']:
+            fields['selections'].append(SelectionSpec(fields['_selection_id'], value))
+        elif not fields['selections']:
+            # Ignored when selection is given, like before / 与之前一样，提供了selection时忽略
+            fields['selections'].append(SelectionSpec('selection', value))
+        return
+    # A list of option lists or {'input', 'selection'} dicts is several selections /
+    # 选项列表或{'input', 'selection'}字典组成的列表表示多个选择框
+    for item in value:
+        if _is_option(item):
+            raise TypeError("selections must be a flat list of options, or a list of option lists and "
+                            "{'input', 'selection'} dicts")
+        fields['selections'].append(_selection_spec(item, _next_selection_id(fields)))
+
+
+def _button(value: Union[str, Dict[str, str]], fields: Dict[str, Any]) -> None:
+    # Ignored when button_content is given / 提供了button_content时忽略
+    if not fields['buttons']:
+        fields['buttons'].append(value)
+
+
+def _buttons(value: List[Union[str, Dict[str, str]]], fields: Dict[str, Any]) -> None:
+    fields['buttons'].extend(value)
+
+
+# Legacy argument -> converter, applied in this order / 旧版参数 -> 转换器，按此顺序应用
+_CONVERTERS: Tuple[Tuple[str, Callable[[Any, Dict[str, Any]], None]], ...] = (
+    ('icon', _icon),
+    ('image', _image),
+    ('progress', _progress),
+    ('audio', _audio),
+    ('input', _input),
+    ('inputs', _inputs),
+    ('selection', _selection),
+    ('selections', _selections),
+    ('button', _button),
+    ('buttons', _buttons),
+)
+
+
+def legacy_spec(title: Optional[str] = None, body: Optional[str] = None,
+                on_click: Optional[Union[Callable, str]] = None,
+                icon: Optional[Union[str, Dict[str, str]]] = None,
+                image: Optional[Union[str, Dict[str, str]]] = None,
+                progress: Optional[Dict[str, Any]] = None,
+                audio: Optional[Union[str, Dict[str, str]]] = None,
+                dialogue: Optional[str] = None,
+                duration: Optional[ToastDuration] = None,
+                input: Optional[Union[str, Dict[str, str]]] = None,
+                inputs: Optional[List[Union[str, Dict[str, str]]]] = None,
+                selection: Optional[Union[List[str], Dict[str, Any]]] = None,
+                selections: Optional[List[Union[str, List[str], Dict[str, Any]]]] = None,
+                button: Optional[Union[str, Dict[str, str]]] = None,
+                buttons: Optional[List[Union[str, Dict[str, str]]]] = None,
+                xml: Optional[str] = None,
+                app_id: str = DEFAULT_APP_ID,
+                image_src: Optional[str] = None,
+                image_placement: Optional[ImagePlacement] = None,
+                icon_src: Optional[str] = None,
+                icon_placement: Optional[IconPlacement] = None,
+                icon_hint_crop: Optional[IconCrop] = None,
+                progress_title: Optional[str] = None,
+                progress_status: Optional[str] = None,
+                progress_value: Optional[float] = None,
+                progress_value_string_override: Optional[str] = None,
+                input_id: Optional[str] = None,
+                input_placeholder: Optional[str] = None,
+                selection_id: Optional[str] = None,
+                button_content: Optional[str] = None,
+                audio_loop: bool = False) -> ToastSpec:
+    """
+    Convert the legacy toast() argument set to a ToastSpec in a single pass.
+    一次性将旧版toast()参数集转换为ToastSpec。
+
+    Parameterized arguments (icon_src, progress_title, input_id, ...) take precedence over the
+    legacy dicts, as before: input_id/input_placeholder over `input` over `inputs`, and
+    `selection` over a flat `selections` list unless selection_id is given. Every element of
+    `inputs` is kept, not only the first.
+    与之前一样，参数化参数（icon_src、progress_title、input_id等）优先于旧版字典：
+    input_id/input_placeholder优先于`input`，`input`优先于`inputs`；未提供selection_id时`selection`
+    优先于平铺的`selections`列表。`inputs`中的每个元素都会保留，而不仅是第一个。
+
+    `selections` is either a flat list of options (text, (id, content) or {'id', 'content'}), which makes one
+    selection with the ID selection_id (default 'selection'), or a list of option lists and
+    {'input', 'selection'} dicts, which makes one selection each.
+    `selections`可以是平铺的选项列表（文本、(id, content)或{'id', 'content'}），生成一个ID为selection_id（默认'selection'）
+    的选择框；也可以是由选项列表和{'input', 'selection'}字典组成的列表，每个元素生成一个选择框。
+
+    Returns / 返回:
+        ToastSpec for notify() / 供notify()使用的ToastSpec
+
+    Raises / 异常:
+        TypeError: If selections mixes options with option lists / 如果selections混合了选项和选项列表
+
+    Example / 示例:
+        spec = legacy_spec('Hello', icon={'src': 'a.png', 'placement': 'appLogoOverride'},
+                           inputs=[{'id': 'name'}, {'id': 'email'}])
+    """
+    fields = {
+        'icon_src': icon_src, 'icon_placement': icon_placement, 'icon_hint_crop': icon_hint_crop,
+        'image_src': image_src, 'image_placement': image_placement,
+        'progress_title': progress_title, 'progress_status': progress_status,
+        'progress_value': progress_value, 'progress_value_string_override': progress_value_string_override,
+        'audio': None, 'audio_loop': audio_loop,
+        'inputs': [InputSpec(input_id, input_placeholder)] if input_id else [],
+        'selections': [],
+        'buttons': [button_content] if button_content else [],
+        # Parameterized values that only affect the legacy converters / 仅影响旧版转换器的参数化值
+        '_input_param': input_id is not None or input_placeholder is not None,
+        '_selection_id': selection_id,
+    }
+    legacy = {'icon': icon, 'image': image, 'progress': progress, 'audio': audio,
+              'input': input, 'inputs': inputs, 'selection': selection, 'selections': selections,
+              'button': button, 'buttons': buttons}
+    for name, convert in _CONVERTERS:
+        value = legacy[name]
+        if value:
+            convert(value, fields)
+    del fields['_input_param'], fields['_selection_id']
+    return ToastSpec(title, body, on_click, dialogue=dialogue, duration=duration, xml=xml, app_id=app_id, **fields)
@@ -1,7 +1,7 @@
 """Media functions for audio, speech, and OCR / 音频、语音和OCR相关函数"""
 
 import asyncio
-from typing import Optional, Union
+from typing import Optional, Union, Any, AsyncIterator
 from winrt.windows.media.core import MediaSource
 from winrt.windows.media.playback import MediaPlayer
 from winrt.windows.media.speechsynthesis import SpeechSynthesizer
@@ -49,6 +49,38 @@ async def speak(text: str) -> None:
     await asyncio.sleep(7)
 
 
+class _UnsupportedOcrResult:
+    """Placeholder result when the OCR language pack is missing / 缺少OCR语言包时的占位结果"""
+
+    def __init__(self):
+        self.text = 'Please install. Get-WindowsCapability -Online -Name "Language.OCR*"'
+
+
+async def _open_image_stream(ocr_src: str):
+    """Open an image source as a random access stream / 将图片源打开为随机访问流"""
+    if ocr_src.startswith('http'):
+        ref = RandomAccessStreamReference.create_from_uri(Uri(ocr_src))
+        return await ref.open_read_async()
+    file = await StorageFile.get_file_from_path_async(ocr_src)
+    return await file.open_async(FileAccessMode.READ)
+
+
+def _create_ocr_engine(lang: Optional[Union[str, OcrLanguage]] = None):
+    """
+    Create an OCR engine for the given language.
+    为指定语言创建OCR引擎。
+
+    Returns / 返回:
+        OcrEngine, or None if the language is not supported / OcrEngine，如果语言不受支持则返回None
+    """
+    if lang:
+        lang_str = str(lang) if lang != OcrLanguage.AUTO else None
+        if lang_str and OcrEngine.is_language_supported(Language(lang_str)):
+            return OcrEngine.try_create_from_language(Language(lang_str))
+        return None
+    return OcrEngine.try_create_from_user_profile_languages()
+
+
 async def recognize(ocr_src: str, lang: Optional[Union[str, OcrLanguage]] = None):
     """
     Recognize text from an image using OCR.
@@ -61,32 +93,80 @@ async def recognize(ocr_src: str, lang: Optional[Union[str, OcrLanguage]] = None
     Returns / 返回:
         OCR result object / OCR结果对象
     """
-    if ocr_src.startswith('http'):
-        ref = RandomAccessStreamReference.create_from_uri(Uri(ocr_src))
-        stream = await ref.open_read_async()
-    else:
-        file = await StorageFile.get_file_from_path_async(ocr_src)
-        stream = await file.open_async(FileAccessMode.READ)
+    stream = await _open_image_stream(ocr_src)
     decoder = await BitmapDecoder.create_async(stream)
     bitmap = await decoder.get_software_bitmap_async()
 
-    if lang:
-        lang_str = str(lang) if lang != OcrLanguage.AUTO else None
-        if lang_str and OcrEngine.is_language_supported(Language(lang_str)):
-            engine = OcrEngine.try_create_from_language(Language(lang_str))
-        else:
-            class UnsupportedOcrResult:
-                def __init__(self):
-                    self.text = 'Please install. Get-WindowsCapability -Online -Name "Language.OCR*"'
-
-            return UnsupportedOcrResult()
-    else:
-        engine = OcrEngine.try_create_from_user_profile_languages()
+    engine = _create_ocr_engine(lang)
+    if engine is None:
+        return _UnsupportedOcrResult()
     # Available properties (lines, angle, word, BoundingRect(x,y,width,height))
     # https://docs.microsoft.com/en-us/uwp/api/windows.media.ocr.ocrresult?view=winrt-22621#properties
     return await engine.recognize_async(bitmap)
 
 
+async def _decode_frame(decoder, index: int):
+    """Decode a single frame into a SoftwareBitmap / 将单帧解码为SoftwareBitmap"""
+    frame = await decoder.get_frame_async(index)
+    return await frame.get_software_bitmap_async()
+
+
+async def recognize_frames(ocr_src: str,
+                           lang: Optional[Union[str, OcrLanguage]] = None) -> AsyncIterator[Any]:
+    """
+    Recognize text from every frame of a multi-frame image (TIFF, GIF, ...), one frame at a time.
+    逐帧识别多帧图片（TIFF、GIF等）中每一帧的文本。
+
+    Each result is yielded as soon as its frame is recognized. While a frame is being
+    recognized the next one is decoded, so at most two decoded frames are held in memory.
+    每帧识别完成后立即产出结果。识别当前帧时会同时解码下一帧，因此内存中最多保留两帧。
+
+    Args / 参数:
+        ocr_src: Image source URL or file path / 图片源URL或文件路径
+        lang: OCR language (OcrLanguage enum or language tag like 'en-US'). None for auto / OCR语言（OcrLanguage枚举或语言标签如'en-US'）。None表示自动
+
+    Yields / 产出:
+        OCR result object for each frame, in frame order / 按帧顺序产出每帧的OCR结果对象
+
+    Example / 示例:
+        page = 0
+        async for result in recognize_frames('scan.tiff'):
+            page += 1
+            print(page, result.text)
+    """
+    engine = _create_ocr_engine(lang)
+    if engine is None:
+        yield _UnsupportedOcrResult()
+        return
+
+    stream = await _open_image_stream(ocr_src)
+    try:
+        decoder = await BitmapDecoder.create_async(stream)
+        frame_count = decoder.frame_count
+        if not frame_count:
+            return
+
+        pending = asyncio.ensure_future(_decode_frame(decoder, 0))
+        try:
+            for index in range(frame_count):
+                bitmap = await pending
+                pending = None
+                # Decode the next frame while this one is being recognized / 识别当前帧时解码下一帧
+                if index + 1 < frame_count:
+                    pending = asyncio.ensure_future(_decode_frame(decoder, index + 1))
+                try:
+                    result = await engine.recognize_async(bitmap)
+                finally:
+                    bitmap.close()
+                    del bitmap
+                yield result
+        finally:
+            if pending is not None:
+                pending.cancel()
+    finally:
+        stream.close()
+
+
 def available_recognizer_languages():
     """
     Print available OCR languages and installation instructions.
@@ -0,0 +1,329 @@
+"""In-memory stand-in for the WinRT modules used by windows11toast / windows11toast所用WinRT模块的内存替身
+
+Used by the stress harness to exercise the Python-side send path on any machine. install() must
+run before any WinRT-backed windows11toast module is imported.
+供压力测试工具在任意机器上运行Python侧的发送路径。install()必须在导入任何依赖WinRT的windows11toast模块之前调用。
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+import types
+import xml.dom.minidom as minidom
+from typing import Optional, Dict, List, Any
+
+# WinRT-backed windows11toast modules / 依赖WinRT的windows11toast模块
+_WINRT_BACKED = ('notification', 'progress', 'templates', 'utils', 'xml_builder', 'media', 'history')
+
+
+class _Attribute:
+    def __init__(self, name: str):
+        self.name = name
+        self.value = None
+
+
+class _Attributes:
+    __slots__ = ('_element',)
+
+    def __init__(self, element):
+        self._element = element
+
+    def set_named_item(self, attribute: _Attribute) -> None:
+        self._element.setAttribute(attribute.name, attribute.value)
+
+
+class _Element:
+    __slots__ = ('_node', '_document')
+
+    def __init__(self, node, document):
+        self._node = node
+        self._document = document
+
+    def set_attribute(self, name: str, value: str) -> None:
+        self._node.setAttribute(name, value)
+
+    def append_child(self, child: '_Element') -> '_Element':
+        self._node.appendChild(child._node)
+        return child
+
+    @property
+    def attributes(self) -> _Attributes:
+        return _Attributes(self._node)
+
+    @property
+    def inner_text(self) -> str:
+        return ''.join(child.data for child in self._node.childNodes if child.nodeType == child.TEXT_NODE)
+
+    @inner_text.setter
+    def inner_text(self, value: str) -> None:
+        for child in list(self._node.childNodes):
+            self._node.removeChild(child)
+        self._node.appendChild(self._document.createTextNode(value))
+
+
+class XmlDocument:
+    """minidom-backed XmlDocument supporting the calls made by xml_builder / 基于minidom、支持xml_builder所用调用的XmlDocument"""
+
+    def __init__(self):
+        self._document = None
+
+    @classmethod
+    def _from(cls, value):
+        return value
+
+    def load_xml(self, xml: str) -> None:
+        self._document = minidom.parseString(xml.strip())
+
+    def get_xml(self) -> str:
+        return self._document.documentElement.toxml()
+
+    def clone_node(self, deep: bool) -> 'XmlDocument':
+        clone = XmlDocument()
+        clone._document = self._document.cloneNode(deep)
+        return clone
+
+    def select_single_node(self, xpath: str) -> Optional[_Element]:
+        # Only the '/name' and '//name' forms used by xml_builder / 仅支持xml_builder使用的'/name'和'//name'形式
+        elements = self._document.getElementsByTagName(xpath.lstrip('/'))
+        return _Element(elements[0], self._document) if elements else None
+
+    def create_element(self, name: str) -> _Element:
+        return _Element(self._document.createElement(name), self._document)
+
+    def create_attribute(self, name: str) -> _Attribute:
+        return _Attribute(name)
+
+
+class _EventArgs:
+    """Event arguments delivered by the shell / 通知中心投递的事件参数"""
+
+    def __init__(self, reason: int = 0, error_code: int = 0, arguments: str = ''):
+        self.reason = reason
+        self.error_code = error_code
+        self.arguments = arguments
+        self.user_input = {}
+
+    @classmethod
+    def _from(cls, value):
+        return value
+
+
+class NotificationData:
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+        self.sequence_number = 0
+
+
+class ToastNotification:
+    def __init__(self, document: XmlDocument):
+        self.content = document
+        self.tag = ''
+        self.group = ''
+        self.data = None
+        self.suppress_popup = False
+        self._handlers: Dict[str, Dict[int, Any]] = {'activated': {}, 'dismissed': {}, 'failed': {}}
+        self._tokens = itertools.count(1)
+
+    def _add(self, event: str, handler) -> int:
+        token = next(self._tokens)
+        self._handlers[event][token] = handler
+        return token
+
+    def add_activated(self, handler) -> int:
+        return self._add('activated', handler)
+
+    def add_dismissed(self, handler) -> int:
+        return self._add('dismissed', handler)
+
+    def add_failed(self, handler) -> int:
+        return self._add('failed', handler)
+
+    def remove_activated(self, token: int) -> None:
+        self._handlers['activated'].pop(token, None)
+
+    def remove_dismissed(self, token: int) -> None:
+        self._handlers['dismissed'].pop(token, None)
+
+    def remove_failed(self, token: int) -> None:
+        self._handlers['failed'].pop(token, None)
+
+    def _fire(self, event: str, args: _EventArgs) -> None:
+        for handler in list(self._handlers[event].values()):
+            handler(self, args)
+
+
+class ScheduledToastNotification:
+    def __init__(self, document: XmlDocument, delivery_time):
+        self.content = document
+        self.delivery_time = delivery_time
+        self.tag = ''
+        self.group = ''
+
+
+class Shell:
+    """
+    The simulated notification center shared by every notifier.
+    所有通知器共享的模拟通知中心。
+
+    Args / 参数:
+        show_latency: Seconds each show() blocks, under one lock like the real shell / 每次show()阻塞的秒数，与真实通知中心一样在同一把锁内
+        dismiss_after: Seconds before toasts with handlers are dismissed, None to never dismiss /
+            带处理器的通知被关闭前的秒数，None表示从不关闭
+    """
+
+    def __init__(self, show_latency: float = 0.0, dismiss_after: Optional[float] = 0.0):
+        self.show_latency = show_latency
+        self.dismiss_after = dismiss_after
+        self.shown = 0
+        self.updated = 0
+        self.scheduled: List[ScheduledToastNotification] = []
+        self._lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._pending: List[Any] = []
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def show(self, notification: ToastNotification) -> None:
+        with self._lock:
+            if self.show_latency:
+                time.sleep(self.show_latency)
+            self.shown += 1
+        if self.dismiss_after is not None and any(notification._handlers.values()):
+            self._dismiss_later(notification)
+
+    def _dismiss_later(self, notification: ToastNotification) -> None:
+        with self._condition:
+            heapq.heappush(self._pending, (time.monotonic() + self.dismiss_after, next(self._counter), notification))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='memory-winrt-shell', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending or self._pending[0][0] > time.monotonic():
+                    self._condition.wait(self._pending[0][0] - time.monotonic() if self._pending else None)
+                _, _, notification = heapq.heappop(self._pending)
+            # User dismissed / 用户关闭
+            notification._fire('dismissed', _EventArgs(reason=0))
+
+
+class ToastNotifier:
+    def __init__(self, shell: Shell):
+        self._shell = shell
+
+    def show(self, notification: ToastNotification) -> None:
+        self._shell.show(notification)
+
+    def update(self, data: NotificationData, tag: str, group: Optional[str] = None) -> int:
+        with self._shell._lock:
+            self._shell.updated += 1
+        return 0
+
+    def add_to_schedule(self, scheduled: ScheduledToastNotification) -> None:
+        with self._shell._lock:
+            self._shell.scheduled.append(scheduled)
+
+    def get_scheduled_toast_notifications(self) -> List[ScheduledToastNotification]:
+        with self._shell._lock:
+            return list(self._shell.scheduled)
+
+    def remove_from_schedule(self, scheduled: ScheduledToastNotification) -> None:
+        with self._shell._lock:
+            self._shell.scheduled.remove(scheduled)
+
+
+class _History:
+    def get_history(self, app_id: str) -> List[ToastNotification]:
+        return []
+
+    def clear(self, app_id: str) -> None:
+        pass
+
+    def remove(self, tag: str, group: str, app_id: str) -> None:
+        pass
+
+    def remove_group(self, group: str, app_id: str) -> None:
+        pass
+
+
+class _Placeholder:
+    """Stand-in for WinRT classes the send path never calls / 发送路径从不调用的WinRT类的替身"""
+
+    def __init__(self, *args, **kwargs):
+        raise NotImplementedError('not available in the in-memory WinRT')
+
+    @classmethod
+    def _from(cls, value):
+        return value
+
+
+def install(show_latency: float = 0.0, dismiss_after: Optional[float] = 0.0) -> Shell:
+    """
+    Register the in-memory WinRT modules in sys.modules.
+    在sys.modules中注册内存WinRT模块。
+
+    Args / 参数:
+        show_latency: Seconds each show() blocks / 每次show()阻塞的秒数
+        dismiss_after: Seconds before toasts with handlers are dismissed, None to never dismiss /
+            带处理器的通知被关闭前的秒数，None表示从不关闭
+
+    Returns / 返回:
+        The simulated Shell / 模拟的Shell
+
+    Raises / 异常:
+        RuntimeError: If a WinRT-backed windows11toast module was already imported / 如果已导入依赖WinRT的windows11toast模块
+    """
+    package = __name__.rpartition('.')[0]
+    loaded = [name for name in _WINRT_BACKED if f'{package}.{name}' in sys.modules]
+    if loaded:
+        raise RuntimeError(f'install() must run before importing {", ".join(loaded)}')
+    shell = Shell(show_latency, dismiss_after)
+
+    class ToastNotificationManager:
+        history = _History()
+
+        @staticmethod
+        def create_toast_notifier(app_id: Optional[str] = None) -> ToastNotifier:
+            return ToastNotifier(shell)
+
+        create_toast_notifier_with_id = create_toast_notifier
+
+    names = {
+        'winrt.windows.data.xml.dom': {'XmlDocument': XmlDocument},
+        'winrt.windows.ui.notifications': {
+            'ToastNotificationManager': ToastNotificationManager,
+            'ToastNotification': ToastNotification,
+            'ScheduledToastNotification': ScheduledToastNotification,
+            'NotificationData': NotificationData,
+            'ToastDismissedEventArgs': _EventArgs,
+            'ToastFailedEventArgs': _EventArgs,
+            'ToastActivatedEventArgs': _EventArgs,
+        },
+        'winrt.windows.foundation': {'IPropertyValue': _Placeholder, 'Uri': _Placeholder},
+        'winrt.windows.media.core': {'MediaSource': _Placeholder},
+        'winrt.windows.media.playback': {'MediaPlayer': _Placeholder},
+        'winrt.windows.media.speechsynthesis': {'SpeechSynthesizer': _Placeholder},
+        'winrt.windows.media.ocr': {'OcrEngine': _Placeholder},
+        'winrt.windows.graphics.imaging': {'BitmapDecoder': _Placeholder},
+        'winrt.windows.storage': {'StorageFile': _Placeholder, 'FileAccessMode': _Placeholder},
+        'winrt.windows.storage.streams': {'RandomAccessStreamReference': _Placeholder},
+        'winrt.windows.globalization': {'Language': _Placeholder},
+    }
+    for module_name, attributes in names.items():
+        parts = module_name.split('.')
+        # Create the parent packages too / 同时创建父包
+        for i in range(1, len(parts) + 1):
+            name = '.'.join(parts[:i])
+            if name not in sys.modules or not getattr(sys.modules[name], '_in_memory', False):
+                module = types.ModuleType(name)
+                module.__path__ = []
+                module._in_memory = True
+                sys.modules[name] = module
+                if i > 1:
+                    setattr(sys.modules['.'.join(parts[:i - 1])], parts[i - 1], module)
+        vars(sys.modules[module_name]).update(attributes)
+    return shell
@@ -0,0 +1,193 @@
+"""Delivery metrics: counters and latency histograms / 投递指标：计数器和延迟直方图"""
+
+import bisect
+import threading
+from typing import Optional, Dict, Tuple, Any, Sequence
+
+# Default histogram buckets in seconds from show to user interaction / 从显示到用户交互的默认直方图桶（秒）
+DEFAULT_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+_DISMISSAL_REASONS = {0: 'user_canceled', 1: 'application_hidden', 2: 'timed_out'}
+
+
+def _reason_label(reason: Any) -> str:
+    """Convert a ToastDismissalReason to a label / 将ToastDismissalReason转换为标签"""
+    try:
+        return _DISMISSAL_REASONS.get(int(reason), str(int(reason)))
+    except (TypeError, ValueError):
+        return str(reason)
+
+
+def _error_label(error_code: Any) -> str:
+    """Convert a failure HRESULT to a label / 将失败HRESULT转换为标签"""
+    value = getattr(error_code, 'value', error_code)
+    try:
+        return f'0x{int(value) & 0xFFFFFFFF:08X}'
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """
+    Counters and show-to-interaction histograms per app_id.
+    按app_id统计的计数器和从显示到交互的直方图。
+
+    Counters / 计数器:
+        toasts_shown_total{app_id}
+        toasts_scheduled_total{app_id}
+        toasts_activated_total{app_id}
+        toasts_dismissed_total{app_id, reason}
+        toasts_failed_total{app_id, error_code}
+
+    Histograms (seconds from show to event) / 直方图（从显示到事件的秒数）:
+        toast_interaction_seconds{app_id, event}
+
+    Args / 参数:
+        buckets: Histogram upper bounds in seconds / 直方图上界（秒）
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # (name, labels) -> value / (名称, 标签) -> 值
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Histogram] = {}
+
+    def _inc(self, name: str, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def _observe(self, app_id: str, event: str, seconds: Optional[float]) -> None:
+        if seconds is None:
+            return
+        key = ('toast_interaction_seconds', (('app_id', app_id), ('event', event)))
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+
+    def record_shown(self, app_id: str) -> None:
+        """Count a shown toast / 计数一条已显示的通知"""
+        self._inc('toasts_shown_total', app_id=app_id)
+
+    def record_scheduled(self, app_id: str) -> None:
+        """Count a toast handed to Windows to show later / 计数一条交给Windows稍后显示的通知"""
+        self._inc('toasts_scheduled_total', app_id=app_id)
+
+    def record_activated(self, app_id: str, seconds: Optional[float] = None) -> None:
+        """Count an activation and its latency / 计数一次激活及其延迟"""
+        self._inc('toasts_activated_total', app_id=app_id)
+        self._observe(app_id, 'activated', seconds)
+
+    def record_dismissed(self, app_id: str, reason: Any, seconds: Optional[float] = None) -> None:
+        """Count a dismissal by reason and its latency / 按原因计数一次关闭及其延迟"""
+        label = _reason_label(reason)
+        self._inc('toasts_dismissed_total', app_id=app_id, reason=label)
+        self._observe(app_id, 'dismissed', seconds)
+
+    def record_failed(self, app_id: str, error_code: Any, seconds: Optional[float] = None) -> None:
+        """Count a failure by error code and its latency / 按错误码计数一次失败及其延迟"""
+        self._inc('toasts_failed_total', app_id=app_id, error_code=_error_label(error_code))
+        self._observe(app_id, 'failed', seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Export all metrics as plain data.
+        将所有指标导出为普通数据。
+
+        Returns / 返回:
+            {'counters': [{'name', 'labels', 'value'}], 'histograms': [{'name', 'labels', 'buckets', 'counts', 'sum', 'count'}]}
+        """
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            histograms = [{'name': name, 'labels': dict(labels), 'buckets': list(self.buckets),
+                           'counts': list(h.counts), 'sum': h.sum, 'count': h.count}
+                          for (name, labels), h in sorted(self._histograms.items(), key=lambda item: item[0])]
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+        以Prometheus文本格式导出所有指标。
+        """
+        def fmt(labels: Dict[str, str]) -> str:
+            if not labels:
+                return ''
+            escaped = (k + '="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                       for k, v in labels.items())
+            return '{' + ','.join(escaped) + '}'
+
+        data = self.as_dict()
+        lines = []
+        declared = set()
+        for counter in data['counters']:
+            if counter['name'] not in declared:
+                declared.add(counter['name'])
+                lines.append(f"# TYPE {counter['name']} counter")
+            lines.append(f"{counter['name']}{fmt(counter['labels'])} {counter['value']}")
+        for histogram in data['histograms']:
+            name = histogram['name']
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# TYPE {name} histogram')
+            cumulative = 0
+            for bound, count in zip(list(histogram['buckets']) + ['+Inf'], histogram['counts']):
+                cumulative += count
+                lines.append(f"{name}_bucket{fmt(dict(histogram['labels'], le=str(bound)))} {cumulative}")
+            lines.append(f"{name}_sum{fmt(histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{name}_count{fmt(histogram['labels'])} {histogram['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Reset all metrics / 重置所有指标"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# Active metrics registry, None when disabled / 活动的指标注册表，禁用时为None
+_metrics: Optional[MetricsRegistry] = None
+
+
+def enable_metrics(buckets: Sequence[float] = DEFAULT_BUCKETS) -> MetricsRegistry:
+    """
+    Start collecting delivery metrics from notify() and toast_async().
+    开始从notify()和toast_async()收集投递指标。
+
+    Returns / 返回:
+        The active MetricsRegistry / 活动的MetricsRegistry
+
+    Example / 示例:
+        metrics = enable_metrics()
+        await toast_async('Hello', 'World')
+        print(metrics.to_prometheus())
+    """
+    global _metrics
+    _metrics = MetricsRegistry(buckets)
+    return _metrics
+
+
+def disable_metrics() -> None:
+    """Stop collecting delivery metrics / 停止收集投递指标"""
+    global _metrics
+    _metrics = None
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """Return the active MetricsRegistry, or None if disabled / 返回活动的MetricsRegistry，禁用时返回None"""
+    return _metrics
@@ -1,12 +1,15 @@
 """Core notification functions / 核心通知函数"""
 
 import asyncio
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Callable, Union, Any
+from typing import Optional, Dict, List, Tuple, Callable, Union, Any
 from winrt.windows.data.xml.dom import XmlDocument
 from winrt.windows.ui.notifications import (
     ToastNotificationManager,
     ToastNotification,
+    ScheduledToastNotification,
     NotificationData,
     ToastDismissedEventArgs,
     ToastFailedEventArgs
@@ -20,13 +23,198 @@ from .xml_builder import (
 )
 from .utils import result_wrapper, activated_args, _default_on_click, result
 from .media import play_sound, speak, recognize
+from .dedup import get_deduplicator, DEDUP_UPDATE
+from .ratelimit import get_rate_limiter
+from .scheduler import get_scheduler
+from .validation import get_validation_mode, validate_payload
+from .assets import prepare_image, prepare_icon
+from .remote import localize_image
+from .instrumentation import start_timer
+from .metrics import get_metrics
+from .spec import ToastSpec, ButtonSpec, InputSpec, SelectionSpec
+from .render_cache import get_render_cache
+from .templates import get_template_cache
+from .legacy import legacy_spec
+from .executor import run_blocking
+from .shared_progress import get_shared_progress
+from .recording import get_recorder, OP_CLEAR
 
 # Store original notification info for update_progress
 _notification_cache = {}
 _notification_sequence = {}
 
 
-def notify(title: Optional[str] = None, body: Optional[str] = None,
+def _create_notifier(app_id: str):
+    """Create a toast notifier for the application ID / 为应用程序ID创建通知器"""
+    if app_id == DEFAULT_APP_ID:
+        try:
+            return ToastNotificationManager.create_toast_notifier()
+        except Exception:
+            return ToastNotificationManager.create_toast_notifier_with_id(app_id)
+    return ToastNotificationManager.create_toast_notifier_with_id(app_id)
+
+
+def _show(notifier, notification: ToastNotification, app_id: str) -> bool:
+    """
+    Show a notification, going through the rate limiter if enabled.
+    显示通知，如果启用了限流器则经过限流器。
+
+    Returns / 返回:
+        False if the rate limiter dropped the notification / 如果限流器丢弃了通知则返回False
+    """
+    # Rate limiting (opt-in, see enable_rate_limit) / 限流（可选，见enable_rate_limit）
+    rate_limiter = get_rate_limiter()
+    if rate_limiter is None:
+        _show_now(notifier, notification, app_id)
+        return True
+    return rate_limiter.submit(app_id, _show_now, notifier, notification, app_id)
+
+
+def _show_now(notifier, notification: ToastNotification, app_id: str) -> None:
+    """Show a notification and count it, possibly later from the scheduler thread / 显示通知并计数，可能稍后在调度线程中执行"""
+    notifier.show(notification)
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.record_shown(app_id)
+
+
+def _schedule(document: XmlDocument, notification: ToastNotification, notifier, app_id: str,
+              deliver_at: Optional[datetime], delay: Optional[float]):
+    """
+    Schedule a notification with Windows, falling back to the local scheduler.
+    使用Windows定时通知，失败时回退到本地调度器。
+
+    Progress notifications and notifications Windows refuses to schedule are shown by the
+    shared local scheduler (a single heap-based timer thread) instead; those are lost if the
+    process exits first. Windows shows scheduled toasts itself, past the rate limiter, so they
+    are counted as scheduled rather than shown in metrics.
+    进度通知和Windows拒绝定时的通知改由共享的本地调度器（单个基于堆的计时线程）显示；如果进程先退出，这些通知将丢失。
+    Windows会自行显示定时通知并绕过限流器，因此它们在指标中计为已定时而非已显示。
+    """
+    if deliver_at is not None:
+        due = deliver_at.timestamp()
+    else:
+        due = time.time() + delay
+    if due <= time.time():
+        return notification if _show(notifier, notification, app_id) else None
+
+    if notification.data is None:
+        try:
+            scheduled = ScheduledToastNotification(document, datetime.fromtimestamp(due).astimezone())
+            if notification.tag:
+                scheduled.tag = notification.tag
+            if notification.group:
+                scheduled.group = notification.group
+            notifier.add_to_schedule(scheduled)
+        except Exception:
+            # Not supported for this app_id, use the local scheduler / 此app_id不支持，使用本地调度器
+            pass
+        else:
+            metrics = get_metrics()
+            if metrics is not None:
+                metrics.record_scheduled(app_id)
+            return scheduled
+
+    get_scheduler().call_at(due, _show, notifier, notification, app_id,
+                            tag=notification.tag or None, group=notification.group or None, app_id=app_id)
+    return notification
+
+
+def _render(spec: ToastSpec, scenario: Optional[str], duration_str: Optional[str],
+            display_title: Optional[str], display_body: Optional[str],
+            inputs: Tuple[InputSpec, ...], selections: Tuple[SelectionSpec, ...], buttons: Tuple[ButtonSpec, ...],
+            icon: Optional[str], image: Optional[str]) -> XmlDocument:
+    """Build the toast XML document / 构建通知XML文档"""
+    on_click, audio, dialogue = spec.on_click, spec.audio, spec.dialogue
+    progress_title, progress_status = spec.progress_title, spec.progress_status
+    progress_value, progress_value_string_override = spec.progress_value, spec.progress_value_string_override
+    has_progress = spec.has_progress
+
+    template_cache = get_template_cache()
+    if spec.xml in template_cache:
+        # Registered template, clone the parsed prototype / 已注册模板，克隆已解析的原型
+        document = template_cache.document(spec.xml, scenario if scenario else 'default')
+    else:
+        document = XmlDocument()
+        # Use the xml parameter if provided, otherwise use default template / 如果提供了xml参数则使用，否则使用默认模板
+        xml_template = spec.xml if spec.xml else DEFAULT_XML_TEMPLATE
+        document.load_xml(xml_template.format(scenario=scenario if scenario else 'default'))
+
+    if isinstance(on_click, str):
+        set_attribute(document, '/toast', 'launch', on_click)
+
+    if duration_str:
+        set_attribute(document, '/toast', 'duration', duration_str)
+
+    if display_title:
+        add_text(display_title, document)
+    if display_body:
+        add_text(display_body, document)
+
+    # Add input fields / 添加输入字段
+    for field in inputs:
+        add_input(field.to_xml(), document)
+
+    # Add selection fields / 添加选择字段
+    for selection in selections:
+        add_selection(selection.to_xml(), document)
+
+    # Add buttons / 添加按钮
+    for button in buttons:
+        add_button(button.to_xml(), document)
+
+    # Add icon / 添加图标
+    if icon:
+        add_icon(icon, spec.icon_placement, spec.icon_hint_crop, document)
+
+    # Add image / 添加图片
+    if image:
+        add_image(image, spec.image_placement, document)
+
+    # Add progress bar / 添加进度条
+    if has_progress:
+        progress_dict = {}
+        if progress_title:
+            progress_dict['title'] = progress_title
+        if progress_status:
+            progress_dict['status'] = progress_status
+        if progress_value is not None:
+            progress_dict['value'] = str(progress_value)
+        if progress_value_string_override:
+            progress_dict['valueStringOverride'] = progress_value_string_override
+        add_progress(progress_dict, document)
+
+    # Handle audio / 处理音频
+    audio_src = None
+    audio_loop_flag = False
+    if audio is not None:
+        # Check if it's a file path / 检查是否为文件路径
+        if isinstance(audio, str) and not audio.startswith('ms-winsoundevent:'):
+            path = Path(audio)
+            if path.is_file():
+                audio_src = f"file:///{path.absolute().as_posix()}"
+            else:
+                # Assume it's a URL / 假设是URL
+                audio_src = audio
+        else:
+            # Convert StrEnum to string if needed / 如果需要，将 StrEnum 转换为字符串
+            audio_src = str(audio)
+        audio_loop_flag = spec.audio_loop
+
+    # Add audio or make silent / 添加音频或设置为静音
+    if dialogue:
+        # Text-to-speech needs silent audio / 文本转语音需要静音音频
+        add_audio(None, False, document)
+    elif audio_src:
+        add_audio(audio_src, audio_loop_flag, document)
+    elif audio is None and (dialogue or has_progress):
+        # Silent for progress notifications or when explicitly set to None / 进度通知静音或显式设置为None
+        add_audio(None, False, document)
+
+    return document
+
+
+def notify(title: Optional[Union[str, ToastSpec]] = None, body: Optional[str] = None,
            on_click: Optional[Union[Callable, str]] = None,
            # Image options / 图片选项
            image_src: Optional[str] = None,
@@ -60,13 +248,19 @@ def notify(title: Optional[str] = None, body: Optional[str] = None,
            xml: Optional[str] = None,
            app_id: str = DEFAULT_APP_ID,
            tag: Optional[str] = None,
-           group: Optional[str] = None) -> ToastNotification:
+           group: Optional[str] = None,
+           suppress_popup: bool = False,
+           # Scheduling options / 定时选项
+           deliver_at: Optional[datetime] = None,
+           delay: Optional[float] = None) -> Optional[ToastNotification]:
     """
     Create and show a Windows toast notification.
     创建并显示一个 Windows 通知。
 
     Args / 参数:
-        title: Notification title text / 通知标题文本
+        title: Notification title text, or a ToastSpec describing the whole toast (then only tag, group,
+            suppress_popup, deliver_at and delay are used from the other arguments) / 通知标题文本，或描述整个通知的ToastSpec
+            （此时其他参数中仅使用tag、group、suppress_popup、deliver_at和delay）
         body: Notification body text / 通知正文文本
         on_click: Callback function or URL string / 回调函数或URL字符串
 
@@ -108,13 +302,24 @@ def notify(title: Optional[str] = None, body: Optional[str] = None,
         buttons: List of button contents / 按钮内容列表
 
         # Advanced options / 高级选项
-        xml: Custom XML template / 自定义XML模板
+        xml: Custom XML template, or the name of a registered template / 自定义XML模板，或已注册模板的名称
         app_id: Application ID / 应用程序ID
         tag: Notification tag / 通知标签
         group: Notification group / 通知组
+        suppress_popup: Only add the notification to the action center, without a popup / 仅将通知加入操作中心，不弹出
+
+        # Scheduling options / 定时选项
+        deliver_at: Show the notification at this time (uses Windows scheduled toasts, which bypass the rate
+            limiter, or the local timer for progress toasts and when that fails) / 在此时间显示通知（使用Windows定时通知，
+            其绕过限流器；进度通知或定时失败时使用本地计时器）
+        delay: Show the notification after this many seconds / 在指定秒数后显示通知
 
     Returns / 返回:
-        ToastNotification object / ToastNotification对象
+        ToastNotification object (ScheduledToastNotification when scheduled by Windows), or None if dropped as a duplicate (see enable_dedup) or by the rate limiter (see enable_rate_limit)
+        ToastNotification对象，如果作为重复项被丢弃（见enable_dedup）或被限流器丢弃（见enable_rate_limit）则返回None
+
+    Raises / 异常:
+        RateLimitExceeded: If the rate limiter is enabled with the 'raise' policy and the limit is exceeded / 如果启用了'raise'策略的限流器且超出限制
 
     Examples / 示例:
         # Basic notification / 基本通知
@@ -128,10 +333,125 @@ def notify(title: Optional[str] = None, body: Optional[str] = None,
 
         # Silent notification / 静音通知
         notify('Hello', 'World', audio=None)
+
+        # Delayed notification, cancellable by tag / 延迟通知，可按标签取消
+        notify('Stand up', 'Time for a break', delay=3600, tag='break', group='reminders')
+        cancel_scheduled('break', 'reminders')
+
+        # Reusable spec, normalized once / 可复用的规格，只规范化一次
+        heartbeat = ToastSpec('Worker', 'Still running', buttons=['Stop'])
+        notify(heartbeat, tag='worker-1')
+    """
+    if isinstance(title, ToastSpec):
+        spec = title
+    else:
+        spec = ToastSpec(
+            title, body, on_click,
+            image_src=image_src, image_placement=image_placement,
+            icon_src=icon_src, icon_placement=icon_placement, icon_hint_crop=icon_hint_crop,
+            progress_title=progress_title, progress_status=progress_status, progress_value=progress_value,
+            progress_value_string_override=progress_value_string_override,
+            audio=audio, audio_loop=audio_loop, dialogue=dialogue, duration=duration,
+            inputs=[InputSpec(input_id, input_placeholder)] if input_id else (),
+            selections=[SelectionSpec(selection_id, selections)] if selection_id and selections else (),
+            buttons=([button_content] if button_content else []) + list(buttons or ()),
+            xml=xml, app_id=app_id
+        )
+    return _notify(spec, tag if tag is not None else spec.tag, group if group is not None else spec.group,
+                   deliver_at, delay, suppress_popup)
+
+
+async def notify_async(*args: Any, limit: Optional[asyncio.Semaphore] = None, **kwargs: Any) -> Optional[ToastNotification]:
+    """
+    Create and show a Windows toast notification without blocking the event loop.
+    创建并显示 Windows 通知，不阻塞事件循环。
+
+    Takes the same arguments as notify() and returns as soon as the toast is shown, without
+    waiting for user interaction. The WinRT calls run on the WinRT executor (see enable_winrt_executor).
+    参数与notify()相同，通知显示后立即返回，不等待用户交互。WinRT调用在WinRT执行器中执行（见enable_winrt_executor）。
+
+    Args / 参数:
+        limit: Semaphore capping the number of concurrent sends (optional) / 限制并发发送数量的信号量（可选）
+
+    Returns / 返回:
+        ToastNotification, or None if dropped / ToastNotification对象，被丢弃时返回None
+
+    Example / 示例:
+        limit = asyncio.Semaphore(8)
+        await asyncio.gather(*(notify_async(f'Job {i}', 'Done', limit=limit) for i in range(500)))
+    """
+    return await run_blocking(notify, *args, limit=limit, **kwargs)
+
+
+class _PreparedToast:
+    """A built toast waiting to be shown / 已构建、等待显示的通知"""
+    __slots__ = ('document', 'notification', 'notifier', 'app_id', 'deliver_at', 'delay', 'timer')
+
+    def __init__(self, document, notification, notifier, app_id, deliver_at, delay, timer):
+        self.document = document
+        self.notification = notification
+        self.notifier = notifier
+        self.app_id = app_id
+        self.deliver_at = deliver_at
+        self.delay = delay
+        self.timer = timer
+
+
+def _notify(spec: ToastSpec, tag: Optional[str], group: Optional[str],
+            deliver_at: Optional[datetime], delay: Optional[float],
+            suppress_popup: bool = False) -> Optional[ToastNotification]:
+    """Build and show the toast described by spec / 构建并显示spec描述的通知"""
+    prepared = _prepare(spec, tag, group, deliver_at, delay, suppress_popup)
+    return _deliver(prepared) if prepared is not None else None
+
+
+def _prepare(spec: ToastSpec, tag: Optional[str], group: Optional[str],
+             deliver_at: Optional[datetime], delay: Optional[float],
+             suppress_popup: bool = False) -> Optional[_PreparedToast]:
+    """
+    Build the toast described by spec without showing it.
+    构建spec描述的通知但不显示。
+
+    Returns / 返回:
+        The prepared toast, or None if it was dropped as a duplicate / 准备好的通知，作为重复项丢弃时返回None
     """
+    if deliver_at is not None and delay is not None:
+        raise ValueError('deliver_at and delay cannot be used together')
+
+    # Traffic recording (opt-in, see enable_recording) / 流量记录（可选，见enable_recording）
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record_notify(spec, tag, group, deliver_at, delay)
+
+    # Per-phase timing (opt-in, see add_timing_hook) / 分阶段计时（可选，见add_timing_hook）
+    timer = start_timer()
+
+    title, body, on_click, app_id = spec.title, spec.body, spec.on_click, spec.app_id
+    progress_title, progress_status = spec.progress_title, spec.progress_status
+    progress_value, progress_value_string_override = spec.progress_value, spec.progress_value_string_override
+    audio, dialogue = spec.audio, spec.dialogue
+    inputs, selections, buttons = spec.inputs, spec.selections, spec.buttons
+    has_progress = spec.has_progress
+
+    # Duplicate suppression (opt-in, see enable_dedup) / 重复抑制（可选，见enable_dedup）
+    dedup_tag = None
+    deduplicator = get_deduplicator()
+    if deduplicator is not None and not has_progress:
+        fingerprint = deduplicator.fingerprint(title, body, tag, app_id)
+        repeat_count = deduplicator.check(fingerprint)
+        if deduplicator.mode == DEDUP_UPDATE:
+            # Give untagged toasts a stable tag so repeats replace them / 为无标签通知分配稳定标签，使重复通知可替换它
+            dedup_tag = tag or f'dedup-{fingerprint & 0xFFFFFFFFFFFF:x}'
+            if repeat_count > 1:
+                body = f'{body} (×{repeat_count})' if body else f'(×{repeat_count})'
+                suppress_popup = True
+        elif repeat_count > 1:
+            return None
+
     # Determine scenario from duration if it's a no-timeout option / 如果duration是无超时选项，确定scenario
     scenario = None
     duration_str = None
+    duration = spec.duration
     if duration:
         duration_value = str(duration)
         # Check if duration is a scenario (no timeout) / 检查duration是否为场景（无超时）
@@ -140,28 +460,37 @@ def notify(title: Optional[str] = None, body: Optional[str] = None,
         elif duration in [ToastDuration.SHORT, ToastDuration.LONG]:
             duration_str = duration_value
 
-    document = XmlDocument()
-    # Use the xml parameter if provided, otherwise use default template / 如果提供了xml参数则使用，否则使用默认模板
-    xml_template = xml if xml else DEFAULT_XML_TEMPLATE
-    document.load_xml(xml_template.format(scenario=scenario if scenario else 'default'))
-
-    if isinstance(on_click, str):
-        set_attribute(document, '/toast', 'launch', on_click)
-
-    if duration_str:
-        set_attribute(document, '/toast', 'duration', duration_str)
-
     # Use progress_title/progress_status if provided, otherwise use title/body / 如果提供了progress_title/progress_status则使用，否则使用title/body
     display_title = progress_title if progress_title else title
     display_body = progress_status if progress_status else body
 
-    if display_title:
-        add_text(display_title, document)
-    if display_body:
-        add_text(display_body, document)
+    # Pre-flight payload validation (opt-in, see enable_validation) / 发送前负载校验（可选，见enable_validation）
+    validation_mode = get_validation_mode()
+    if validation_mode is not None:
+        button_contents = [button.content for button in buttons]
+        selection_inputs = [(selection.id, selection.items) for selection in selections]
+        payload = validate_payload({
+            'title': display_title, 'body': display_body, 'on_click': on_click,
+            'buttons': button_contents, 'inputs': [(field.id, field.placeholder) for field in inputs],
+            'selection_inputs': selection_inputs,
+            'image_src': spec.image_src, 'icon_src': spec.icon_src,
+            'progress_title': progress_title, 'progress_status': progress_status, 'progress_value': progress_value,
+            'audio': audio, 'xml': get_template_cache().source(spec.xml)
+        }, validation_mode)
+        # The shown text came from the progress fields, keep the progress data in step /
+        # 显示的文本来自进度字段，使进度数据保持一致
+        if progress_title:
+            progress_title = payload['title']
+        if progress_status:
+            progress_status = payload['body']
+        display_title, display_body = payload['title'], payload['body']
+        # Apply truncation to the nested specs / 将裁剪结果应用到嵌套规格
+        buttons = buttons[:len(payload['buttons'])]
+        inputs = inputs[:len(payload['inputs'])]
+        if payload['selection_inputs'] is not selection_inputs:
+            selections = tuple(SelectionSpec(selection_id, items) for selection_id, items in payload['selection_inputs'])
 
     # Store notification info for updates
-    has_progress = progress_value is not None or progress_title is not None or progress_status is not None
     notification_tag = tag if tag else ('my_tag' if has_progress else None)
     if notification_tag:
         _notification_cache[notification_tag] = {
@@ -170,80 +499,56 @@ def notify(title: Optional[str] = None, body: Optional[str] = None,
             'progress_title': progress_title,
             'app_id': app_id,
             'group': group,
-            'icon_src': icon_src,
-            'icon_placement': icon_placement,
-            'icon_hint_crop': icon_hint_crop,
-            'image_src': image_src,
-            'image_placement': image_placement
+            'icon_src': spec.icon_src,
+            'icon_placement': spec.icon_placement,
+            'icon_hint_crop': spec.icon_hint_crop,
+            'image_src': spec.image_src,
+            'image_placement': spec.image_placement
         }
         # Initialize sequence number
         if notification_tag not in _notification_sequence:
             _notification_sequence[notification_tag] = 1
-
-    # Add input field / 添加输入字段
-    if input_id:
-        add_input({'id': input_id, 'type': 'text', 'placeHolderContent': input_placeholder or input_id}, document)
-
-    # Add selection field / 添加选择字段
-    if selection_id and selections:
-        add_selection({'input': {'id': selection_id, 'type': 'selection'}, 'selection': selections}, document)
-
-    # Add buttons / 添加按钮
-    if button_content:
-        add_button(button_content, document)
-    if buttons:
-        for btn_content in buttons:
-            add_button(btn_content, document)
-
-    # Add icon / 添加图标
-    if icon_src:
-        add_icon(icon_src, icon_placement, icon_hint_crop, document)
-
-    # Add image / 添加图片
-    if image_src:
-        add_image(image_src, image_placement, document)
-
-    # Add progress bar / 添加进度条
-    if has_progress:
-        progress_dict = {}
-        if progress_title:
-            progress_dict['title'] = progress_title
-        if progress_status:
-            progress_dict['status'] = progress_status
-        if progress_value is not None:
-            progress_dict['value'] = str(progress_value)
-        if progress_value_string_override:
-            progress_dict['valueStringOverride'] = progress_value_string_override
-        add_progress(progress_dict, document)
-
-    # Handle audio / 处理音频
-    audio_src = None
-    audio_loop_flag = False
-    if audio is not None:
-        # Check if it's a file path / 检查是否为文件路径
-        if isinstance(audio, str) and not audio.startswith('ms-winsoundevent:'):
-            path = Path(audio)
-            if path.is_file():
-                audio_src = f"file:///{path.absolute().as_posix()}"
-            else:
-                # Assume it's a URL / 假设是URL
-                audio_src = audio
-        else:
-            # Convert StrEnum to string if needed / 如果需要，将 StrEnum 转换为字符串
-            audio_src = str(audio)
-        audio_loop_flag = audio_loop
-
-    # Add audio or make silent / 添加音频或设置为静音
-    if dialogue:
-        # Text-to-speech needs silent audio / 文本转语音需要静音音频
-        add_audio(None, False, document)
-    elif audio_src:
-        add_audio(audio_src, audio_loop_flag, document)
-    elif audio is None and (dialogue or has_progress):
-        # Silent for progress notifications or when explicitly set to None / 进度通知静音或显式设置为None
-        add_audio(None, False, document)
+        # Share progress state with other processes (opt-in, see enable_shared_progress) /
+        # 与其他进程共享进度状态（可选，见enable_shared_progress）
+        shared_progress = get_shared_progress()
+        if shared_progress is not None and has_progress:
+            _notification_sequence[notification_tag] = shared_progress.publish(
+                notification_tag, _notification_cache[notification_tag])
+
+    if timer:
+        timer.mark('normalize')
+
+    # Resolve images first, the resolved paths are part of the payload / 先解析图片，解析后的路径是负载的一部分
+    icon = prepare_icon(localize_image(spec.icon_src), spec.icon_placement, spec.icon_hint_crop) if spec.icon_src else None
+    image = prepare_image(localize_image(spec.image_src), spec.image_placement) if spec.image_src else None
+    if timer:
+        timer.mark('images')
+
+    # Rendered payload cache (opt-in, see enable_render_cache) / 渲染负载缓存（可选，见enable_render_cache）
+    render_cache = get_render_cache()
+    render_key = None
+    rendered = None
+    if render_cache is not None:
+        # Key on the template source so re-registering a name is never stale / 以模板源作为键，重新注册同名模板不会取到旧结果
+        render_key = (get_template_cache().source(spec.xml), scenario, duration_str, on_click if isinstance(on_click, str) else None,
+                      display_title, display_body, inputs, selections, buttons,
+                      icon, spec.icon_placement, spec.icon_hint_crop, image, spec.image_placement,
+                      bool(progress_title), bool(progress_status), progress_value is not None,
+                      bool(progress_value_string_override), has_progress, audio, spec.audio_loop, dialogue)
+        rendered = render_cache.get(render_key)
+
+    if rendered is not None:
+        document = XmlDocument()
+        document.load_xml(rendered)
+    else:
+        document = _render(spec, scenario, duration_str, display_title, display_body,
+                           inputs, selections, buttons, icon, image)
+        if render_key is not None:
+            render_cache.put(render_key, document.get_xml())
 
     notification = ToastNotification(document)
+    if timer:
+        timer.mark('build')
 
     # Set up progress data if needed / 如果需要，设置进度数据
     if has_progress:
@@ -270,21 +575,35 @@ def notify(title: Optional[str] = None, body: Optional[str] = None,
 
     if tag:
         notification.tag = tag
+    elif dedup_tag:
+        notification.tag = dedup_tag
     if group:
         notification.group = group
-
-    if app_id == DEFAULT_APP_ID:
-        try:
-            notifier = ToastNotificationManager.create_toast_notifier()
-        except Exception:
-            notifier = ToastNotificationManager.create_toast_notifier_with_id(app_id)
+    if suppress_popup:
+        notification.suppress_popup = True
+    if timer:
+        timer.mark('progress_data')
+
+    notifier = _create_notifier(app_id)
+    if timer:
+        timer.mark('notifier')
+    return _PreparedToast(document, notification, notifier, app_id, deliver_at, delay, timer)
+
+
+def _deliver(prepared: _PreparedToast) -> Optional[ToastNotification]:
+    """Show or schedule a prepared toast / 显示或定时一个准备好的通知"""
+    notification, notifier, app_id, timer = prepared.notification, prepared.notifier, prepared.app_id, prepared.timer
+    if prepared.deliver_at is not None or prepared.delay is not None:
+        result = _schedule(prepared.document, notification, notifier, app_id, prepared.deliver_at, prepared.delay)
     else:
-        notifier = ToastNotificationManager.create_toast_notifier_with_id(app_id)
-    notifier.show(notification)
-    return notification
+        result = notification if _show(notifier, notification, app_id) else None
+    if timer:
+        timer.mark('show')
+        timer.finish(app_id, notification.tag or None)
+    return result
 
 
-async def toast_async(title: Optional[str] = None, body: Optional[str] = None,
+async def toast_async(title: Optional[Union[str, ToastSpec]] = None, body: Optional[str] = None,
                       on_click: Optional[Union[Callable, str]] = None,
                       icon: Optional[Union[str, Dict[str, str]]] = None,
                       image: Optional[Union[str, Dict[str, str]]] = None,
@@ -331,7 +650,9 @@ async def toast_async(title: Optional[str] = None, body: Optional[str] = None,
     创建并显示一个 Windows 通知（异步版本）。
 
     Args / 参数:
-        title: Notification title text / 通知标题文本
+        title: Notification title text, or a ToastSpec (then only on_dismissed, on_failed, tag and group are
+            used from the other arguments) / 通知标题文本，或ToastSpec（此时其他参数中仅使用on_dismissed、
+            on_failed、tag和group）
         body: Notification body text / 通知正文文本
         on_click: Callback function or URL string / 回调函数或URL字符串
         on_dismissed: Callback function for dismissal / 通知被关闭时的回调函数
@@ -348,7 +669,7 @@ async def toast_async(title: Optional[str] = None, body: Optional[str] = None,
         selections: List of selection fields / 选择字段列表
         button: Single button / 单个按钮
         buttons: List of buttons / 按钮列表
-        xml: Custom XML template / 自定义XML模板
+        xml: Custom XML template, or the name of a registered template / 自定义XML模板，或已注册模板的名称
         app_id: Application ID / 应用程序ID
         ocr: OCR image path or dict / OCR图片路径或字典
         scenario: Toast scenario / 通知场景
@@ -388,199 +709,98 @@ async def toast_async(title: Optional[str] = None, body: Optional[str] = None,
         # With parameterized image / 使用参数化的图片
         await toast_async('Hello', 'World', image_src='path/to/image.jpg', image_placement=ImagePlacement.HERO)
     """
-    # Handle OCR first / 首先处理OCR
-    if ocr:
-        title = 'OCR Result'
-        body = (await recognize(ocr)).text
-        src = ocr if isinstance(ocr, str) else ocr['ocr']
-        if not image_src:
-            image_src = src
-            image_placement = ImagePlacement.HERO if not image_placement else image_placement
-
-    # Convert old dict-style parameters to new parameterized format / 将旧字典参数转换为新参数化格式
-    # Only use dict parameters if parameterized ones are not provided / 只有在没有提供参数化参数时才使用字典参数
-    if icon and not icon_src:
-        if isinstance(icon, str):
-            icon_src = icon
-        elif isinstance(icon, dict):
-            icon_src = icon.get('src')
-            if not icon_placement:
-                placement_str = icon.get('placement')
-                if placement_str:
-                    # Convert string to enum / 将字符串转换为枚举
-                    placement_upper = placement_str.replace('-', '_').upper()
-                    if hasattr(IconPlacement, placement_upper):
-                        icon_placement = getattr(IconPlacement, placement_upper)
-            if not icon_hint_crop:
-                hint_crop_str = icon.get('hint-crop')
-                if hint_crop_str:
-                    # Convert string to enum / 将字符串转换为枚举
-                    hint_crop_upper = hint_crop_str.upper()
-                    if hasattr(IconCrop, hint_crop_upper):
-                        icon_hint_crop = getattr(IconCrop, hint_crop_upper)
-
-    if image and not image_src:
-        if isinstance(image, str):
-            image_src = image
-        elif isinstance(image, dict):
-            image_src = image.get('src')
-            if not image_placement:
-                placement_str = image.get('placement')
-                if placement_str:
-                    # Convert string to enum / 将字符串转换为枚举
-                    placement_upper = placement_str.replace('-', '_').upper()
-                    if hasattr(ImagePlacement, placement_upper):
-                        image_placement = getattr(ImagePlacement, placement_upper)
-
-    # Convert progress dict to parameterized format / 将进度字典转换为参数化格式
-    # Use parameterized form if provided, otherwise use dict / 如果提供了参数化形式则使用，否则使用字典
-    if progress_title is None and progress_status is None and progress_value is None and progress_value_string_override is None:
-        if progress:
-            progress_title = progress.get('title')
-            progress_status = progress.get('status')
-            if 'value' in progress:
-                progress_value = float(progress['value'])
-            progress_value_string_override = progress.get('valueStringOverride')
+    if isinstance(title, ToastSpec):
+        spec = title
+        audio, dialogue, on_click, app_id = spec.audio, spec.dialogue, spec.on_click, spec.app_id
     else:
-        # Parameterized form takes precedence / 参数化形式优先
-        pass
-
-    # Convert audio dict to parameterized format / 将音频字典转换为参数化格式
-    audio_src = audio
-    audio_loop_flag = audio_loop  # Use parameterized audio_loop if provided / 如果提供了参数化的audio_loop则使用
-    if isinstance(audio, dict):
-        audio_src = audio.get('src')
-        if not audio_loop_flag:  # Only override if not explicitly set / 只有在未明确设置时才覆盖
-            audio_loop_flag = audio.get('loop') == 'true' or audio.get('loop') is True
-    elif isinstance(audio, str):
-        audio_src = audio
-
-    # Duration should already be a ToastDuration enum / duration应该已经是ToastDuration枚举
-    duration_enum = duration
-
-    # Convert input to parameterized format / 将输入转换为参数化格式
-    # Use parameterized form if provided, otherwise use dict / 如果提供了参数化形式则使用，否则使用字典
-    input_id_param = input_id
-    input_placeholder_param = input_placeholder
-    if input_id_param is None and input_placeholder_param is None:
-        if input:
-            if isinstance(input, str):
-                input_id_param = input
-                input_placeholder_param = input
-            elif isinstance(input, dict):
-                input_id_param = input.get('id')
-                input_placeholder_param = input.get('placeHolderContent') or input.get('placeholder')
-        # Also check inputs list / 同时检查inputs列表
-        if inputs and input_id_param is None:
-            # Use first input if available / 如果可用则使用第一个输入
-            first_input = inputs[0] if inputs else None
-            if isinstance(first_input, dict):
-                input_id_param = first_input.get('id')
-                input_placeholder_param = first_input.get('placeHolderContent') or first_input.get('placeholder')
-
-    # Convert selection to parameterized format / 将选择转换为参数化格式
-    # Use parameterized form if provided, otherwise use dict / 如果提供了参数化形式则使用，否则使用字典
-    selection_id_param = selection_id
-    selections_param = selections
-    if selection_id_param is None:
-        if selection:
-            if isinstance(selection, list):
-                selection_id_param = 'selection'
-                selections_param = selection
-            elif isinstance(selection, dict):
-                selection_id_param = selection.get('input', {}).get('id', 'selection')
-                selections_param = selection.get('selection', [])
-
-    # Convert button to parameterized format / 将按钮转换为参数化格式
-    # Use parameterized form if provided, otherwise use dict / 如果提供了参数化形式则使用，否则使用字典
-    button_content_param = button_content
-    buttons_param = buttons
-    if button_content_param is None:
-        if button:
-            if isinstance(button, str):
-                button_content_param = button
-            elif isinstance(button, dict):
-                button_content_param = button.get('content')
-
-    notification = notify(
-        title=title,
-        body=body,
-        on_click=on_click,
-        image_src=image_src,
-        image_placement=image_placement,
-        icon_src=icon_src,
-        icon_placement=icon_placement,
-        icon_hint_crop=icon_hint_crop,
-        progress_title=progress_title,
-        progress_status=progress_status,
-        progress_value=progress_value,
-        progress_value_string_override=progress_value_string_override,
-        audio=audio_src,
-        audio_loop=audio_loop_flag,
-        dialogue=dialogue,
-        duration=duration_enum,
-        input_id=input_id_param,
-        input_placeholder=input_placeholder_param,
-        selection_id=selection_id_param,
-        selections=selections_param if selections_param else selections,
-        button_content=button_content_param,
-        buttons=buttons_param,
-        xml=xml,
-        app_id=app_id,
-        tag=tag,
-        group=group
-    )
+        # Handle OCR first / 首先处理OCR
+        if ocr:
+            title = 'OCR Result'
+            body = (await recognize(ocr)).text
+            src = ocr if isinstance(ocr, str) else ocr['ocr']
+            if not image_src:
+                image_src = src
+                image_placement = ImagePlacement.HERO if not image_placement else image_placement
+
+        # Convert the legacy dict-style parameters in one pass / 一次性转换旧版字典参数
+        spec = legacy_spec(title, body, on_click, icon, image, progress, audio, dialogue, duration,
+                           input, inputs, selection, selections, button, buttons, xml, app_id,
+                           image_src, image_placement, icon_src, icon_placement, icon_hint_crop,
+                           progress_title, progress_status, progress_value, progress_value_string_override,
+                           input_id, input_placeholder, selection_id, button_content, audio_loop)
+    # Build off the event loop, subscribe, then show off the loop / 在事件循环外构建，订阅后再在事件循环外显示
+    prepared = await run_blocking(_prepare, spec, tag if tag is not None else spec.tag,
+                                  group if group is not None else spec.group, None, None)
+    if prepared is None:
+        # Dropped as a duplicate / 作为重复项丢弃
+        return None
+    notification = prepared.notification
     loop = asyncio.get_running_loop()
     futures = []
 
-    if audio and isinstance(audio, str) and not audio.startswith('ms'):
-        futures.append(loop.create_task(play_sound(audio)))
-    if dialogue:
-        futures.append(loop.create_task(speak(dialogue)))
-
     if isinstance(on_click, str):
         on_click = _default_on_click
     elif on_click is None:
         on_click = _default_on_click
+    # Delivery metrics (opt-in, see enable_metrics) / 投递指标（可选，见enable_metrics）
+    metrics = get_metrics()
+    shown_at = time.monotonic()
+
+    def handle_activated(*args):
+        if metrics is not None:
+            metrics.record_activated(app_id, time.monotonic() - shown_at)
+        loop.call_soon_threadsafe(activated_future.set_result, on_click(activated_args(*args)))
+
+    def handle_dismissed(_, event_args):
+        reason = ToastDismissedEventArgs._from(event_args).reason
+        if metrics is not None:
+            metrics.record_dismissed(app_id, reason, time.monotonic() - shown_at)
+        loop.call_soon_threadsafe(dismissed_future.set_result, on_dismissed(result_wrapper(reason)))
+
+    def handle_failed(_, event_args):
+        error_code = ToastFailedEventArgs._from(event_args).error_code
+        if metrics is not None:
+            metrics.record_failed(app_id, error_code, time.monotonic() - shown_at)
+        loop.call_soon_threadsafe(failed_future.set_result, on_failed(result_wrapper(error_code)))
+
     activated_future = loop.create_future()
-    activated_token = notification.add_activated(
-        lambda *args: loop.call_soon_threadsafe(
-            activated_future.set_result, on_click(activated_args(*args))
-        )
-    )
+    activated_token = notification.add_activated(handle_activated)
     futures.append(activated_future)
 
     dismissed_future = loop.create_future()
-    dismissed_token = notification.add_dismissed(
-        lambda _, event_args: loop.call_soon_threadsafe(
-            dismissed_future.set_result, on_dismissed(result_wrapper(ToastDismissedEventArgs._from(event_args).reason))
-        )
-    )
+    dismissed_token = notification.add_dismissed(handle_dismissed)
     futures.append(dismissed_future)
 
     failed_future = loop.create_future()
-    failed_token = notification.add_failed(
-        lambda _, event_args: loop.call_soon_threadsafe(
-            failed_future.set_result, on_failed(result_wrapper(ToastFailedEventArgs._from(event_args).error_code))
-        )
-    )
+    failed_token = notification.add_failed(handle_failed)
     futures.append(failed_future)
 
     try:
-        _, pending = await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
-        for p in pending:
-            p.cancel()
+        # Handlers are subscribed before the toast is shown / 处理器在通知显示前订阅
+        if await run_blocking(_deliver, prepared) is None:
+            # Dropped by the rate limiter / 被限流器丢弃
+            return None
+        shown_at = time.monotonic()
+        if audio and isinstance(audio, str) and not audio.startswith('ms'):
+            futures.append(loop.create_task(play_sound(audio)))
+        if dialogue:
+            futures.append(loop.create_task(speak(dialogue)))
+        await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
     finally:
+        # Errors and cancellation propagate; handlers and pending tasks are still cleaned up /
+        # 错误和取消会向上传播；处理器和未完成的任务仍会被清理
+        for future in futures:
+            future.cancel()
         if activated_token is not None:
             notification.remove_activated(activated_token)
         if dismissed_token is not None:
             notification.remove_dismissed(dismissed_token)
         if failed_token is not None:
             notification.remove_failed(failed_token)
-        return result
+    return result
 
 
-def toast(title: Optional[str] = None, body: Optional[str] = None,
+def toast(title: Optional[Union[str, ToastSpec]] = None, body: Optional[str] = None,
           on_click: Optional[Union[Callable, str]] = None,
           icon: Optional[Union[str, Dict[str, str]]] = None,
           image: Optional[Union[str, Dict[str, str]]] = None,
@@ -627,7 +847,9 @@ def toast(title: Optional[str] = None, body: Optional[str] = None,
     创建并显示一个 Windows 通知（同步包装器）。
 
     Args / 参数:
-        title: Notification title text / 通知标题文本
+        title: Notification title text, or a ToastSpec (then only on_dismissed, on_failed, tag and group are
+            used from the other arguments) / 通知标题文本，或ToastSpec（此时其他参数中仅使用on_dismissed、
+            on_failed、tag和group）
         body: Notification body text / 通知正文文本
         on_click: Callback function or URL string / 回调函数或URL字符串
         on_dismissed: Callback function for dismissal / 通知被关闭时的回调函数
@@ -644,7 +866,7 @@ def toast(title: Optional[str] = None, body: Optional[str] = None,
         selections: List of selection fields / 选择字段列表
         button: Single button / 单个按钮
         buttons: List of buttons / 按钮列表
-        xml: Custom XML template / 自定义XML模板
+        xml: Custom XML template, or the name of a registered template / 自定义XML模板，或已注册模板的名称
         app_id: Application ID / 应用程序ID
         ocr: OCR image path or dict / OCR图片路径或字典
         scenario: Toast scenario / 通知场景
@@ -690,15 +912,18 @@ def toast(title: Optional[str] = None, body: Optional[str] = None,
         # With parameterized icon / 使用参数化的图标
         toast('Hello', 'World', icon_src='path/to/icon.png', icon_placement=IconPlacement.APP_LOGO_OVERRIDE)
     """
-    toast_coroutine = toast_async(title, body, on_click, icon, image, progress, audio,
-                                  dialogue, duration, input, inputs, selection, selections, button, buttons,
-                                  xml, app_id, ocr, on_dismissed, on_failed,
-                                  scenario, tag, group,
-                                  image_src, image_placement,
-                                  icon_src, icon_placement, icon_hint_crop,
-                                  progress_title, progress_status, progress_value, progress_value_string_override,
-                                  input_id, input_placeholder, selection_id,
-                                  button_content, audio_loop)
+    if isinstance(title, ToastSpec):
+        toast_coroutine = toast_async(title, on_dismissed=on_dismissed, on_failed=on_failed, tag=tag, group=group)
+    else:
+        toast_coroutine = toast_async(title, body, on_click, icon, image, progress, audio,
+                                      dialogue, duration, input, inputs, selection, selections, button, buttons,
+                                      xml, app_id, ocr, on_dismissed, on_failed,
+                                      scenario, tag, group,
+                                      image_src, image_placement,
+                                      icon_src, icon_placement, icon_hint_crop,
+                                      progress_title, progress_status, progress_value, progress_value_string_override,
+                                      input_id, input_placeholder, selection_id,
+                                      button_content, audio_loop)
 
     # check if there is an existing loop
     try:
@@ -719,7 +944,7 @@ def toast(title: Optional[str] = None, body: Optional[str] = None,
         return future
 
 
-async def atoast(title: Optional[str] = None, body: Optional[str] = None,
+async def atoast(title: Optional[Union[str, ToastSpec]] = None, body: Optional[str] = None,
                  on_click: Optional[Union[Callable, str]] = None,
                  icon: Optional[Union[str, Dict[str, str]]] = None,
                  image: Optional[Union[str, Dict[str, str]]] = None,
@@ -765,6 +990,8 @@ async def atoast(title: Optional[str] = None, body: Optional[str] = None,
     Async alias for toast_async.
     toast_async 的异步别名。
     """
+    if isinstance(title, ToastSpec):
+        return await toast_async(title, on_dismissed=on_dismissed, on_failed=on_failed, tag=tag, group=group)
     return await toast_async(title, body, on_click, icon, image, progress, audio,
                              dialogue, duration, input, inputs, selection, selections, button, buttons,
                              xml, app_id, ocr, on_dismissed, on_failed,
@@ -789,6 +1016,10 @@ def clear_toast(app_id: str = DEFAULT_APP_ID, tag: Optional[str] = None, group:
     Raises / 异常:
         AttributeError: If tag is provided but group is not / 如果提供了tag但没有提供group
     """
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record(OP_CLEAR, [app_id, tag, group])
+
     # Get the notification history / 获取通知历史
     history = ToastNotificationManager.history
 
@@ -805,3 +1036,28 @@ def clear_toast(app_id: str = DEFAULT_APP_ID, tag: Optional[str] = None, group:
         # Remove all notifications in the group / 删除组中的所有通知
         history.remove_group(group, app_id)
 
+
+def cancel_scheduled(tag: str, group: Optional[str] = None, app_id: str = DEFAULT_APP_ID) -> int:
+    """
+    Cancel scheduled notifications that have not been shown yet.
+    取消尚未显示的定时通知。
+
+    Args / 参数:
+        tag: Notification tag / 通知标签
+        group: Notification group (optional). If None, cancels the tag in every group / 通知组（可选）。如果为None，取消所有组中的该标签
+        app_id: Application ID / 应用程序ID
+
+    Returns / 返回:
+        Number of cancelled notifications / 取消的通知数
+    """
+    count = get_scheduler().cancel(tag, group, app_id)
+    try:
+        notifier = _create_notifier(app_id)
+        for scheduled in notifier.get_scheduled_toast_notifications():
+            if scheduled.tag == tag and (group is None or scheduled.group == group):
+                notifier.remove_from_schedule(scheduled)
+                count += 1
+    except Exception:
+        # Windows scheduling unavailable for this app_id / 此app_id无法使用Windows定时
+        pass
+    return count
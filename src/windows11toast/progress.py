@@ -1,11 +1,29 @@
 """Progress notification functions / 进度通知函数"""
 
-from typing import Optional, Dict, Any, Union, Callable
+import asyncio
+import itertools
+import os
+import time
+from typing import Optional, Dict, Any, Union, Callable, Iterable, Iterator, TypeVar
 from winrt.windows.ui.notifications import ToastNotification
 
 from .enums import ImagePlacement, IconPlacement, IconCrop, AudioEvent, ToastDuration
 from .constants import DEFAULT_APP_ID
 from .notification import notify, _notification_cache, _notification_sequence
+from .executor import run_blocking
+from .shared_progress import get_shared_progress
+from .recording import get_recorder, OP_UPDATE
+
+T = TypeVar('T')
+
+# Process-wide counter for generated tags / 用于生成标签的进程级计数器
+_tag_ids = itertools.count(1)
+
+
+def _generate_tag(prefix: str = 'progress') -> str:
+    """Return a tag unique within this process and across processes / 返回在进程内及进程间唯一的标签"""
+    # The PID keeps tags unique across processes sharing an app_id / PID使共享app_id的进程间标签唯一
+    return f'{prefix}-{os.getpid()}-{next(_tag_ids)}'
 
 
 def notify_progress(title: Optional[str] = None,
@@ -131,10 +149,43 @@ def update_progress(value: Optional[float] = None,
     if value_string_override is not None:
         progress['valueStringOverride'] = value_string_override
 
+    # Traffic recording (opt-in, see enable_recording) / 流量记录（可选，见enable_recording）
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record(OP_UPDATE, [value, status, value_string_override, app_id, tag, group])
+        # The notify() call made by the update is part of it / 更新内部发出的notify()调用属于该更新
+        with recorder.paused():
+            return _update_progress_internal(progress, app_id, tag, group)
+
     # If no progress dict provided, use empty dict (will preserve existing values)
     return _update_progress_internal(progress, app_id, tag, group)
 
 
+async def update_progress_async(value: Optional[float] = None,
+                                status: Optional[str] = None,
+                                value_string_override: Optional[str] = None,
+                                app_id: str = DEFAULT_APP_ID,
+                                tag: str = 'my_tag',
+                                group: Optional[str] = None,
+                                limit: Optional[asyncio.Semaphore] = None) -> ToastNotification:
+    """
+    Update a progress notification without blocking the event loop.
+    更新进度通知，不阻塞事件循环。
+
+    Args / 参数:
+        value, status, value_string_override, app_id, tag, group: Same as update_progress() / 与update_progress()相同
+        limit: Semaphore capping the number of concurrent updates (optional) / 限制并发更新数量的信号量（可选）
+
+    Returns / 返回:
+        ToastNotification object / ToastNotification对象
+
+    Example / 示例:
+        await update_progress_async(value=0.5, tag='download')
+    """
+    return await run_blocking(update_progress, value, status, value_string_override, app_id, tag, group,
+                              limit=limit)
+
+
 def _update_progress_internal(progress: Dict[str, Any],
                               app_id: str = DEFAULT_APP_ID,
                               tag: str = 'my_tag',
@@ -157,6 +208,20 @@ def _update_progress_internal(progress: Dict[str, Any],
     Raises / 异常:
         ValueError: If no cached notification found for the tag / 如果找不到指定标签的缓存通知
     """
+    # Shared state is the source of truth when enabled (see enable_shared_progress) /
+    # 启用共享状态时以其为准（见enable_shared_progress）
+    shared_progress = get_shared_progress()
+    shared = None
+    if shared_progress is not None:
+        changes = {}
+        if 'status' in progress:
+            changes['body'] = progress['status']
+        if 'title' in progress:
+            changes['progress_title'] = progress['title']
+        shared = shared_progress.update(tag, changes)
+        if shared is not None:
+            _notification_cache[tag] = shared[0]
+
     # Get cached notification info if available
     if tag not in _notification_cache:
         # If no cache exists, this is likely an error - can't update a notification that doesn't exist
@@ -189,7 +254,10 @@ def _update_progress_internal(progress: Dict[str, Any],
     cached_group = cached.get('group') if group is None else group
 
     # Increment sequence number for this update
-    if tag in _notification_sequence:
+    if shared is not None:
+        # Already incremented atomically in shared memory / 已在共享内存中原子递增
+        _notification_sequence[tag] = shared[1]
+    elif tag in _notification_sequence:
         _notification_sequence[tag] += 1
     else:
         _notification_sequence[tag] = 2
@@ -211,3 +279,106 @@ def _update_progress_internal(progress: Dict[str, Any],
         image_placement=cached.get('image_placement')
     )
 
+
+def toast_progress(iterable: Iterable[T],
+                   total: Optional[int] = None,
+                   title: Optional[str] = None,
+                   status: Optional[str] = None,
+                   done_status: Optional[str] = 'Done!',
+                   failed_status: Optional[str] = 'Failed',
+                   stopped_status: Optional[str] = 'Stopped',
+                   min_interval: float = 0.5,
+                   app_id: str = DEFAULT_APP_ID,
+                   tag: Optional[str] = None,
+                   group: Optional[str] = None,
+                   **notify_options: Any) -> Iterator[T]:
+    """
+    Wrap an iterable and show its progress in a toast, like tqdm.
+    包装可迭代对象并在通知中显示其进度，类似tqdm。
+
+    The value and '534/10000' text are computed automatically. With a known total the toast is
+    only updated when the displayed percentage changes (at most 100 updates); with an unknown
+    total the count is shown at most every `min_interval` seconds. When the iteration finishes
+    the toast shows `done_status`; if the iterable raises it shows `failed_status`; if the loop
+    stops early (break, return or an exception in the loop body) it shows `stopped_status`.
+    进度值和'534/10000'文本自动计算。已知总数时仅在显示的百分比变化时更新通知（最多100次）；
+    总数未知时最多每`min_interval`秒显示一次计数。迭代完成时通知显示`done_status`；
+    如果可迭代对象抛出异常则显示`failed_status`；如果循环提前结束（break、return或循环体中的异常）则显示`stopped_status`。
+
+    Args / 参数:
+        iterable: Items to iterate / 要迭代的项
+        total: Number of items (default len(iterable) if available) / 项数（默认在可用时为len(iterable)）
+        title: Progress bar title / 进度条标题
+        status: Status text while running / 运行时的状态文本
+        done_status: Status text when finished / 完成时的状态文本
+        failed_status: Status text when the iterable raises / 可迭代对象抛出异常时的状态文本
+        stopped_status: Status text when the loop stops early / 循环提前结束时的状态文本
+        min_interval: Seconds between updates when total is unknown / 总数未知时的更新间隔（秒）
+        app_id: Application ID / 应用程序ID
+        tag: Notification tag (default: generated, unique per process) / 通知标签（默认自动生成，进程内唯一）
+        group: Notification group / 通知组
+        **notify_options: Extra keyword arguments passed to notify_progress() / 传递给notify_progress()的额外关键字参数
+
+    Returns / 返回:
+        Iterator over the items of iterable / 遍历iterable中各项的迭代器
+
+    Example / 示例:
+        for path in toast_progress(paths, title='Uploading', status='Uploading...'):
+            upload(path)
+    """
+    if total is None:
+        try:
+            total = len(iterable)
+        except TypeError:
+            total = None
+    if tag is None:
+        tag = _generate_tag()
+    return _toast_progress(iterable, total, title, status, done_status, failed_status, stopped_status,
+                           min_interval, app_id, tag, group, notify_options)
+
+
+def _toast_progress(iterable: Iterable[T], total: Optional[int], title: Optional[str], status: Optional[str],
+                    done_status: Optional[str], failed_status: Optional[str], stopped_status: Optional[str],
+                    min_interval: float, app_id: str, tag: str, group: Optional[str], notify_options: Dict[str, Any]) -> Iterator[T]:
+    def text(count: int) -> str:
+        return f'{count}/{total}' if total else str(count)
+
+    def value(count: int) -> Optional[float]:
+        return min(count / total, 1.0) if total else None
+
+    notify_progress(title, status, 0.0 if total else None, text(0),
+                    app_id=app_id, tag=tag, group=group, **notify_options)
+    count = 0
+    shown = 0
+    # Next count at which the displayed percentage changes / 显示的百分比发生变化的下一个计数
+    next_count = -(-total // 100) if total else None
+    next_time = time.monotonic() + min_interval
+    final_status = None
+    try:
+        for item in iterable:
+            yield item
+            count += 1
+            if total:
+                if count < next_count:
+                    continue
+                percent = count * 100 // total
+                next_count = -(-(percent + 1) * total // 100)
+            else:
+                now = time.monotonic()
+                if now < next_time:
+                    continue
+                next_time = now + min_interval
+            update_progress(value(count), None, text(count), app_id=app_id, tag=tag, group=group)
+            shown = count
+        final_status = done_status
+    except GeneratorExit:
+        # The generator was closed while suspended: the caller stopped early /
+        # 生成器在挂起时被关闭：调用方提前结束
+        final_status = stopped_status
+        raise
+    except BaseException:
+        final_status = failed_status
+        raise
+    finally:
+        if final_status is not None or count != shown:
+            update_progress(value(count), final_status, text(count), app_id=app_id, tag=tag, group=group)
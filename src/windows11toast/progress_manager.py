@@ -0,0 +1,218 @@
+"""Manage many progress toasts with handle objects / 使用句柄对象管理多个进度通知"""
+
+import logging
+import threading
+from typing import Optional, List, Any
+
+from .constants import DEFAULT_APP_ID
+from .progress import notify_progress, update_progress, _generate_tag
+from .scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressBar:
+    """
+    Handle to one progress toast created by ProgressManager.bar().
+    由ProgressManager.bar()创建的单个进度通知的句柄。
+
+    update() only changes in-memory state; the manager pushes changed bars to Windows on its next flush.
+    update()仅修改内存中的状态；管理器在下一次刷新时将变化的进度条推送到Windows。
+    """
+
+    __slots__ = ('tag', 'title', 'status', 'value', 'value_string_override',
+                 '_manager', '_dirty', '_shown', '_closed')
+
+    def __init__(self, manager: 'ProgressManager', tag: str, title: Optional[str], status: Optional[str],
+                 value: Optional[float], value_string_override: Optional[str]):
+        self.tag = tag
+        self.title = title
+        self.status = status
+        self.value = value
+        self.value_string_override = value_string_override
+        self._manager = manager
+        self._dirty = True
+        self._shown = False
+        self._closed = False
+
+    def update(self, value: Optional[float] = None, status: Optional[str] = None,
+               value_string_override: Optional[str] = None) -> None:
+        """
+        Set new progress values; omitted values are kept.
+        设置新的进度值；省略的值保持不变。
+
+        Args / 参数:
+            value: Progress value between 0.0 and 1.0 / 进度值，范围0.0到1.0
+            status: Status text / 状态文本
+            value_string_override: Custom string to display instead of percentage / 替代百分比显示的自定义字符串
+        """
+        with self._manager._lock:
+            if self._closed:
+                return
+            if value is not None:
+                self.value = value
+            if status is not None:
+                self.status = status
+            if value_string_override is not None:
+                self.value_string_override = value_string_override
+            self._dirty = True
+
+    def close(self, status: Optional[str] = None, value: Optional[float] = None) -> None:
+        """
+        Set the final values; the bar is sent once more and then released.
+        设置最终值；进度条会再发送一次，然后被释放。
+
+        Args / 参数:
+            status: Final status text (e.g. 'Done!') / 最终状态文本（例如：'完成！'）
+            value: Final progress value / 最终进度值
+        """
+        self.update(value, status)
+        with self._manager._lock:
+            self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called / 是否已调用close()"""
+        return self._closed
+
+    def __enter__(self) -> 'ProgressBar':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class ProgressManager:
+    """
+    Hand out progress bars with unique tags and push changes to Windows from one flush loop.
+    分发具有唯一标签的进度条，并通过单个刷新循环将变化推送到Windows。
+
+    Every `interval` seconds the shared scheduler thread sends the bars that changed since the
+    previous flush, so many jobs updating as fast as they like cost at most one WinRT update per
+    bar per interval. The loop stops when no open bars remain.
+    共享调度器线程每隔`interval`秒发送自上次刷新以来发生变化的进度条，因此许多任务随意频繁更新，
+    每个进度条每个间隔最多只产生一次WinRT更新。没有打开的进度条时循环停止。
+
+    Args / 参数:
+        interval: Seconds between flushes / 刷新间隔（秒）
+        app_id: Application ID / 应用程序ID
+        tag_prefix: Prefix of generated tags / 生成标签的前缀
+        group: Notification group / 通知组
+        **notify_options: Extra keyword arguments passed to notify_progress() / 传递给notify_progress()的额外关键字参数
+
+    Example / 示例:
+        manager = ProgressManager(interval=0.5)
+        bars = [manager.bar(f'Job {i}', status='Running...') for i in range(30)]
+        bars[0].update(0.4, value_string_override='4/10')
+        bars[0].close('Done!', 1.0)
+    """
+
+    def __init__(self, interval: float = 0.5, app_id: str = DEFAULT_APP_ID,
+                 tag_prefix: str = 'progress', group: Optional[str] = None, **notify_options: Any):
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        self.interval = interval
+        self.app_id = app_id
+        self.tag_prefix = tag_prefix
+        self.group = group
+        self.notify_options = notify_options
+        self._lock = threading.Lock()
+        self._bars: List[ProgressBar] = []
+        self._scheduled = False
+        # Scheduler tag of the flush loop, used to cancel it / 刷新循环的调度器标签，用于取消
+        self._tick_tag = _generate_tag('progress-manager')
+
+    def bar(self, title: Optional[str] = None, status: Optional[str] = None, value: Optional[float] = 0.0,
+            value_string_override: Optional[str] = None, tag: Optional[str] = None) -> ProgressBar:
+        """
+        Create a progress bar; it is shown on the next flush.
+        创建一个进度条；它将在下一次刷新时显示。
+
+        Args / 参数:
+            title: Progress bar title / 进度条标题
+            status: Status text / 状态文本
+            value: Initial progress value / 初始进度值
+            value_string_override: Custom string to display instead of percentage / 替代百分比显示的自定义字符串
+            tag: Notification tag (default: generated, unique per process) / 通知标签（默认自动生成，进程内唯一）
+
+        Returns / 返回:
+            ProgressBar handle / ProgressBar句柄
+        """
+        if tag is None:
+            tag = _generate_tag(self.tag_prefix)
+        bar = ProgressBar(self, tag, title, status, value, value_string_override)
+        with self._lock:
+            self._bars.append(bar)
+            if not self._scheduled:
+                self._scheduled = True
+                get_scheduler().call_later(self.interval, self._tick, tag=self._tick_tag)
+        return bar
+
+    @property
+    def bars(self) -> List[ProgressBar]:
+        """Bars not yet released / 尚未释放的进度条"""
+        with self._lock:
+            return list(self._bars)
+
+    def flush(self) -> int:
+        """
+        Send every bar that changed since the previous flush.
+        发送自上次刷新以来发生变化的所有进度条。
+
+        Returns / 返回:
+            Number of bars sent / 发送的进度条数
+        """
+        with self._lock:
+            pending = []
+            for bar in self._bars:
+                if bar._dirty:
+                    bar._dirty = False
+                    pending.append((bar, bar.title, bar.status, bar.value, bar.value_string_override, bar._shown))
+        for bar, title, status, value, value_string_override, shown in pending:
+            sent = False
+            try:
+                if shown:
+                    update_progress(value, status, value_string_override,
+                                    app_id=self.app_id, tag=bar.tag, group=self.group)
+                else:
+                    sent = notify_progress(title, status, value, value_string_override, app_id=self.app_id,
+                                           tag=bar.tag, group=self.group, **self.notify_options) is not None
+            except Exception:
+                # One failing bar must not stop the others / 单个进度条失败不能影响其他进度条
+                logger.exception("progress bar '%s' failed to send", bar.tag)
+            if not shown:
+                with self._lock:
+                    if sent:
+                        bar._shown = True
+                    else:
+                        # Not shown yet, show it as a new toast on the next flush / 尚未显示，下次刷新时作为新通知显示
+                        bar._dirty = True
+        with self._lock:
+            # Closed bars are released once their final state is sent / 已关闭的进度条在最终状态发送后释放
+            self._bars = [bar for bar in self._bars if not bar._closed or bar._dirty]
+        return len(pending)
+
+    def _tick(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._bars:
+                get_scheduler().call_later(self.interval, self._tick, tag=self._tick_tag)
+            else:
+                self._scheduled = False
+
+    def close(self) -> None:
+        """Close every open bar and send the final states now / 关闭所有打开的进度条并立即发送最终状态"""
+        for bar in self.bars:
+            bar.close()
+        self.flush()
+        with self._lock:
+            if not self._bars and self._scheduled:
+                # Nothing left to flush, stop the loop now / 没有需要刷新的内容，立即停止循环
+                get_scheduler().cancel(self._tick_tag)
+                self._scheduled = False
+
+    def __enter__(self) -> 'ProgressManager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,169 @@
+"""One progress toast fed by many worker processes / 由多个工作进程驱动的单个进度通知"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Optional, Any
+
+from .constants import DEFAULT_APP_ID
+from .progress import notify_progress, update_progress, _generate_tag
+
+
+class ProgressReporter:
+    """
+    Picklable handle that workers use to report completed units.
+    工作进程用于报告已完成单位数的可序列化句柄。
+
+    Reporting only puts an integer on a queue; workers never talk to WinRT.
+    报告只会向队列放入一个整数；工作进程从不调用WinRT。
+    """
+
+    __slots__ = ('_queue',)
+
+    def __init__(self, queue: Any):
+        self._queue = queue
+
+    def advance(self, n: int = 1) -> None:
+        """
+        Report n more completed units.
+        报告又完成了n个单位。
+
+        Args / 参数:
+            n: Number of completed units / 完成的单位数
+        """
+        if n:
+            self._queue.put(n)
+
+    __call__ = advance
+
+
+class PoolProgress:
+    """
+    Show one progress toast for work split across a process pool.
+    为拆分到进程池中的工作显示单个进度通知。
+
+    Workers call a ProgressReporter, which sends small increments over a queue. One aggregator
+    thread in this process sums them and calls update_progress() at most once per `interval`.
+    工作进程调用ProgressReporter，通过队列发送小的增量。本进程中的单个聚合线程汇总这些增量，
+    并且每`interval`秒最多调用一次update_progress()。
+
+    Args / 参数:
+        total: Total number of units, None if unknown / 总单位数，未知时为None
+        title: Progress bar title / 进度条标题
+        status: Status text while running / 运行时的状态文本
+        done_status: Status text after close() / close()之后的状态文本
+        failed_status: Status text when the with block raises / with块抛出异常时的状态文本
+        interval: Minimum seconds between toast updates / 通知更新的最小间隔（秒）
+        app_id: Application ID / 应用程序ID
+        tag: Notification tag (default: generated, unique per process) / 通知标签（默认自动生成，进程内唯一）
+        group: Notification group / 通知组
+        queue: Queue shared with the workers (default: a multiprocessing.Manager queue, which can be
+            passed to ProcessPoolExecutor tasks) / 与工作进程共享的队列（默认为multiprocessing.Manager队列，
+            可传递给ProcessPoolExecutor任务）
+        **notify_options: Extra keyword arguments passed to notify_progress() / 传递给notify_progress()的额外关键字参数
+
+    Example / 示例:
+        def work(chunk, report):
+            for item in chunk:
+                process(item)
+                report()
+
+        with PoolProgress(total=len(items), title='Encoding') as progress:
+            with ProcessPoolExecutor() as pool:
+                for chunk in chunks:
+                    pool.submit(work, chunk, progress.reporter())
+    """
+
+    def __init__(self, total: Optional[int] = None, title: Optional[str] = None, status: Optional[str] = None,
+                 done_status: Optional[str] = 'Done!', failed_status: Optional[str] = 'Failed',
+                 interval: float = 0.5, app_id: str = DEFAULT_APP_ID, tag: Optional[str] = None,
+                 group: Optional[str] = None, queue: Any = None, **notify_options: Any):
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        self.total = total
+        self.done_status = done_status
+        self.failed_status = failed_status
+        self.interval = interval
+        self.app_id = app_id
+        self.tag = tag if tag is not None else _generate_tag('pool')
+        self.group = group
+        self._manager = None
+        if queue is None:
+            self._manager = multiprocessing.Manager()
+            queue = self._manager.Queue()
+        self._queue = queue
+        self._completed = 0
+        self._closed = False
+        notify_progress(title, status, 0.0 if total else None, self._text(0),
+                        app_id=app_id, tag=self.tag, group=group, **notify_options)
+        self._thread = threading.Thread(target=self._run, name='windows11toast-pool-progress', daemon=True)
+        self._thread.start()
+
+    def _text(self, count: int) -> str:
+        return f'{count}/{self.total}' if self.total else str(count)
+
+    def _value(self, count: int) -> Optional[float]:
+        return min(count / self.total, 1.0) if self.total else None
+
+    def reporter(self) -> ProgressReporter:
+        """Return a reporter to pass to a worker / 返回要传递给工作进程的报告器"""
+        return ProgressReporter(self._queue)
+
+    @property
+    def completed(self) -> int:
+        """Units counted so far / 目前已统计的单位数"""
+        return self._completed
+
+    def _update(self, status: Optional[str] = None) -> None:
+        try:
+            update_progress(self._value(self._completed), status, self._text(self._completed),
+                            app_id=self.app_id, tag=self.tag, group=self.group)
+        except Exception:
+            # A failed update must not stop the aggregator / 单次更新失败不能停止聚合线程
+            pass
+
+    def _run(self) -> None:
+        shown = 0
+        next_time = time.monotonic() + self.interval
+        while True:
+            timeout = next_time - time.monotonic() if self._completed != shown else None
+            try:
+                n = self._queue.get(timeout=max(timeout, 0.0)) if timeout is not None else self._queue.get()
+            except queue.Empty:
+                n = 0
+            except (EOFError, OSError):
+                # The manager went away / 管理器已退出
+                return
+            if n is None:
+                # Sentinel from close() / 来自close()的结束标记
+                return
+            self._completed += n
+            now = time.monotonic()
+            if self._completed != shown and now >= next_time:
+                self._update()
+                shown = self._completed
+                next_time = now + self.interval
+
+    def close(self, status: Optional[str] = None) -> None:
+        """
+        Count the remaining increments and show the final state.
+        统计剩余的增量并显示最终状态。
+
+        Args / 参数:
+            status: Final status text (default done_status) / 最终状态文本（默认为done_status）
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._update(status if status is not None else self.done_status)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def __enter__(self) -> 'PoolProgress':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(self.failed_status if exc_type is not None else None)
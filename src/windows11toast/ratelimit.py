@@ -0,0 +1,198 @@
+"""Per-app_id token-bucket rate limiting for notifications / 按app_id的令牌桶通知限流"""
+
+import threading
+import time
+from typing import Optional, Dict, Callable, Any, Tuple
+
+from .scheduler import get_scheduler
+
+# Over-limit policies / 超限策略
+LIMIT_BLOCK = 'block'  # Sleep in the calling thread until a token is available ('delay' on the scheduler thread) / 在调用线程中等待直到有可用令牌（在调度线程中同'delay'）
+LIMIT_DELAY = 'delay'  # Return immediately and show later on the scheduler thread / 立即返回，稍后在调度线程中显示
+LIMIT_DROP = 'drop'  # Discard the notification / 丢弃通知
+LIMIT_RAISE = 'raise'  # Raise RateLimitExceeded / 抛出RateLimitExceeded
+
+_POLICIES = (LIMIT_BLOCK, LIMIT_DELAY, LIMIT_DROP, LIMIT_RAISE)
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a notification exceeds the rate limit with the 'raise' policy / 使用'raise'策略时通知超出限流时抛出"""
+
+    def __init__(self, app_id: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for app_id '{app_id}', retry after {retry_after:.3f}s")
+        self.app_id = app_id
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by app_id.
+    按app_id划分的令牌桶限流器。
+
+    Each app_id gets its own bucket holding up to `burst` tokens, refilled at `rate` tokens per second.
+    Showing a toast costs one token.
+    每个app_id拥有独立的令牌桶，最多容纳`burst`个令牌，以每秒`rate`个令牌的速度补充。显示一条通知消耗一个令牌。
+
+    Args / 参数:
+        rate: Tokens added per second / 每秒补充的令牌数
+        burst: Bucket capacity / 令牌桶容量
+        policy: Over-limit policy: 'block', 'delay', 'drop' or 'raise' / 超限策略：'block'、'delay'、'drop'或'raise'
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, policy: str = LIMIT_BLOCK):
+        if policy not in _POLICIES:
+            raise ValueError(f"policy must be one of {_POLICIES}, got '{policy}'")
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        self.rate = rate
+        self.burst = burst
+        self.policy = policy
+        # app_id -> (rate, burst)
+        self._limits: Dict[str, Tuple[float, int]] = {}
+        # app_id -> [tokens, last_refill]
+        self._buckets: Dict[str, list] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def set_limit(self, app_id: str, rate: float, burst: int) -> None:
+        """Override rate and burst for one app_id / 为单个app_id覆盖速率和容量"""
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        with self._lock:
+            self._limits[app_id] = (rate, burst)
+            self._buckets.pop(app_id, None)
+
+    def _reserve(self, app_id: str, borrow: bool) -> float:
+        """
+        Take a token from the bucket of app_id.
+        从app_id的令牌桶中取出一个令牌。
+
+        Returns / 返回:
+            0.0 if a token was taken now, otherwise seconds until one is available.
+            With borrow=True the token is taken anyway and the bucket goes into debt.
+            立即取得令牌时返回0.0，否则返回距下一个令牌可用的秒数。borrow=True时无论如何都会取走令牌，令牌桶进入负债。
+        """
+        rate, burst = self._limits.get(app_id, (self.rate, self.burst))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(app_id)
+            if bucket is None:
+                bucket = self._buckets[app_id] = [float(burst), now]
+            else:
+                bucket[0] = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            counters = self._counters.get(app_id)
+            if counters is None:
+                counters = self._counters[app_id] = dict.fromkeys(
+                    ('allowed', 'limited', 'blocked', 'delayed', 'dropped', 'raised'), 0)
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                counters['allowed'] += 1
+                return 0.0
+            wait = (1.0 - bucket[0]) / rate
+            counters['limited'] += 1
+            if borrow:
+                bucket[0] -= 1.0
+            return wait
+
+    def _count(self, app_id: str, name: str) -> None:
+        with self._lock:
+            self._counters[app_id][name] += 1
+
+    def submit(self, app_id: str, show: Callable, *args: Any) -> bool:
+        """
+        Call show(*args) if app_id is within its limit, otherwise apply the over-limit policy.
+        如果app_id未超限则调用show(*args)，否则执行超限策略。
+
+        Returns / 返回:
+            True if the call was made or scheduled, False if it was dropped / 已调用或已安排时返回True，被丢弃时返回False
+
+        Raises / 异常:
+            RateLimitExceeded: If over the limit with the 'raise' policy / 使用'raise'策略且超限时
+        """
+        borrow = self.policy in (LIMIT_BLOCK, LIMIT_DELAY)
+        wait = self._reserve(app_id, borrow)
+        if wait == 0.0:
+            show(*args)
+            return True
+        if self.policy == LIMIT_DROP:
+            self._count(app_id, 'dropped')
+            return False
+        if self.policy == LIMIT_RAISE:
+            self._count(app_id, 'raised')
+            raise RateLimitExceeded(app_id, wait)
+        scheduler = get_scheduler()
+        if self.policy == LIMIT_BLOCK and not scheduler.in_scheduler_thread():
+            self._count(app_id, 'blocked')
+            time.sleep(wait)
+            show(*args)
+            return True
+        # Sleeping on the scheduler thread would hold up every other due entry /
+        # 在调度线程中等待会阻塞其他所有到期条目
+        self._count(app_id, 'delayed')
+        scheduler.call_later(wait, show, *args)
+        return True
+
+    def stats(self, app_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return limiter counters.
+        返回限流计数器。
+
+        Args / 参数:
+            app_id: Return counters of one app_id only (optional) / 仅返回单个app_id的计数器（可选）
+
+        Returns / 返回:
+            Dictionary of counters ('allowed', 'limited', 'blocked', 'delayed', 'dropped', 'raised'), keyed by app_id unless app_id is given
+            计数器字典（'allowed'、'limited'、'blocked'、'delayed'、'dropped'、'raised'），未指定app_id时按app_id分组
+        """
+        with self._lock:
+            if app_id is not None:
+                return dict(self._counters.get(app_id, {}))
+            return {key: dict(value) for key, value in self._counters.items()}
+
+    def reset_stats(self) -> None:
+        """Reset all counters / 重置所有计数器"""
+        with self._lock:
+            self._counters.clear()
+
+
+# Active rate limiter used by notify(), None when disabled / notify()使用的活动限流器，禁用时为None
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def enable_rate_limit(rate: float = 5.0, burst: int = 10, policy: str = LIMIT_BLOCK) -> RateLimiter:
+    """
+    Enable per-app_id rate limiting in front of notifier.show in notify().
+    在notify()的notifier.show之前启用按app_id的限流。
+
+    Args / 参数:
+        rate: Toasts allowed per second per app_id / 每个app_id每秒允许的通知数
+        burst: Toasts allowed in a burst per app_id / 每个app_id允许的突发通知数
+        policy: Over-limit policy: 'block', 'delay', 'drop' (notify() returns None) or 'raise' / 超限策略：'block'、'delay'、'drop'（notify()返回None）或'raise'
+
+    Returns / 返回:
+        The active RateLimiter / 活动的RateLimiter
+
+    Example / 示例:
+        limiter = enable_rate_limit(rate=2, burst=5, policy='drop')
+        ...
+        print(limiter.stats())
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(rate, burst, policy)
+    return _rate_limiter
+
+
+def disable_rate_limit() -> None:
+    """Disable rate limiting for notify() / 为notify()禁用限流"""
+    global _rate_limiter
+    _rate_limiter = None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Return the active RateLimiter, or None if disabled / 返回活动的RateLimiter，禁用时返回None"""
+    return _rate_limiter
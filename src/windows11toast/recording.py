@@ -0,0 +1,261 @@
+"""Record notification traffic to a log and replay it / 将通知流量记录到日志并回放"""
+
+import contextlib
+import json
+import threading
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Dict, List, Tuple, Iterator, Any
+
+from .spec import ToastSpec, ButtonSpec, InputSpec, SelectionSpec
+
+# Log operations / 日志操作
+OP_NOTIFY = 'n'
+OP_UPDATE = 'u'
+OP_CLEAR = 'c'
+
+_FORMAT = 'windows11toast-recording/1'
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if callable(value):
+        # Callbacks cannot be recorded / 回调无法被记录
+        return None
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values json cannot, such as numpy scalars / 编码json无法处理的值，例如numpy标量"""
+    if hasattr(value, '__index__'):
+        return int(value)
+    if hasattr(value, '__float__'):
+        return float(value)
+    return str(value)
+
+
+def encode_spec(spec: ToastSpec) -> Dict[str, Any]:
+    """
+    Convert a ToastSpec to a compact JSON-compatible dict, omitting default fields.
+    将ToastSpec转换为紧凑的JSON兼容字典，省略默认字段。
+
+    Callable on_click values are dropped; string on_click values are kept.
+    可调用的on_click会被丢弃；字符串形式的on_click会保留。
+    """
+    data = {}
+    for name, value in spec.as_dict().items():
+        if name == 'inputs':
+            value = [[field.id, field.placeholder] for field in value]
+        elif name == 'selections':
+            value = [[selection.id, list(selection.items)] for selection in value]
+        elif name == 'buttons':
+            value = [button.content if button == ButtonSpec(button.content) else
+                     {'content': button.content, 'arguments': button.arguments,
+                      'activation_type': button.activation_type, 'attributes': list(button.attributes)}
+                     for button in value]
+        else:
+            value = _encode_value(value)
+        if value is None or value is False or value == []:
+            continue
+        data[name] = value
+    return data
+
+
+def decode_spec(data: Dict[str, Any]) -> ToastSpec:
+    """Rebuild a ToastSpec from encode_spec() output / 从encode_spec()的输出重建ToastSpec"""
+    data = dict(data)
+    data['inputs'] = [InputSpec(field_id, placeholder) for field_id, placeholder in data.get('inputs', ())]
+    data['selections'] = [SelectionSpec(selection_id, [item if isinstance(item, str) else tuple(item) for item in items])
+                          for selection_id, items in data.get('selections', ())]
+    data['buttons'] = [button if isinstance(button, str) else
+                       ButtonSpec(button['content'], button['arguments'], button['activation_type'],
+                                  [tuple(pair) for pair in button['attributes']])
+                       for button in data.get('buttons', ())]
+    return ToastSpec(**data)
+
+
+class Recorder:
+    """
+    Append notify(), update_progress() and clear_toast() calls to a JSON-lines log.
+    将notify()、update_progress()和clear_toast()调用追加到JSON行日志中。
+
+    The first line is a header with the wall-clock start time; each following line is
+    [seconds since start, op, args]. Lines are buffered and written in order under a lock.
+    Recording never makes a send fail: numbers such as numpy scalars are stored as plain numbers,
+    other unknown values as text, and events that still cannot be written are counted in `skipped`.
+    第一行是包含墙上时钟开始时间的头部；之后每行为[自开始以来的秒数, 操作, 参数]。各行经过缓冲并在锁内按顺序写入。
+    记录永远不会导致发送失败：numpy标量等数字按普通数字保存，其他未知值按文本保存，仍无法写入的事件计入`skipped`。
+
+    Args / 参数:
+        path: Log file path, appended to / 日志文件路径，以追加方式写入
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start = time.monotonic()
+        self.events = 0
+        self.skipped = 0
+        self._write({'format': _FORMAT, 'start': time.time()})
+
+    def _write(self, entry: Any) -> None:
+        line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + '\n'
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def record(self, op: str, args: List[Any]) -> None:
+        """Append one event / 追加一个事件"""
+        if getattr(self._local, 'paused', False):
+            return
+        try:
+            line = json.dumps([round(time.monotonic() - self._start, 6), op, args],
+                              separators=(',', ':'), ensure_ascii=False, default=_json_default) + '\n'
+            with self._lock:
+                if not self._file.closed:
+                    self._file.write(line)
+                    self.events += 1
+        except (TypeError, ValueError, OSError):
+            # Recording must not break the send it records / 记录不能导致被记录的发送失败
+            with self._lock:
+                self.skipped += 1
+
+    def record_notify(self, spec: ToastSpec, tag: Optional[str], group: Optional[str],
+                      deliver_at: Optional[datetime], delay: Optional[float]) -> None:
+        """Record a notify() call / 记录一次notify()调用"""
+        if deliver_at is not None:
+            # Stored relative to the send time / 相对发送时间存储
+            delay = deliver_at.timestamp() - time.time()
+        self.record(OP_NOTIFY, [encode_spec(spec), tag, group, delay])
+
+    @contextlib.contextmanager
+    def paused(self) -> Iterator[None]:
+        """Do not record calls made by this thread inside the block / 块内不记录此线程发出的调用"""
+        self._local.paused = True
+        try:
+            yield
+        finally:
+            self._local.paused = False
+
+    def flush(self) -> None:
+        """Write buffered events to disk / 将缓冲的事件写入磁盘"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the log / 刷新并关闭日志"""
+        with self._lock:
+            self._file.close()
+
+
+# Active recorder used by notify(), None when disabled / notify()使用的活动记录器，禁用时为None
+_recorder: Optional[Recorder] = None
+
+
+def enable_recording(path: str) -> Recorder:
+    """
+    Record every notify(), update_progress() and clear_toast() call to a log file.
+    将每次notify()、update_progress()和clear_toast()调用记录到日志文件。
+
+    Args / 参数:
+        path: Log file path, appended to / 日志文件路径，以追加方式写入
+
+    Returns / 返回:
+        The active Recorder / 活动的Recorder
+
+    Example / 示例:
+        enable_recording('traffic.jsonl')
+        run_service()
+        disable_recording()
+        replay('traffic.jsonl', speed=None)  # as fast as possible / 尽可能快
+    """
+    global _recorder
+    recorder = Recorder(path)
+    if _recorder is not None:
+        _recorder.close()
+    _recorder = recorder
+    return recorder
+
+
+def disable_recording() -> None:
+    """Stop recording and close the log / 停止记录并关闭日志"""
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+    _recorder = None
+
+
+def get_recorder() -> Optional[Recorder]:
+    """Return the active Recorder, or None if disabled / 返回活动的Recorder，禁用时返回None"""
+    return _recorder
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, str, List[Any]]]:
+    """
+    Iterate over the events of a log as (seconds since start, op, args).
+    以(自开始以来的秒数, 操作, 参数)的形式遍历日志中的事件。
+
+    A log appended to several times holds several sessions; offsets continue from the previous session.
+    多次追加的日志包含多个会话；时间偏移从上一个会话继续。
+    """
+    base = 0.0
+    last = 0.0
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, dict):
+                # Session header / 会话头部
+                base = last
+                continue
+            offset, op, args = entry
+            last = base + offset
+            yield last, op, args
+
+
+def replay(path: str, speed: Optional[float] = 1.0) -> Dict[str, float]:
+    """
+    Send the events of a log again.
+    再次发送日志中的事件。
+
+    Args / 参数:
+        path: Log file path / 日志文件路径
+        speed: 1.0 for the original timing, 2.0 for twice as fast, None for as fast as possible /
+            1.0为原始节奏，2.0为两倍速，None为尽可能快
+
+    Returns / 返回:
+        {'events', 'errors', 'elapsed'}
+
+    Example / 示例:
+        stats = replay('traffic.jsonl', speed=10.0)
+    """
+    if speed is not None and speed <= 0:
+        raise ValueError('speed must be positive or None')
+    from .notification import _notify, clear_toast
+    from .progress import update_progress
+
+    events = errors = 0
+    start = time.monotonic()
+    for offset, op, args in read_recording(path):
+        if speed is not None:
+            wait = start + offset / speed - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        try:
+            if op == OP_NOTIFY:
+                spec, tag, group, delay = args
+                _notify(decode_spec(spec), tag, group, None, delay if delay is None or delay > 0 else None)
+            elif op == OP_UPDATE:
+                update_progress(*args)
+            elif op == OP_CLEAR:
+                clear_toast(*args)
+        except Exception:
+            errors += 1
+        events += 1
+    return {'events': events, 'errors': errors, 'elapsed': time.monotonic() - start}
@@ -0,0 +1,330 @@
+"""Local cache and prefetch for remote http(s) toast images / 远程http(s)通知图片的本地缓存与预取"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Iterable, Union
+
+DEFAULT_REMOTE_CACHE_DIR = Path(os.environ.get('LOCALAPPDATA') or tempfile.gettempdir()) / 'windows11toast' / 'remote'
+
+_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/gif': '.gif',
+    'image/bmp': '.bmp',
+    'image/webp': '.webp',
+    'image/x-icon': '.ico',
+    'image/vnd.microsoft.icon': '.ico',
+}
+
+
+class RemoteImageTooLarge(ValueError):
+    """Raised when a remote image exceeds the size cap / 远程图片超过大小上限时抛出"""
+
+
+class RemoteImageCache:
+    """
+    Download remote images into a local on-disk cache.
+    将远程图片下载到本地磁盘缓存。
+
+    Entries younger than `max_age` seconds are used without any network access. Older entries are
+    revalidated with If-None-Match/If-Modified-Since, so an unchanged image costs one 304 response.
+    If the server is unreachable or answers with a 5xx error, a stale copy is used; a 404 or 410
+    removes the entry. When the cache grows beyond `max_bytes`, least recently used images are deleted.
+    小于`max_age`秒的条目无需访问网络即可使用。较旧的条目使用If-None-Match/If-Modified-Since重新验证，
+    未变化的图片只需一次304响应。服务器不可达或返回5xx错误时使用过期副本；404或410会移除该条目。
+    缓存超过`max_bytes`时删除最近最少使用的图片。
+
+    Args / 参数:
+        cache_dir: Cache directory / 缓存目录
+        max_image_bytes: Maximum size of a single image / 单张图片的最大大小
+        max_age: Seconds an entry is used without revalidation / 条目无需重新验证即可使用的秒数
+        timeout: Network timeout in seconds / 网络超时（秒）
+        max_bytes: Maximum total size of cached files / 缓存文件的最大总大小
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_image_bytes: int = 3 * 1024 * 1024,
+                 max_age: float = 300.0, timeout: float = 10.0, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_REMOTE_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_image_bytes = max_image_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # url -> [lock, users] for URLs being fetched, so concurrent requests for one URL download it once /
+        # 正在获取的url -> [锁, 使用者数]，使同一URL的并发请求只下载一次
+        self._url_locks: Dict[str, list] = {}
+        self._total = sum(f.stat().st_size for f in self.cache_dir.iterdir() if f.is_file())
+
+    def _meta_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(url.encode('utf-8')).hexdigest()[:32] + '.json')
+
+    def _read_meta(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._meta_path(url), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.isfile(meta.get('path', '')) else None
+
+    def cached_path(self, url: str, fresh_only: bool = False) -> Optional[str]:
+        """
+        Return the cached file of url without network access, or None.
+        不访问网络返回url的缓存文件，没有则返回None。
+
+        Args / 参数:
+            url: Image URL / 图片URL
+            fresh_only: Ignore entries older than max_age / 忽略超过max_age的条目
+        """
+        meta = self._read_meta(url)
+        if meta is None or (fresh_only and time.time() - meta['fetched_at'] >= self.max_age):
+            return None
+        return meta['path']
+
+    def fetch(self, url: str) -> str:
+        """
+        Return a local file for url, downloading or revalidating it if needed.
+        返回url对应的本地文件，必要时下载或重新验证。
+
+        Args / 参数:
+            url: http(s) image URL / http(s)图片URL
+
+        Returns / 返回:
+            Absolute path of the cached file / 缓存文件的绝对路径
+
+        Raises / 异常:
+            RemoteImageTooLarge: If the image exceeds max_image_bytes / 如果图片超过max_image_bytes
+            OSError: If the download fails and no cached copy can be used; 4xx responses never use the cached copy /
+                如果下载失败且没有可用的缓存副本；4xx响应从不使用缓存副本
+        """
+        with self._lock:
+            entry = self._url_locks.get(url)
+            if entry is None:
+                entry = self._url_locks[url] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                return self._fetch(url)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    # Only URLs being fetched keep a lock / 只有正在获取的URL保留锁
+                    del self._url_locks[url]
+
+    def _fetch(self, url: str) -> str:
+        meta = self._read_meta(url)
+        if meta and time.time() - meta['fetched_at'] < self.max_age:
+            # Mark as recently used / 标记为最近使用
+            os.utime(meta['path'])
+            return meta['path']
+
+        request = urllib.request.Request(url, headers={'User-Agent': 'windows11toast'})
+        if meta:
+            if meta.get('etag'):
+                request.add_header('If-None-Match', meta['etag'])
+            if meta.get('last_modified'):
+                request.add_header('If-Modified-Since', meta['last_modified'])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return self._store(url, response, meta)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and meta:
+                meta['fetched_at'] = time.time()
+                self._write_meta(url, meta)
+                os.utime(meta['path'])
+                return meta['path']
+            if e.code >= 500 and meta:
+                # Server error, use the stale copy / 服务器错误，使用过期副本
+                return meta['path']
+            if e.code in (404, 410) and meta:
+                # The image is gone, so is our copy / 图片已不存在，删除本地副本
+                self._remove(url, meta)
+            raise
+        except OSError:
+            if meta:
+                # Server unreachable, use the stale copy / 服务器不可达，使用过期副本
+                return meta['path']
+            raise
+
+    def _remove(self, url: str, meta: dict) -> None:
+        """Delete a cached image and its metadata / 删除缓存的图片及其元数据"""
+        for path in (Path(meta['path']), self._meta_path(url)):
+            self._unlink(path)
+
+    def _unlink(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._total -= size
+
+    def _store(self, url: str, response, meta: Optional[dict]) -> str:
+        length = response.headers.get('Content-Length')
+        if length and int(length) > self.max_image_bytes:
+            raise RemoteImageTooLarge(f'{url} is {length} bytes (max {self.max_image_bytes})')
+        content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        extension = _EXTENSIONS.get(content_type)
+        if extension is None:
+            suffix = Path(urllib.parse.urlsplit(url).path).suffix.lower()
+            extension = suffix if suffix in _EXTENSIONS.values() else '.img'
+        meta_path = self._meta_path(url)
+        target = meta_path.with_suffix(extension)
+        tmp = meta_path.with_suffix(f'.{threading.get_ident()}.tmp')
+        size = 0
+        try:
+            with open(tmp, 'wb') as f:
+                for chunk in iter(lambda: response.read(64 * 1024), b''):
+                    size += len(chunk)
+                    if size > self.max_image_bytes:
+                        raise RemoteImageTooLarge(f'{url} is larger than {self.max_image_bytes} bytes')
+                    f.write(chunk)
+            if meta and Path(meta['path']) != target.absolute():
+                # The extension changed, the previous copy would be orphaned / 扩展名已变化，之前的副本会成为孤立文件
+                self._unlink(Path(meta['path']))
+            try:
+                size -= target.stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._write_meta(url, {
+            'path': str(target.absolute()),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        })
+        with self._lock:
+            self._total += size
+            if self._total > self.max_bytes:
+                self._evict(keep=target)
+        return str(target.absolute())
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used images until under max_bytes (lock must be held) / 删除最近最少使用的图片直到低于max_bytes（须持有锁）"""
+        images = sorted((f for f in self.cache_dir.iterdir()
+                         if f.is_file() and f.suffix not in ('.json', '.tmp') and f != keep),
+                        key=lambda f: f.stat().st_mtime)
+        for image in images:
+            if self._total <= self.max_bytes:
+                break
+            for f in (image, image.with_suffix('.json')):
+                try:
+                    size = f.stat().st_size
+                    f.unlink()
+                    self._total -= size
+                except OSError:
+                    pass
+
+    def _write_meta(self, url: str, meta: dict) -> None:
+        meta_path = self._meta_path(url)
+        tmp = meta_path.with_suffix(f'.{threading.get_ident()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        # Metadata files are counted in the cache size too / 元数据文件也计入缓存大小
+        size = tmp.stat().st_size
+        try:
+            size -= meta_path.stat().st_size
+        except OSError:
+            pass
+        os.replace(tmp, meta_path)
+        with self._lock:
+            self._total += size
+
+    def prefetch(self, urls: Iterable[str], max_workers: int = 8) -> Dict[str, Optional[str]]:
+        """
+        Download many images in parallel ahead of time.
+        提前并行下载多张图片。
+
+        Args / 参数:
+            urls: Image URLs / 图片URL
+            max_workers: Number of parallel downloads / 并行下载数
+
+        Returns / 返回:
+            Dictionary mapping each URL to its cached path, or None if it failed / 每个URL到其缓存路径的字典，失败时为None
+        """
+        def fetch_or_none(url):
+            try:
+                return self.fetch(url)
+            except (OSError, ValueError):
+                return None
+
+        unique = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='windows11toast-prefetch') as executor:
+            return dict(zip(unique, executor.map(fetch_or_none, unique)))
+
+
+# Active remote cache used by notify(), None when disabled / notify()使用的远程缓存，禁用时为None
+_remote_cache: Optional[RemoteImageCache] = None
+_remote_blocking = True
+_background = None
+
+
+def enable_remote_images(cache_dir: Optional[Union[str, Path]] = None, max_image_bytes: int = 3 * 1024 * 1024,
+                         max_age: float = 300.0, timeout: float = 10.0, blocking: bool = True,
+                         max_bytes: int = 64 * 1024 * 1024) -> RemoteImageCache:
+    """
+    Make notify() show http(s) image_src/icon_src from a local cache instead of letting the shell fetch them.
+    使notify()从本地缓存显示http(s)的image_src/icon_src，而不是由系统外壳获取。
+
+    Args / 参数:
+        cache_dir: Cache directory (default %LOCALAPPDATA%/windows11toast/remote) / 缓存目录（默认%LOCALAPPDATA%/windows11toast/remote）
+        max_image_bytes: Maximum size of a single image / 单张图片的最大大小
+        max_age: Seconds an entry is used without revalidation / 条目无需重新验证即可使用的秒数
+        timeout: Network timeout in seconds / 网络超时（秒）
+        blocking: Download on a cache miss before showing. If False, the URL is passed through and downloaded in the background for later toasts / 缓存未命中时先下载再显示。为False时直接传递URL，并在后台下载供之后的通知使用
+        max_bytes: Maximum total size of cached files / 缓存文件的最大总大小
+
+    Returns / 返回:
+        The active RemoteImageCache / 活动的RemoteImageCache
+
+    Example / 示例:
+        cache = enable_remote_images()
+        cache.prefetch(['https://example.com/a.png', 'https://example.com/b.png'])
+        notify('Hello', image_src='https://example.com/a.png')  # Uses the cached file / 使用缓存文件
+    """
+    global _remote_cache, _remote_blocking
+    _remote_cache = RemoteImageCache(cache_dir, max_image_bytes, max_age, timeout, max_bytes)
+    _remote_blocking = blocking
+    return _remote_cache
+
+
+def disable_remote_images() -> None:
+    """Let the shell fetch remote images again / 恢复由系统外壳获取远程图片"""
+    global _remote_cache
+    _remote_cache = None
+
+
+def localize_image(src: str) -> str:
+    """
+    Return a cached local file for an http(s) src, or src unchanged.
+    为http(s)的src返回本地缓存文件，否则原样返回src。
+    """
+    global _background
+    cache = _remote_cache
+    if cache is None or not src.startswith(('http://', 'https://')):
+        return src
+    if not _remote_blocking and cache.cached_path(src, fresh_only=True) is None:
+        # Download or revalidate in the background, show what we have now / 在后台下载或重新验证，先显示现有内容
+        if _background is None:
+            _background = ThreadPoolExecutor(max_workers=4, thread_name_prefix='windows11toast-fetch')
+        _background.submit(cache.fetch, src)
+        return cache.cached_path(src) or src
+    try:
+        return cache.fetch(src)
+    except (OSError, ValueError):
+        # Let the shell try the URL itself / 由系统外壳自行尝试该URL
+        return src
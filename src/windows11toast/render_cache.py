@@ -0,0 +1,109 @@
+"""Memoized toast payload rendering / 通知负载渲染的记忆化缓存"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Hashable
+
+
+class RenderCache:
+    """
+    Bounded LRU of rendered toast XML keyed by everything that affects the payload.
+    按影响负载的全部内容作为键的有界LRU渲染XML缓存。
+
+    Tag, group and app_id are not part of the key, so toasts that differ only in those reuse the
+    same rendered XML and skip the XML builder entirely.
+    键中不包含tag、group和app_id，因此仅在这些方面不同的通知会复用相同的渲染XML，完全跳过XML构建。
+
+    Args / 参数:
+        max_entries: Maximum number of cached payloads / 最多缓存的负载数量
+    """
+
+    def __init__(self, max_entries: int = 256):
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached XML for key, or None / 返回键对应的缓存XML，不存在时返回None"""
+        with self._lock:
+            xml = self._entries.get(key)
+            if xml is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return xml
+
+    def put(self, key: Hashable, xml: str) -> None:
+        """Store the rendered XML for key / 存储键对应的渲染XML"""
+        with self._lock:
+            self._entries[key] = xml
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return cache statistics.
+        返回缓存统计信息。
+
+        Returns / 返回:
+            {'hits', 'misses', 'hit_rate', 'size', 'max_entries'}
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+    def clear(self) -> None:
+        """Remove every cached payload and reset the counters / 移除所有缓存负载并重置计数器"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Active render cache used by notify(), None when disabled / notify()使用的活动渲染缓存，禁用时为None
+_render_cache: Optional[RenderCache] = None
+
+
+def enable_render_cache(max_entries: int = 256) -> RenderCache:
+    """
+    Cache rendered toast XML so repeated content skips the XML builder.
+    缓存渲染后的通知XML，使重复内容跳过XML构建。
+
+    Args / 参数:
+        max_entries: Maximum number of cached payloads / 最多缓存的负载数量
+
+    Returns / 返回:
+        The active RenderCache / 活动的RenderCache
+
+    Example / 示例:
+        cache = enable_render_cache(max_entries=64)
+        for worker in workers:
+            notify('Heartbeat', 'Still running', tag=worker.name)
+        print(cache.stats())  # {'hits': 9, 'misses': 1, ...}
+    """
+    global _render_cache
+    _render_cache = RenderCache(max_entries)
+    return _render_cache
+
+
+def disable_render_cache() -> None:
+    """Stop caching rendered toast XML / 停止缓存渲染后的通知XML"""
+    global _render_cache
+    _render_cache = None
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """Return the active RenderCache, or None if disabled / 返回活动的RenderCache，禁用时返回None"""
+    return _render_cache
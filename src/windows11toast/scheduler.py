@@ -0,0 +1,159 @@
+"""Local timer for delayed and scheduled notifications / 延迟和定时通知的本地计时器"""
+
+import atexit
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Optional, Callable, Dict, Any, Tuple
+
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Heap entry fields / 堆条目字段
+_DUE, _SEQ, _FUNC, _ARGS, _KEY = range(5)
+
+
+class ToastScheduler:
+    """
+    Run callbacks at a given wall-clock time from a single background thread.
+    在单个后台线程中按指定的墙上时钟时间执行回调。
+
+    Pending callbacks live in one heap ordered by due time, so queuing tens of thousands of
+    entries costs one thread and O(log n) per entry. Cancelled entries are removed lazily.
+    待执行的回调保存在按到期时间排序的堆中，因此排队数万个条目只需一个线程，每个条目O(log n)。被取消的条目延迟删除。
+
+    The thread is a daemon thread and entries live only in memory: toasts still pending when the
+    process exits are never shown (a warning with the number of dropped entries is logged). Toasts that
+    must outlive the process are scheduled with Windows by notify(deliver_at=...), which only falls back
+    to this scheduler for progress toasts and when Windows refuses the schedule.
+    该线程是守护线程，条目仅保存在内存中：进程退出时仍待执行的通知永远不会显示（会记录包含被丢弃条目数量的警告）。
+    必须在进程退出后仍显示的通知由notify(deliver_at=...)交给Windows定时，仅进度通知和Windows拒绝定时的通知才回退到此调度器。
+    """
+
+    def __init__(self, name: str = 'windows11toast-scheduler'):
+        self._name = name
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        # (tag, group, app_id) -> {seq: entry}
+        self._by_key: Dict[Tuple[Optional[str], Optional[str], Optional[str]], Dict[int, list]] = {}
+        self._cancelled = set()
+
+    def call_at(self, due: float, func: Callable, *args: Any,
+                tag: Optional[str] = None, group: Optional[str] = None, app_id: Optional[str] = None) -> int:
+        """
+        Schedule func(*args) to run at the given time.
+        安排func(*args)在指定时间执行。
+
+        Args / 参数:
+            due: Due time as returned by time.time() / 到期时间（time.time()格式）
+            func: Callback / 回调函数
+            tag: Tag used for cancellation (optional) / 用于取消的标签（可选）
+            group: Group used for cancellation (optional) / 用于取消的组（可选）
+            app_id: Application ID used for cancellation (optional) / 用于取消的应用程序ID（可选）
+
+        Returns / 返回:
+            Entry ID / 条目ID
+        """
+        key = (tag, group, app_id)
+        with self._condition:
+            seq = next(self._counter)
+            entry = [due, seq, func, args, key]
+            heapq.heappush(self._heap, entry)
+            if tag is not None:
+                self._by_key.setdefault(key, {})[seq] = entry
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            # Only wake the thread when the earliest entry changed / 仅在最早条目变化时唤醒线程
+            if self._heap[0] is entry:
+                self._condition.notify()
+        return seq
+
+    def call_later(self, delay: float, func: Callable, *args: Any, **kwargs: Any) -> int:
+        """Schedule func(*args) to run after delay seconds / 安排func(*args)在delay秒后执行"""
+        return self.call_at(time.time() + delay, func, *args, **kwargs)
+
+    def cancel(self, tag: str, group: Optional[str] = None, app_id: Optional[str] = None) -> int:
+        """
+        Cancel pending entries by tag.
+        按标签取消待执行的条目。
+
+        Args / 参数:
+            tag: Notification tag / 通知标签
+            group: Only cancel entries in this group (optional) / 仅取消此组中的条目（可选）
+            app_id: Only cancel entries for this application ID (optional) / 仅取消此应用程序ID的条目（可选）
+
+        Returns / 返回:
+            Number of cancelled entries / 取消的条目数
+        """
+        count = 0
+        with self._condition:
+            for key in list(self._by_key):
+                if key[0] != tag or (group is not None and key[1] != group) or (app_id is not None and key[2] != app_id):
+                    continue
+                entries = self._by_key.pop(key)
+                self._cancelled.update(entries)
+                count += len(entries)
+        return count
+
+    def pending(self) -> int:
+        """Return the number of pending entries / 返回待执行条目数"""
+        with self._condition:
+            return len(self._heap) - len(self._cancelled)
+
+    def in_scheduler_thread(self) -> bool:
+        """Return True when called from a scheduler callback / 在调度器回调中调用时返回True"""
+        return threading.current_thread() is self._thread
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0][_SEQ] in self._cancelled:
+                        self._cancelled.discard(heapq.heappop(self._heap)[_SEQ])
+                    if self._heap and self._heap[0][_DUE] <= time.time():
+                        break
+                    timeout = self._heap[0][_DUE] - time.time() if self._heap else None
+                    self._condition.wait(timeout)
+                entry = heapq.heappop(self._heap)
+                entries = self._by_key.get(entry[_KEY])
+                if entries is not None:
+                    entries.pop(entry[_SEQ], None)
+                    if not entries:
+                        del self._by_key[entry[_KEY]]
+            try:
+                entry[_FUNC](*entry[_ARGS])
+            except Exception as e:
+                # A failing callback must not stop the scheduler / 单个回调失败不能中断调度器
+                logger.exception('scheduled callback %r failed', entry[_FUNC])
+                app_id = entry[_KEY][2]
+                metrics = get_metrics()
+                if metrics is not None and app_id is not None:
+                    metrics.record_failed(app_id, type(e).__name__)
+
+
+# Shared scheduler, created on first use / 共享调度器，首次使用时创建
+_scheduler: Optional[ToastScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> ToastScheduler:
+    """Return the shared ToastScheduler / 返回共享的ToastScheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ToastScheduler()
+    return _scheduler
+
+
+@atexit.register
+def _warn_pending() -> None:
+    pending = _scheduler.pending() if _scheduler is not None else 0
+    if pending:
+        logger.warning('%d scheduled callback(s), such as delayed toasts, were dropped at exit', pending)
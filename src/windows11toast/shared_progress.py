@@ -0,0 +1,276 @@
+"""Shared-memory progress state so any process can update a tagged progress toast / 共享内存进度状态，使任意进程都能更新带标签的进度通知"""
+
+import json
+import struct
+import threading
+import time
+from enum import Enum
+from multiprocessing import shared_memory
+from typing import Optional, Dict, Tuple, Any
+
+# Store header: magic, version, slots, record size / 存储头：魔数、版本、槽数、记录大小
+_STORE_HEADER = struct.Struct('<4sHHI')
+_MAGIC = b'W11P'
+_VERSION = 1
+# Record header: sequence number, last write time, tag, payload length / 记录头：序列号、最后写入时间、标签、负载长度
+_RECORD_HEADER = struct.Struct('<Id128sH')
+_MAX_TAG_BYTES = 128
+
+DEFAULT_NAME = 'windows11toast-progress'
+
+_INFINITE = 0xFFFFFFFF
+_WAIT_ABANDONED = 0x80
+
+
+class _NamedMutex:
+    """Windows named mutex shared by every process using the same store / 使用同一存储的所有进程共享的Windows命名互斥体"""
+
+    def __init__(self, name: str):
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateMutexW.argtypes = (wintypes.LPVOID, wintypes.BOOL, wintypes.LPCWSTR)
+        kernel32.CreateMutexW.restype = wintypes.HANDLE
+        kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.ReleaseMutex.argtypes = (wintypes.HANDLE,)
+        kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+        self._kernel32 = kernel32
+        self._handle = kernel32.CreateMutexW(None, False, 'Local\\' + name)
+        if not self._handle:
+            raise OSError(ctypes.get_last_error(), f"CreateMutexW failed for '{name}'")
+
+    def __enter__(self):
+        result = self._kernel32.WaitForSingleObject(self._handle, _INFINITE)
+        # An abandoned mutex is still acquired / 被遗弃的互斥体仍然已获取
+        if result not in (0, _WAIT_ABANDONED):
+            raise OSError(f'WaitForSingleObject failed ({result:#x})')
+        return self
+
+    def __exit__(self, *exc_info):
+        self._kernel32.ReleaseMutex(self._handle)
+
+    def close(self) -> None:
+        if self._handle:
+            self._kernel32.CloseHandle(self._handle)
+            self._handle = None
+
+
+def _plain(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Info as stored, with enums replaced by their values / 存储形式的信息，枚举替换为其值"""
+    return {key: value.value if isinstance(value, Enum) else value for key, value in info.items()}
+
+
+def _encode(info: Dict[str, Any]) -> bytes:
+    return json.dumps(_plain(info), separators=(',', ':')).encode('utf-8')
+
+
+class SharedProgressStore:
+    """
+    Progress notification state in fixed-size shared-memory records.
+    保存在固定大小共享内存记录中的进度通知状态。
+
+    Each record holds a tag, the cached notification info and its update sequence number. Reads and
+    writes take a named mutex, so sequence numbers increase atomically across processes. When every
+    slot is in use, the least recently written record is reused.
+    每条记录保存标签、缓存的通知信息及其更新序列号。读写都会获取命名互斥体，因此序列号在进程间原子递增。
+    所有槽位都被占用时，复用最久未写入的记录。
+
+    Each process remembers its own view of each record, as last published, updated or read, so
+    publish() only writes the fields this process changed and keeps changes made by other processes.
+    每个进程记住自己对每条记录的视图（最后发布、更新或读取的内容），因此publish()只写入此进程更改的字段，保留其他进程的更改。
+
+    Args / 参数:
+        name: Shared memory name, the same in every process / 共享内存名称，所有进程中相同
+        slots: Number of records, used when creating the store / 记录数量，创建存储时使用
+        record_size: Bytes per record, used when creating the store / 每条记录的字节数，创建存储时使用
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = 64, record_size: int = 2048):
+        if slots < 1:
+            raise ValueError('slots must be at least 1')
+        if record_size <= _RECORD_HEADER.size:
+            raise ValueError(f'record_size must be greater than {_RECORD_HEADER.size}')
+        self.name = name
+        self._mutex = _NamedMutex(name)
+        self._lock = threading.Lock()
+        # tag -> this process's view of the record / 标签 -> 此进程对该记录的视图
+        self._known: Dict[str, Dict[str, Any]] = {}
+        with self._mutex:
+            try:
+                self._memory = shared_memory.SharedMemory(name)
+            except FileNotFoundError:
+                self._memory = shared_memory.SharedMemory(name, create=True,
+                                                          size=_STORE_HEADER.size + slots * record_size)
+                _STORE_HEADER.pack_into(self._memory.buf, 0, _MAGIC, _VERSION, slots, record_size)
+            magic, version, self.slots, self.record_size = _STORE_HEADER.unpack_from(self._memory.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._memory.close()
+            raise ValueError(f"shared memory '{name}' is not a progress store")
+
+    def _offset(self, slot: int) -> int:
+        return _STORE_HEADER.size + slot * self.record_size
+
+    def _find(self, tag: bytes) -> Tuple[Optional[int], int]:
+        """Return (slot holding tag or None, slot to reuse) / 返回(保存该标签的槽位或None, 可复用的槽位)"""
+        buf = self._memory.buf
+        free = None
+        oldest, oldest_time = 0, None
+        for slot in range(self.slots):
+            _, written, record_tag, _ = _RECORD_HEADER.unpack_from(buf, self._offset(slot))
+            record_tag = record_tag.rstrip(b'\0')
+            if record_tag == tag:
+                return slot, slot
+            if not record_tag:
+                if free is None:
+                    free = slot
+            elif oldest_time is None or written < oldest_time:
+                oldest, oldest_time = slot, written
+        return None, free if free is not None else oldest
+
+    def _read(self, slot: int) -> Tuple[Dict[str, Any], int]:
+        offset = self._offset(slot)
+        sequence, _, _, length = _RECORD_HEADER.unpack_from(self._memory.buf, offset)
+        start = offset + _RECORD_HEADER.size
+        return json.loads(bytes(self._memory.buf[start:start + length])), sequence
+
+    def _write(self, slot: int, tag: bytes, payload: bytes, sequence: int) -> None:
+        offset = self._offset(slot)
+        start = offset + _RECORD_HEADER.size
+        self._memory.buf[start:start + len(payload)] = payload
+        _RECORD_HEADER.pack_into(self._memory.buf, offset, sequence, time.time(), tag, len(payload))
+
+    def _tag(self, tag: str) -> bytes:
+        encoded = tag.encode('utf-8')
+        if len(encoded) > _MAX_TAG_BYTES:
+            raise ValueError(f'tag is longer than {_MAX_TAG_BYTES} bytes')
+        return encoded
+
+    def _payload(self, info: Dict[str, Any]) -> bytes:
+        payload = _encode(info)
+        if len(payload) > self.record_size - _RECORD_HEADER.size:
+            raise ValueError(f'progress info is {len(payload)} bytes, the record holds '
+                             f'{self.record_size - _RECORD_HEADER.size}')
+        return payload
+
+    def publish(self, tag: str, info: Dict[str, Any]) -> int:
+        """
+        Store the info of a shown progress toast, keeping its sequence number if already stored.
+        保存已显示进度通知的信息，如果已存在则保留其序列号。
+
+        When the tag is already stored, only the fields that differ from this process's view of the
+        record are replaced, so a concurrent update() from another process is not overwritten.
+        标签已存在时，仅替换与此进程对该记录的视图不同的字段，因此不会覆盖其他进程并发的update()。
+
+        Returns / 返回:
+            The sequence number to show the toast with / 显示通知时使用的序列号
+        """
+        encoded_tag, info = self._tag(tag), _plain(info)
+        self._payload(info)
+        with self._lock, self._mutex:
+            slot, reuse = self._find(encoded_tag)
+            if slot is None:
+                stored, sequence = info, 1
+            else:
+                stored, sequence = self._read(slot)
+                known = self._known.get(tag, {})
+                stored.update((key, value) for key, value in info.items() if key not in known or known[key] != value)
+            self._write(reuse, encoded_tag, self._payload(stored), sequence)
+            self._known[tag] = dict(info)
+        return sequence
+
+    def update(self, tag: str, changes: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Apply changes to a stored record and increment its sequence number atomically.
+        将更改应用到已保存的记录，并原子地递增其序列号。
+
+        Returns / 返回:
+            (info, sequence number), or None if the tag is not stored / (信息, 序列号)，标签不存在时返回None
+        """
+        encoded_tag = self._tag(tag)
+        with self._lock, self._mutex:
+            slot, _ = self._find(encoded_tag)
+            if slot is None:
+                return None
+            info, sequence = self._read(slot)
+            info.update(_plain(changes))
+            sequence += 1
+            self._write(slot, encoded_tag, self._payload(info), sequence)
+            self._known[tag] = dict(info)
+        return info, sequence
+
+    def get(self, tag: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Return (info, sequence number), or None if the tag is not stored / 返回(信息, 序列号)，标签不存在时返回None"""
+        encoded_tag = self._tag(tag)
+        with self._lock, self._mutex:
+            slot, _ = self._find(encoded_tag)
+            if slot is None:
+                return None
+            info, sequence = self._read(slot)
+            self._known[tag] = dict(info)
+        return info, sequence
+
+    def remove(self, tag: str) -> None:
+        """Remove the record for a tag / 移除标签对应的记录"""
+        encoded_tag = self._tag(tag)
+        with self._lock, self._mutex:
+            slot, _ = self._find(encoded_tag)
+            if slot is not None:
+                _RECORD_HEADER.pack_into(self._memory.buf, self._offset(slot), 0, 0.0, b'', 0)
+            self._known.pop(tag, None)
+
+    def close(self) -> None:
+        """Detach from the shared memory / 从共享内存分离"""
+        self._memory.close()
+        self._mutex.close()
+
+
+# Active shared store used by notify() and update_progress(), None when disabled /
+# notify()和update_progress()使用的活动共享存储，禁用时为None
+_shared_progress: Optional[SharedProgressStore] = None
+
+
+def enable_shared_progress(name: str = DEFAULT_NAME, slots: int = 64, record_size: int = 2048) -> SharedProgressStore:
+    """
+    Keep progress toast state in shared memory so other processes can update it.
+    将进度通知状态保存在共享内存中，使其他进程可以更新它。
+
+    Call it with the same name in every process, e.g. in the pool initializer. The first process
+    creates the store, the others attach to it; the memory lives as long as one process keeps it open.
+    在每个进程中使用相同名称调用，例如在进程池的初始化函数中。第一个进程创建存储，其他进程附加到它；
+    只要有一个进程保持打开，内存就一直存在。
+
+    Args / 参数:
+        name: Shared memory name / 共享内存名称
+        slots: Number of progress toasts tracked at once / 同时跟踪的进度通知数量
+        record_size: Bytes per record / 每条记录的字节数
+
+    Returns / 返回:
+        The active SharedProgressStore / 活动的SharedProgressStore
+
+    Example / 示例:
+        enable_shared_progress()
+        notify_progress('Encoding', tag='encode')
+        with ProcessPoolExecutor(initializer=enable_shared_progress) as pool:
+            # Workers call update_progress(value=..., tag='encode') / 工作进程调用update_progress(value=..., tag='encode')
+            pool.map(encode, chunks)
+    """
+    global _shared_progress
+    store = SharedProgressStore(name, slots, record_size)
+    if _shared_progress is not None:
+        _shared_progress.close()
+    _shared_progress = store
+    return store
+
+
+def disable_shared_progress() -> None:
+    """Stop using shared progress state in this process / 在此进程中停止使用共享进度状态"""
+    global _shared_progress
+    if _shared_progress is not None:
+        _shared_progress.close()
+    _shared_progress = None
+
+
+def get_shared_progress() -> Optional[SharedProgressStore]:
+    """Return the active SharedProgressStore, or None if disabled / 返回活动的SharedProgressStore，禁用时返回None"""
+    return _shared_progress
@@ -0,0 +1,311 @@
+"""Immutable, hashable notification specs / 不可变、可哈希的通知规格"""
+
+from typing import Optional, Tuple, Callable, Union, Iterable, Any, Dict
+
+from .enums import ImagePlacement, IconPlacement, IconCrop, AudioEvent, ToastDuration
+from .constants import DEFAULT_APP_ID
+
+
+def _rebuild(cls, values: Dict[str, Any]):
+    """Unpickle a spec / 反序列化规格"""
+    return cls(**values)
+
+
+def _enum(enum, value, name: str):
+    """Convert a string to an enum member once / 将字符串一次性转换为枚举成员"""
+    if value is None or isinstance(value, enum):
+        return value
+    try:
+        return enum(value)
+    except ValueError:
+        raise ValueError(f"invalid {name} '{value}', expected one of {[e.value for e in enum]}") from None
+
+
+class _Spec:
+    """Base of the frozen spec classes / 冻结规格类的基类"""
+
+    __slots__ = ('_hash',)
+    _fields: Tuple[str, ...] = ()
+
+    def _set(self, **values: Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_hash', None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable, use replace()')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            # Computed once, specs never change / 只计算一次，规格永不改变
+            object.__setattr__(self, '_hash', hash((type(self).__name__,) + self._values()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields
+                           if getattr(self, name) not in (None, (), False))
+        return f'{type(self).__name__}({fields})'
+
+    def __reduce__(self):
+        return _rebuild, (type(self), self.as_dict())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the fields as a dictionary / 以字典形式返回字段"""
+        return {name: getattr(self, name) for name in self._fields}
+
+    def replace(self, **changes: Any):
+        """
+        Return a copy with some fields changed.
+        返回修改了部分字段的副本。
+
+        Example / 示例:
+            urgent = spec.replace(duration=ToastDuration.URGENT)
+        """
+        values = self.as_dict()
+        values.update(changes)
+        return type(self)(**values)
+
+
+class ButtonSpec(_Spec):
+    """
+    A button in a toast.
+    通知中的按钮。
+
+    Args / 参数:
+        content: Button text / 按钮文本
+        arguments: Activation arguments (default 'http:' + content) / 激活参数（默认'http:' + content）
+        activation_type: 'protocol', 'foreground' or 'background' / 'protocol'、'foreground'或'background'
+        attributes: Other action attributes, e.g. {'imageUri': ...} / 其他action属性，例如{'imageUri': ...}
+    """
+
+    _fields = ('content', 'arguments', 'activation_type', 'attributes')
+    __slots__ = _fields
+
+    def __init__(self, content: str, arguments: Optional[str] = None, activation_type: str = 'protocol',
+                 attributes: Union[Dict[str, str], Iterable[Tuple[str, str]]] = ()):
+        if not isinstance(content, str):
+            raise TypeError(f'button content must be a string, got {type(content).__name__}')
+        if isinstance(attributes, dict):
+            attributes = attributes.items()
+        self._set(content=content, arguments=arguments, activation_type=activation_type,
+                  attributes=tuple(sorted(attributes)))
+
+    def to_xml(self) -> Dict[str, str]:
+        """Return the action attributes / 返回action元素的属性"""
+        attributes = {
+            'activationType': self.activation_type,
+            'arguments': self.arguments if self.arguments is not None else 'http:' + self.content,
+            'content': self.content
+        }
+        attributes.update(self.attributes)
+        return attributes
+
+
+class InputSpec(_Spec):
+    """
+    A text input in a toast.
+    通知中的文本输入框。
+
+    Args / 参数:
+        id: Input field ID / 输入字段ID
+        placeholder: Placeholder text (default the ID) / 占位符文本（默认为ID）
+    """
+
+    _fields = ('id', 'placeholder')
+    __slots__ = _fields
+
+    def __init__(self, id: str, placeholder: Optional[str] = None):
+        if not isinstance(id, str) or not id:
+            raise ValueError('input id must be a non-empty string')
+        self._set(id=id, placeholder=placeholder)
+
+    def to_xml(self) -> Dict[str, str]:
+        """Return the input attributes / 返回input元素的属性"""
+        return {'id': self.id, 'type': 'text', 'placeHolderContent': self.placeholder or self.id}
+
+
+class SelectionSpec(_Spec):
+    """
+    A drop-down selection in a toast.
+    通知中的下拉选择框。
+
+    Args / 参数:
+        id: Selection field ID / 选择字段ID
+        items: Selection options, as text or (id, content) pairs / 选择选项，文本或(id, content)对
+    """
+
+    _fields = ('id', 'items')
+    __slots__ = _fields
+
+    def __init__(self, id: str, items: Iterable[Union[str, Tuple[str, str], Dict[str, str]]]):
+        if not isinstance(id, str) or not id:
+            raise ValueError('selection id must be a non-empty string')
+        self._set(id=id, items=tuple(_selection_item(item) for item in items))
+
+    def to_xml(self) -> Dict[str, Any]:
+        """Return the selection input and items / 返回选择输入框及其选项"""
+        return {'input': {'id': self.id, 'type': 'selection'},
+                'selection': [item if isinstance(item, str) else {'id': item[0], 'content': item[1]}
+                              for item in self.items]}
+
+
+def _selection_item(item) -> Union[str, Tuple[str, str]]:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        # Legacy selection attributes / 旧版selection属性
+        return item['id'], item.get('content', item['id'])
+    if isinstance(item, tuple) and len(item) == 2 and all(isinstance(part, str) for part in item):
+        return item
+    raise TypeError('selection items must be strings or (id, content) pairs')
+
+
+def _button(button) -> ButtonSpec:
+    if isinstance(button, ButtonSpec):
+        return button
+    if isinstance(button, dict):
+        # Legacy action attributes / 旧版action属性
+        return ButtonSpec(button.get('content'), button.get('arguments'), button.get('activationType', 'protocol'),
+                          {name: value for name, value in button.items()
+                           if name not in ('content', 'arguments', 'activationType')})
+    return ButtonSpec(button)
+
+
+def _buttons(buttons) -> Tuple[ButtonSpec, ...]:
+    return tuple(_button(button) for button in buttons or ())
+
+
+def _inputs(inputs) -> Tuple[InputSpec, ...]:
+    return tuple(field if isinstance(field, InputSpec) else InputSpec(field) for field in inputs or ())
+
+
+def _selections(selections) -> Tuple[SelectionSpec, ...]:
+    result = []
+    for selection in selections or ():
+        if isinstance(selection, SelectionSpec):
+            result.append(selection)
+        elif isinstance(selection, (list, tuple)):
+            # A bare list of options uses the default ID / 仅有选项列表时使用默认ID
+            result.append(SelectionSpec('selection', selection))
+        else:
+            raise TypeError(f'selection must be a SelectionSpec or a list of strings, got {type(selection).__name__}')
+    return tuple(result)
+
+
+class ToastSpec(_Spec):
+    """
+    Everything that describes one toast, normalized and validated once.
+    描述一条通知的全部内容，只规范化和校验一次。
+
+    Specs are frozen and hashable, so they can be reused, stored cheaply and used as cache
+    keys. notify(), toast(), toast_async() and atoast() accept a spec in place of a title.
+    规格是冻结且可哈希的，因此可以复用、低成本存储并用作缓存键。notify()、toast()、
+    toast_async()和atoast()可接受规格代替标题。
+
+    Args / 参数:
+        title: Notification title text / 通知标题文本
+        body: Notification body text / 通知正文文本
+        on_click: Callback function or URL string / 回调函数或URL字符串
+        image_src: Image source URL/path / 图片源URL/路径
+        image_placement: Image placement (enum or its value) / 图片位置（枚举或其值）
+        icon_src: Icon source URL/path / 图标源URL/路径
+        icon_placement: Icon placement (enum or its value) / 图标位置（枚举或其值）
+        icon_hint_crop: Icon crop hint (enum or its value) / 图标裁剪提示（枚举或其值）
+        progress_title: Progress bar title / 进度条标题
+        progress_status: Progress status text / 进度状态文本
+        progress_value: Progress value (0.0 to 1.0) / 进度值（0.0到1.0）
+        progress_value_string_override: Custom progress string / 自定义进度字符串
+        audio: AudioEvent, URL or file path. None for silent / AudioEvent、URL或文件路径。None表示静音
+        audio_loop: Whether to loop the audio / 是否循环播放音频
+        dialogue: Text to speak / 要朗读的文本
+        duration: Toast duration (enum or its value) / 通知持续时间（枚举或其值）
+        inputs: InputSpec objects or input IDs / InputSpec对象或输入ID
+        selections: SelectionSpec objects or lists of options / SelectionSpec对象或选项列表
+        buttons: ButtonSpec objects or button texts / ButtonSpec对象或按钮文本
+        xml: Custom XML template / 自定义XML模板
+        app_id: Application ID / 应用程序ID
+        tag: Notification tag / 通知标签
+        group: Notification group / 通知组
+
+    Raises / 异常:
+        ValueError: If an enum value or nested spec is invalid / 如果枚举值或嵌套规格无效
+        TypeError: If a field has the wrong type / 如果字段类型错误
+
+    Example / 示例:
+        spec = ToastSpec('Build finished', 'All tests passed',
+                         buttons=['Open', ButtonSpec('Dismiss', activation_type='background')],
+                         selections=[SelectionSpec('reply', ['Thanks', 'Later'])])
+        notify(spec)
+        notify(spec, tag='build-42')
+    """
+
+    _fields = (
+        'title', 'body', 'on_click',
+        'image_src', 'image_placement',
+        'icon_src', 'icon_placement', 'icon_hint_crop',
+        'progress_title', 'progress_status', 'progress_value', 'progress_value_string_override',
+        'audio', 'audio_loop', 'dialogue', 'duration',
+        'inputs', 'selections', 'buttons',
+        'xml', 'app_id', 'tag', 'group',
+    )
+    __slots__ = _fields
+
+    def __init__(self, title: Optional[str] = None, body: Optional[str] = None,
+                 on_click: Optional[Union[Callable, str]] = None, *,
+                 image_src: Optional[str] = None,
+                 image_placement: Optional[Union[ImagePlacement, str]] = None,
+                 icon_src: Optional[str] = None,
+                 icon_placement: Optional[Union[IconPlacement, str]] = None,
+                 icon_hint_crop: Optional[Union[IconCrop, str]] = None,
+                 progress_title: Optional[str] = None,
+                 progress_status: Optional[str] = None,
+                 progress_value: Optional[float] = None,
+                 progress_value_string_override: Optional[str] = None,
+                 audio: Optional[Union[str, AudioEvent]] = None,
+                 audio_loop: bool = False,
+                 dialogue: Optional[str] = None,
+                 duration: Optional[Union[ToastDuration, str]] = None,
+                 inputs: Iterable[Union[InputSpec, str]] = (),
+                 selections: Iterable[Union[SelectionSpec, Iterable[str]]] = (),
+                 buttons: Iterable[Union[ButtonSpec, str]] = (),
+                 xml: Optional[str] = None,
+                 app_id: str = DEFAULT_APP_ID,
+                 tag: Optional[str] = None,
+                 group: Optional[str] = None):
+        if isinstance(inputs, (str, InputSpec)):
+            inputs = (inputs,)
+        if isinstance(buttons, (str, ButtonSpec)):
+            buttons = (buttons,)
+        if isinstance(selections, SelectionSpec):
+            selections = (selections,)
+        self._set(
+            title=title, body=body, on_click=on_click,
+            image_src=image_src,
+            image_placement=_enum(ImagePlacement, image_placement, 'image_placement'),
+            icon_src=icon_src,
+            icon_placement=_enum(IconPlacement, icon_placement, 'icon_placement'),
+            icon_hint_crop=_enum(IconCrop, icon_hint_crop, 'icon_hint_crop'),
+            progress_title=progress_title, progress_status=progress_status,
+            progress_value=float(progress_value) if progress_value is not None else None,
+            progress_value_string_override=progress_value_string_override,
+            audio=audio, audio_loop=bool(audio_loop), dialogue=dialogue,
+            duration=_enum(ToastDuration, duration, 'duration'),
+            inputs=_inputs(inputs), selections=_selections(selections), buttons=_buttons(buttons),
+            xml=xml, app_id=app_id, tag=tag, group=group
+        )
+
+    @property
+    def has_progress(self) -> bool:
+        """Whether the toast has a progress bar / 通知是否带有进度条"""
+        return self.progress_value is not None or self.progress_title is not None or self.progress_status is not None
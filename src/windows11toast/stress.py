@@ -0,0 +1,384 @@
+"""Multi-threaded load generator and stress harness / 多线程负载生成器与压力测试工具
+
+Runs against an in-memory stand-in for WinRT by default, so it works on any machine /
+默认针对WinRT的内存替身运行，因此可在任意机器上运行:
+    python -m windows11toast.stress --workers 8 --duration 10 --mix plain=70,progress=20,interactive=10
+    python -m windows11toast.stress --mode asyncio --workers 200 --enable render_cache,metrics
+
+Reports throughput, latency percentiles per operation, lock contention and memory growth over time.
+报告吞吐量、各操作的延迟百分位数、锁竞争情况以及内存随时间的增长。
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Optional, Dict, List, Tuple, Any
+
+# Operation kinds / 操作类型
+KIND_PLAIN = 'plain'
+KIND_PROGRESS = 'progress'
+KIND_INTERACTIVE = 'interactive'
+_KINDS = (KIND_PLAIN, KIND_PROGRESS, KIND_INTERACTIVE)
+
+# Optional features that can be enabled / 可启用的可选功能
+_FEATURES = ('render_cache', 'metrics', 'dedup', 'validation', 'timing')
+
+
+class ContendedLock:
+    """
+    Lock wrapper that counts acquisitions that had to wait and the time spent waiting.
+    统计需要等待的获取次数及等待时间的锁包装器。
+    """
+
+    def __init__(self, name: str, lock: Any):
+        self.name = name
+        self._lock = lock
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        acquired = self._lock.acquire(True, timeout)
+        if acquired:
+            # Counters are updated while holding the lock / 持有锁时更新计数器
+            self.acquisitions += 1
+            self.contended += 1
+            self.wait_time += time.perf_counter() - start
+        return acquired
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info) -> None:
+        self._lock.release()
+
+
+def instrument_locks(shell: Any = None) -> List[ContendedLock]:
+    """
+    Replace the locks of the active caches, limiters and registries with ContendedLock.
+    将活动缓存、限流器和注册表的锁替换为ContendedLock。
+
+    Returns / 返回:
+        The installed wrappers / 已安装的包装器
+    """
+    from . import instrumentation
+    from .render_cache import get_render_cache
+    from .templates import get_template_cache
+    from .dedup import get_deduplicator
+    from .ratelimit import get_rate_limiter
+    from .metrics import get_metrics
+
+    wrappers = []
+    owners = [('render_cache', get_render_cache()), ('template_cache', get_template_cache()),
+              ('dedup', get_deduplicator()), ('rate_limiter', get_rate_limiter()),
+              ('metrics', get_metrics()), ('shell', shell)]
+    for name, owner in owners:
+        if owner is not None and not isinstance(owner._lock, ContendedLock):
+            owner._lock = ContendedLock(name, owner._lock)
+            wrappers.append(owner._lock)
+    if not isinstance(instrumentation._lock, ContendedLock):
+        instrumentation._lock = ContendedLock('timing', instrumentation._lock)
+        wrappers.append(instrumentation._lock)
+    return wrappers
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse 'plain=70,progress=20,interactive=10' into normalized weights.
+    将'plain=70,progress=20,interactive=10'解析为归一化的权重。
+
+    Raises / 异常:
+        ValueError: If a kind is unknown or the weights are not positive / 如果类型未知或权重不为正
+    """
+    weights = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in _KINDS:
+            raise ValueError(f"unknown kind '{kind}', expected one of {list(_KINDS)}")
+        weights[kind] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError('mix weights must be positive')
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+class _Worker:
+    """Per-worker state; latencies are kept per worker so the harness adds no locking / 每个工作者的状态；延迟按工作者保存，因此测试工具不引入额外锁"""
+
+    def __init__(self, index: int, mix: Dict[str, float], seed: int):
+        self.index = index
+        self.random = random.Random(seed + index)
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.latencies: Dict[str, List[float]] = {kind: [] for kind in _KINDS}
+        self.errors = 0
+        self.ops = 0
+        self.tag = f'stress-{index}'
+        self.progress_step = 0
+
+    def next_kind(self) -> str:
+        return self.random.choices(self.kinds, self.weights)[0]
+
+    def progress_args(self) -> Tuple[bool, float]:
+        """Return (create, value); a new bar every 100 updates / 返回(是否创建, 进度值)；每100次更新新建一个进度条"""
+        step = self.progress_step % 100
+        self.progress_step += 1
+        return step == 0, step / 100
+
+
+def _run_thread(worker: _Worker, deadline: float, count: Optional[int]) -> None:
+    from .notification import notify, toast
+    from .progress import notify_progress, update_progress
+
+    while (count is None or worker.ops < count) and time.monotonic() < deadline:
+        kind = worker.next_kind()
+        start = time.perf_counter()
+        try:
+            if kind == KIND_PLAIN:
+                notify(f'Worker {worker.index}', f'Message {worker.ops}')
+            elif kind == KIND_PROGRESS:
+                create, value = worker.progress_args()
+                if create:
+                    notify_progress('Stress', 'Running', value, tag=worker.tag)
+                else:
+                    update_progress(value, tag=worker.tag)
+            else:
+                toast(f'Worker {worker.index}', 'Reply?', buttons=['OK', 'Cancel'], input_id='reply',
+                      on_dismissed=_ignore, on_failed=_ignore)
+        except Exception:
+            worker.errors += 1
+        worker.latencies[kind].append(time.perf_counter() - start)
+        worker.ops += 1
+
+
+async def _run_coroutine(worker: _Worker, deadline: float, count: Optional[int]) -> None:
+    from .notification import notify_async, toast_async
+    from .progress import notify_progress, update_progress_async
+    from .executor import run_blocking
+
+    while (count is None or worker.ops < count) and time.monotonic() < deadline:
+        kind = worker.next_kind()
+        start = time.perf_counter()
+        try:
+            if kind == KIND_PLAIN:
+                await notify_async(f'Worker {worker.index}', f'Message {worker.ops}')
+            elif kind == KIND_PROGRESS:
+                create, value = worker.progress_args()
+                if create:
+                    await run_blocking(notify_progress, 'Stress', 'Running', value, tag=worker.tag)
+                else:
+                    await update_progress_async(value, tag=worker.tag)
+            else:
+                await toast_async(f'Worker {worker.index}', 'Reply?', buttons=['OK', 'Cancel'], input_id='reply',
+                                  on_dismissed=_ignore, on_failed=_ignore)
+        except Exception:
+            worker.errors += 1
+        worker.latencies[kind].append(time.perf_counter() - start)
+        worker.ops += 1
+
+
+def _ignore(*args: Any) -> None:
+    pass
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _sample(workers: List[_Worker], start: float, trace_memory: bool) -> Dict[str, float]:
+    from .notification import _notification_cache
+    sample = {'elapsed': time.monotonic() - start, 'ops': sum(worker.ops for worker in workers),
+              'cached_tags': len(_notification_cache)}
+    if trace_memory:
+        sample['memory'] = tracemalloc.get_traced_memory()[0]
+    return sample
+
+
+def run(workers: int = 4, duration: float = 5.0, count: Optional[int] = None, mode: str = 'threads',
+        mix: Optional[Dict[str, float]] = None, features: Tuple[str, ...] = (), show_latency: float = 0.0,
+        dismiss_after: Optional[float] = 0.0, report_interval: float = 1.0, trace_memory: bool = False,
+        in_memory: bool = True, seed: int = 0, out=sys.stdout) -> Dict[str, Any]:
+    """
+    Drive notify(), update_progress() and toast()/toast_async() from many workers and report the results.
+    从多个工作者驱动notify()、update_progress()和toast()/toast_async()并报告结果。
+
+    Args / 参数:
+        workers: Number of threads or coroutines / 线程或协程数量
+        duration: Seconds to run / 运行秒数
+        count: Operations per worker; stops earlier than duration when reached / 每个工作者的操作数；达到后提前停止
+        mode: 'threads' or 'asyncio' / 'threads'或'asyncio'
+        mix: Weights of 'plain', 'progress' and 'interactive' operations / 'plain'、'progress'和'interactive'操作的权重
+        features: Optional features to enable: render_cache, metrics, dedup, validation, timing /
+            要启用的可选功能：render_cache、metrics、dedup、validation、timing
+        show_latency: Seconds each simulated show() blocks / 每次模拟show()阻塞的秒数
+        dismiss_after: Seconds before interactive toasts are dismissed / 交互式通知被关闭前的秒数
+        report_interval: Seconds between progress lines / 进度行的间隔秒数
+        trace_memory: Track allocated memory with tracemalloc (slower) / 使用tracemalloc跟踪已分配内存（较慢）
+        in_memory: Use the in-memory WinRT stand-in / 使用内存WinRT替身
+        seed: Random seed of the operation mix / 操作组合的随机种子
+        out: Stream for the report / 报告输出流
+
+    Returns / 返回:
+        {'ops', 'errors', 'elapsed', 'throughput', 'latency', 'locks', 'samples'}
+    """
+    if mode not in ('threads', 'asyncio'):
+        raise ValueError(f"mode must be 'threads' or 'asyncio', got '{mode}'")
+    unknown = set(features) - set(_FEATURES)
+    if unknown:
+        raise ValueError(f'unknown features {sorted(unknown)}, expected some of {list(_FEATURES)}')
+    shell = None
+    if in_memory:
+        from .memory_winrt import install
+        shell = install(show_latency, dismiss_after)
+    from .render_cache import enable_render_cache
+    from .metrics import enable_metrics
+    from .dedup import enable_dedup
+    from .validation import enable_validation
+    from .instrumentation import enable_timing_buffer
+    enablers = {'render_cache': enable_render_cache, 'metrics': enable_metrics, 'dedup': enable_dedup,
+                'validation': enable_validation, 'timing': enable_timing_buffer}
+    for feature in features:
+        enablers[feature]()
+    locks = instrument_locks(shell)
+
+    mix = mix or parse_mix('plain=70,progress=20,interactive=10')
+    pool = [_Worker(index, mix, seed) for index in range(workers)]
+    if trace_memory:
+        tracemalloc.start()
+    start = time.monotonic()
+    deadline = start + duration
+    samples = [_sample(pool, start, trace_memory)]
+    stop = threading.Event()
+
+    def report() -> None:
+        while not stop.wait(report_interval):
+            sample = _sample(pool, start, trace_memory)
+            previous = samples[-1]
+            rate = (sample['ops'] - previous['ops']) / max(sample['elapsed'] - previous['elapsed'], 1e-9)
+            memory = f"  memory {sample['memory'] / 1e6:8.2f} MB" if trace_memory else ''
+            print(f"[{sample['elapsed']:7.1f}s] {sample['ops']:>9} ops  {rate:>10.0f} ops/s  "
+                  f"cached tags {sample['cached_tags']:>6}{memory}", file=out)
+            samples.append(sample)
+
+    reporter = threading.Thread(target=report, name='windows11toast-stress-report', daemon=True)
+    reporter.start()
+    try:
+        if mode == 'threads':
+            threads = [threading.Thread(target=_run_thread, args=(worker, deadline, count),
+                                        name=f'windows11toast-stress-{worker.index}') for worker in pool]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            async def main():
+                await asyncio.gather(*(_run_coroutine(worker, deadline, count) for worker in pool))
+            asyncio.run(main())
+    finally:
+        stop.set()
+        reporter.join()
+    samples.append(_sample(pool, start, trace_memory))
+    if trace_memory:
+        tracemalloc.stop()
+
+    elapsed = samples[-1]['elapsed']
+    ops = samples[-1]['ops']
+    latency = {}
+    for kind in _KINDS:
+        values = sorted(value for worker in pool for value in worker.latencies[kind])
+        if values:
+            latency[kind] = {'count': len(values), 'p50': _percentile(values, 0.5), 'p90': _percentile(values, 0.9),
+                             'p99': _percentile(values, 0.99), 'max': values[-1]}
+    results = {
+        'ops': ops,
+        'errors': sum(worker.errors for worker in pool),
+        'elapsed': elapsed,
+        'throughput': ops / elapsed if elapsed else 0.0,
+        'latency': latency,
+        'locks': {lock.name: {'acquisitions': lock.acquisitions, 'contended': lock.contended,
+                              'wait_time': lock.wait_time} for lock in locks if lock.acquisitions},
+        'samples': samples,
+    }
+    _print_results(results, out)
+    return results
+
+
+def _print_results(results: Dict[str, Any], out) -> None:
+    print(f"\n{results['ops']} ops, {results['errors']} errors in {results['elapsed']:.2f}s "
+          f"-> {results['throughput']:.0f} ops/s", file=out)
+    print(f"\n{'latency (ms)':<14}{'count':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}", file=out)
+    for kind, stats in results['latency'].items():
+        print(f"{kind:<14}{stats['count']:>9}{stats['p50'] * 1e3:>9.3f}{stats['p90'] * 1e3:>9.3f}"
+              f"{stats['p99'] * 1e3:>9.3f}{stats['max'] * 1e3:>9.3f}", file=out)
+    if results['locks']:
+        print(f"\n{'lock':<16}{'acquired':>10}{'contended':>11}{'rate':>8}{'wait (ms)':>11}", file=out)
+        for name, stats in results['locks'].items():
+            rate = stats['contended'] / stats['acquisitions']
+            print(f"{name:<16}{stats['acquisitions']:>10}{stats['contended']:>11}{rate:>8.1%}"
+                  f"{stats['wait_time'] * 1e3:>11.2f}", file=out)
+    samples = results['samples']
+    if 'memory' in samples[-1]:
+        print(f"\nmemory {samples[0]['memory'] / 1e6:.2f} MB -> {samples[-1]['memory'] / 1e6:.2f} MB, "
+              f"cached tags {samples[0]['cached_tags']} -> {samples[-1]['cached_tags']}", file=out)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m windows11toast.stress',
+                                     description='Stress harness for windows11toast / windows11toast压力测试工具')
+    parser.add_argument('--workers', type=int, default=4, help='Threads or coroutines / 线程或协程数量')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run / 运行秒数')
+    parser.add_argument('--count', type=int, help='Operations per worker / 每个工作者的操作数')
+    parser.add_argument('--mode', choices=('threads', 'asyncio'), default='threads', help='Worker type / 工作者类型')
+    parser.add_argument('--mix', default='plain=70,progress=20,interactive=10',
+                        help='Operation weights / 操作权重')
+    parser.add_argument('--enable', default='', help=f'Features to enable: {",".join(_FEATURES)} / 要启用的功能')
+    parser.add_argument('--show-latency', type=float, default=0.0, help='Seconds per simulated show() / 每次模拟show()的秒数')
+    parser.add_argument('--dismiss-after', type=float, default=0.0,
+                        help='Seconds before interactive toasts are dismissed / 交互式通知被关闭前的秒数')
+    parser.add_argument('--report-interval', type=float, default=1.0, help='Seconds between progress lines / 进度行间隔秒数')
+    parser.add_argument('--memory', action='store_true', help='Track memory with tracemalloc / 使用tracemalloc跟踪内存')
+    parser.add_argument('--real-winrt', action='store_true', help='Use the real WinRT instead of the in-memory stand-in / 使用真实WinRT而非内存替身')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed / 随机种子')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of `python -m windows11toast.stress`.
+    `python -m windows11toast.stress`的入口。
+
+    Returns / 返回:
+        Process exit code / 进程退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    features = tuple(feature.strip() for feature in args.enable.split(',') if feature.strip())
+    results = run(args.workers, args.duration, args.count, args.mode, mix, features, args.show_latency,
+                  args.dismiss_after, args.report_interval, args.memory, not args.real_winrt, args.seed)
+    return 1 if results['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
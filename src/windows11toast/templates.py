@@ -0,0 +1,179 @@
+"""Registered, pre-parsed XML templates for xml= / 供xml=使用的已注册、预解析的XML模板"""
+
+import threading
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+from winrt.windows.data.xml.dom import XmlDocument
+
+
+class TemplateCache:
+    """
+    Named toast XML templates, validated once and kept parsed per scenario.
+    命名的通知XML模板，只校验一次，并按场景保持已解析状态。
+
+    Each send clones the parsed prototype instead of parsing the XML string again. At most
+    `max_entries` parsed prototypes are kept (least recently used are dropped and re-parsed on
+    next use); registered sources are kept until unregistered.
+    每次发送都克隆已解析的原型，而不是再次解析XML字符串。最多保留`max_entries`个已解析原型
+    （最久未使用的会被丢弃，下次使用时重新解析）；已注册的源在注销前一直保留。
+
+    Args / 参数:
+        max_entries: Maximum number of parsed prototypes / 已解析原型的最大数量
+    """
+
+    def __init__(self, max_entries: int = 64):
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.max_entries = max_entries
+        self._sources: Dict[str, str] = {}
+        # (name, scenario) -> XmlDocument
+        self._prototypes: 'OrderedDict[Tuple[str, str], XmlDocument]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._clone_supported = True
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name: str, xml: str) -> None:
+        """
+        Validate and register a template; re-registering a name replaces it.
+        校验并注册模板；重复注册同名模板会替换它。
+
+        Args / 参数:
+            name: Template name, passed as notify(xml=name) / 模板名称，通过notify(xml=name)使用
+            xml: Template XML; may contain '{scenario}' / 模板XML；可包含'{scenario}'
+
+        Raises / 异常:
+            ValueError: If the XML is not a well-formed <toast> document / 如果XML不是格式正确的<toast>文档
+        """
+        if not name or name.lstrip().startswith('<'):
+            raise ValueError(f"invalid template name '{name}'")
+        try:
+            root = ElementTree.fromstring(xml.format(scenario='default').strip())
+        except (ElementTree.ParseError, KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"template '{name}' is not valid XML: {e}") from None
+        if root.tag != 'toast':
+            raise ValueError(f"template '{name}' root element must be <toast>, got <{root.tag}>")
+        with self._lock:
+            self._sources[name] = xml
+            self._drop(name)
+        # Pre-parse the default scenario / 预解析默认场景
+        self.document(name, 'default')
+
+    def unregister(self, name: str) -> None:
+        """Remove a template and its parsed prototypes / 移除模板及其已解析原型"""
+        with self._lock:
+            self._sources.pop(name, None)
+            self._drop(name)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop parsed prototypes so they are parsed again on next use.
+        丢弃已解析原型，使其在下次使用时重新解析。
+
+        Args / 参数:
+            name: Template name, or None for every template / 模板名称，None表示所有模板
+        """
+        with self._lock:
+            if name is None:
+                self._prototypes.clear()
+            else:
+                self._drop(name)
+
+    def _drop(self, name: str) -> None:
+        for key in [key for key in self._prototypes if key[0] == name]:
+            del self._prototypes[key]
+
+    def source(self, xml: Optional[str]) -> Optional[str]:
+        """Return the registered source for a name, otherwise xml itself / 返回名称对应的已注册源，否则返回xml本身"""
+        return self._sources.get(xml, xml) if xml else xml
+
+    def __contains__(self, name: Optional[str]) -> bool:
+        return name in self._sources
+
+    def document(self, name: str, scenario: str = 'default') -> XmlDocument:
+        """
+        Return a fresh document for a registered template.
+        返回已注册模板的新文档。
+
+        Raises / 异常:
+            KeyError: If the template is not registered / 如果模板未注册
+        """
+        key = (name, scenario)
+        with self._lock:
+            source = self._sources[name]
+            prototype = self._prototypes.get(key)
+            if prototype is not None:
+                self._prototypes.move_to_end(key)
+                self.hits += 1
+                if self._clone_supported:
+                    try:
+                        return XmlDocument._from(prototype.clone_node(True))
+                    except Exception:
+                        # Cloning unavailable, parse the string instead / 无法克隆，改为解析字符串
+                        self._clone_supported = False
+            else:
+                self.misses += 1
+        document = XmlDocument()
+        document.load_xml(source.format(scenario=scenario))
+        if prototype is None and self._clone_supported:
+            # Keep this parse as the prototype and hand out a clone / 将本次解析保留为原型，并返回其克隆
+            try:
+                clone = XmlDocument._from(document.clone_node(True))
+            except Exception:
+                # Cloning unavailable, parse on every use / 无法克隆，每次使用时解析
+                self._clone_supported = False
+                return document
+            with self._lock:
+                if self._sources.get(name) is source:
+                    self._prototypes[key] = document
+                    while len(self._prototypes) > self.max_entries:
+                        self._prototypes.popitem(last=False)
+            return clone
+        return document
+
+    def stats(self) -> Dict[str, int]:
+        """Return {'templates', 'parsed', 'hits', 'misses'} / 返回{'templates', 'parsed', 'hits', 'misses'}"""
+        with self._lock:
+            return {'templates': len(self._sources), 'parsed': len(self._prototypes),
+                    'hits': self.hits, 'misses': self.misses}
+
+
+# Shared template cache used by notify() / notify()使用的共享模板缓存
+_template_cache = TemplateCache()
+
+
+def register_template(name: str, xml: str) -> None:
+    """
+    Register a custom toast XML template once; then pass its name as notify(xml=name).
+    注册一次自定义通知XML模板；之后将其名称作为notify(xml=name)传入。
+
+    Args / 参数:
+        name: Template name / 模板名称
+        xml: Template XML; may contain '{scenario}' / 模板XML；可包含'{scenario}'
+
+    Raises / 异常:
+        ValueError: If the XML is not a well-formed <toast> document / 如果XML不是格式正确的<toast>文档
+
+    Example / 示例:
+        register_template('compact', '<toast scenario="{scenario}"><visual>'
+                                     '<binding template="ToastGeneric"></binding></visual></toast>')
+        for job in jobs:
+            notify(job.name, 'Done', xml='compact')
+    """
+    _template_cache.register(name, xml)
+
+
+def unregister_template(name: str) -> None:
+    """Remove a registered template / 移除已注册的模板"""
+    _template_cache.unregister(name)
+
+
+def invalidate_templates(name: Optional[str] = None) -> None:
+    """Drop parsed prototypes of one or every template / 丢弃一个或所有模板的已解析原型"""
+    _template_cache.invalidate(name)
+
+
+def get_template_cache() -> TemplateCache:
+    """Return the shared TemplateCache / 返回共享的TemplateCache"""
+    return _template_cache
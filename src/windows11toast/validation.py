@@ -0,0 +1,234 @@
+"""Pre-flight validation of toast payloads / 通知负载的发送前校验"""
+
+from typing import Optional, Dict, List, Any
+
+from .constants import (
+    DEFAULT_XML_TEMPLATE, MAX_PAYLOAD_BYTES, MAX_TITLE_LINES, MAX_TEXT_LINES,
+    MAX_BUTTONS, MAX_INPUTS, MAX_SELECTION_ITEMS
+)
+
+# Validation modes / 校验模式
+VALIDATE_STRICT = 'strict'  # Raise ToastPayloadError / 抛出ToastPayloadError
+VALIDATE_TRUNCATE = 'truncate'  # Trim the payload until it fits, raise if it cannot / 裁剪负载直到符合限制，无法裁剪时抛出
+
+_ESCAPES = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;', ord('"'): '&quot;'}
+
+# Approximate serialized size of each element without its values / 各元素不含值时的近似序列化大小
+_TEXT_OVERHEAD = len('<text></text>')
+_BUTTON_OVERHEAD = len('<action activationType="protocol" arguments="http:" content=""/>')
+_INPUT_OVERHEAD = len('<input id="" type="text" placeHolderContent=""/>')
+_SELECTION_INPUT_OVERHEAD = len('<input id="" type="selection"></input>')
+_SELECTION_ITEM_OVERHEAD = len('<selection id="" content=""/>')
+_IMAGE_OVERHEAD = len('<image src="" placement="appLogoOverride" hint-crop="circle"/>')
+_PROGRESS_OVERHEAD = len('<progress title="{title}" status="{status}" value="{value}" '
+                         'valueStringOverride="{valueStringOverride}"/>')
+_AUDIO_OVERHEAD = len('<audio src="" loop="true"/>')
+_ACTIONS_OVERHEAD = len('<actions></actions>')
+
+
+class ToastPayloadError(ValueError):
+    """Raised when a toast payload exceeds Windows limits in strict mode / 严格模式下通知负载超出Windows限制时抛出"""
+
+    def __init__(self, problems: List[str]):
+        super().__init__('Invalid toast payload: ' + '; '.join(problems))
+        self.problems = problems
+
+
+def _size(value: Optional[str]) -> int:
+    """UTF-8 size of an escaped XML value / 转义后XML值的UTF-8大小"""
+    if not value:
+        return 0
+    return len(str(value).translate(_ESCAPES).encode('utf-8'))
+
+
+def estimate_payload_size(payload: Dict[str, Any]) -> int:
+    """
+    Estimate the serialized XML size of a toast in bytes, without building it.
+    在不构建XML的情况下估算通知序列化后的字节大小。
+
+    Args / 参数:
+        payload: notify() keyword arguments / notify()的关键字参数
+
+    Returns / 返回:
+        Estimated size in bytes / 估算的字节大小
+    """
+    template = payload.get('xml') or DEFAULT_XML_TEMPLATE
+    size = len(template.encode('utf-8'))
+    size += _size(payload.get('on_click') if isinstance(payload.get('on_click'), str) else None)
+    for name in ('title', 'body'):
+        if payload.get(name):
+            size += _TEXT_OVERHEAD + _size(payload[name])
+    buttons = payload.get('buttons') or []
+    inputs = payload.get('inputs') or []
+    selection_inputs = payload.get('selection_inputs') or []
+    has_actions = bool(buttons or inputs or selection_inputs or payload.get('input_id') or payload.get('selections'))
+    if has_actions:
+        size += _ACTIONS_OVERHEAD
+    for button in buttons:
+        # Button content appears in both 'arguments' and 'content' / 按钮内容同时出现在'arguments'和'content'中
+        size += _BUTTON_OVERHEAD + 2 * _size(button)
+    if payload.get('input_id'):
+        size += _INPUT_OVERHEAD + _size(payload['input_id']) + _size(payload.get('input_placeholder') or payload['input_id'])
+    if payload.get('selection_id') and payload.get('selections'):
+        size += _SELECTION_INPUT_OVERHEAD + _size(payload['selection_id'])
+        for item in payload['selections']:
+            size += _SELECTION_ITEM_OVERHEAD + 2 * _size(item)
+    for input_id, placeholder in inputs:
+        size += _INPUT_OVERHEAD + _size(input_id) + _size(placeholder or input_id)
+    for selection_id, items in selection_inputs:
+        size += _SELECTION_INPUT_OVERHEAD + _size(selection_id)
+        for item in items:
+            # Text items, or (id, content) pairs / 文本选项或(id, content)对
+            size += _SELECTION_ITEM_OVERHEAD + (2 * _size(item) if isinstance(item, str) else _size(item[0]) + _size(item[1]))
+    for name in ('image_src', 'icon_src'):
+        if payload.get(name):
+            size += _IMAGE_OVERHEAD + _size(payload[name])
+    if any(payload.get(name) is not None for name in ('progress_title', 'progress_status', 'progress_value')):
+        size += _PROGRESS_OVERHEAD
+    if payload.get('audio') is not None:
+        size += _AUDIO_OVERHEAD + _size(str(payload['audio']))
+    return size
+
+
+def _lines(text: Optional[str]) -> int:
+    return text.count('\n') + 1 if text else 0
+
+
+def _truncate_text(text: str, max_bytes: int) -> str:
+    """Shorten text so its escaped size is at most max_bytes / 缩短文本使其转义后大小不超过max_bytes"""
+    if max_bytes <= 1:
+        return ''
+    while text and _size(text) + 3 > max_bytes:
+        # Remove roughly the excess in one step, then refine / 先一次性删除大致超出部分，再逐步精确
+        excess = _size(text) + 3 - max_bytes
+        text = text[:max(0, len(text) - max(1, excess // 4))]
+    return text + '…' if text else ''
+
+
+def validate_payload(payload: Dict[str, Any], mode: str = VALIDATE_STRICT) -> Dict[str, Any]:
+    """
+    Check a toast payload against Windows size and element count limits.
+    根据Windows的大小和元素数量限制检查通知负载。
+
+    Checks the title/body line counts, number of buttons, inputs and selection items, and the
+    estimated XML size, all in pure Python before any WinRT call is made.
+    在调用任何WinRT之前，用纯Python检查标题/正文行数、按钮、输入和选择项数量以及估算的XML大小。
+
+    Args / 参数:
+        payload: notify() keyword arguments ('title', 'body', 'buttons', 'selections', ...), optionally with
+            'inputs' as (id, placeholder) pairs and 'selection_inputs' as (id, items) pairs
+            notify()的关键字参数，可选地包含(id, placeholder)对形式的'inputs'和(id, items)对形式的'selection_inputs'
+        mode: 'strict' to raise ToastPayloadError, 'truncate' to trim the payload until it fits / 'strict'抛出ToastPayloadError，'truncate'裁剪负载直到符合限制
+
+    Returns / 返回:
+        The payload, or a trimmed copy in truncate mode / 负载本身，truncate模式下为裁剪后的副本
+
+    Raises / 异常:
+        ToastPayloadError: If the payload exceeds a limit in strict mode, or still exceeds one after trimming
+            in truncate mode / 严格模式下负载超出限制时，或truncate模式下裁剪后仍超出限制时
+        ValueError: If mode is unknown / 如果模式未知
+
+    Example / 示例:
+        validate_payload({'title': 'Hello', 'buttons': ['A', 'B', 'C', 'D', 'E', 'F']})  # raises / 抛出异常
+    """
+    if mode not in (VALIDATE_STRICT, VALIDATE_TRUNCATE):
+        raise ValueError(f"mode must be '{VALIDATE_STRICT}' or '{VALIDATE_TRUNCATE}', got '{mode}'")
+    truncate = mode == VALIDATE_TRUNCATE
+    problems = []
+    fixed = dict(payload) if truncate else payload
+
+    title = payload.get('title')
+    if _lines(title) > MAX_TITLE_LINES:
+        problems.append(f'title has {_lines(title)} lines (max {MAX_TITLE_LINES})')
+        if truncate:
+            fixed['title'] = '\n'.join(title.split('\n')[:MAX_TITLE_LINES])
+    body = payload.get('body')
+    body_limit = MAX_TEXT_LINES - _lines(fixed.get('title'))
+    if _lines(body) > body_limit:
+        problems.append(f'title and body have {_lines(title) + _lines(body)} lines (max {MAX_TEXT_LINES})')
+        if truncate:
+            fixed['body'] = '\n'.join(body.split('\n')[:max(body_limit, 1)])
+
+    buttons = payload.get('buttons')
+    if buttons and len(buttons) > MAX_BUTTONS:
+        problems.append(f'{len(buttons)} buttons (max {MAX_BUTTONS})')
+        if truncate:
+            fixed['buttons'] = list(buttons[:MAX_BUTTONS])
+    inputs = (int(bool(payload.get('input_id'))) + int(bool(payload.get('selection_id') and payload.get('selections')))
+              + len(payload.get('inputs') or []) + len(payload.get('selection_inputs') or []))
+    if inputs > MAX_INPUTS:
+        problems.append(f'{inputs} inputs (max {MAX_INPUTS})')
+        if truncate:
+            # Drop trailing selections first, then trailing text inputs / 先删除末尾的选择框，再删除末尾的文本输入
+            excess = inputs - MAX_INPUTS
+            for name in ('selection_inputs', 'inputs'):
+                items = list(fixed.get(name) or [])
+                removed = min(excess, len(items))
+                if removed:
+                    fixed[name] = items[:len(items) - removed]
+                    excess -= removed
+            if excess:
+                # input_id and selection_id cannot be trimmed / input_id和selection_id无法裁剪
+                raise ToastPayloadError(problems)
+    selections = payload.get('selections')
+    if selections and len(selections) > MAX_SELECTION_ITEMS:
+        problems.append(f'{len(selections)} selection items (max {MAX_SELECTION_ITEMS})')
+        if truncate:
+            fixed['selections'] = list(selections[:MAX_SELECTION_ITEMS])
+    selection_inputs = fixed.get('selection_inputs')
+    if selection_inputs and any(len(items) > MAX_SELECTION_ITEMS for _, items in selection_inputs):
+        for selection_id, items in selection_inputs:
+            if len(items) > MAX_SELECTION_ITEMS:
+                problems.append(f"{len(items)} items in selection '{selection_id}' (max {MAX_SELECTION_ITEMS})")
+        if truncate:
+            fixed['selection_inputs'] = [(selection_id, tuple(items[:MAX_SELECTION_ITEMS]))
+                                         for selection_id, items in selection_inputs]
+
+    size = estimate_payload_size(fixed)
+    if size > MAX_PAYLOAD_BYTES:
+        problems.append(f'payload is about {size} bytes (max {MAX_PAYLOAD_BYTES})')
+        if truncate:
+            # Shorten body first, then title / 先缩短正文，再缩短标题
+            for name in ('body', 'title'):
+                if fixed.get(name):
+                    excess = estimate_payload_size(fixed) - MAX_PAYLOAD_BYTES
+                    if excess > 0:
+                        fixed[name] = _truncate_text(fixed[name], _size(fixed[name]) - excess)
+            size = estimate_payload_size(fixed)
+            if size > MAX_PAYLOAD_BYTES:
+                # The elements that cannot be trimmed are too large on their own / 无法裁剪的元素本身已超出限制
+                problems.append(f'payload is still about {size} bytes after truncating the text')
+                raise ToastPayloadError(problems)
+
+    if problems and not truncate:
+        raise ToastPayloadError(problems)
+    return fixed
+
+
+# Active validation mode used by notify(), None when disabled / notify()使用的校验模式，禁用时为None
+_validation_mode: Optional[str] = None
+
+
+def enable_validation(mode: str = VALIDATE_STRICT) -> None:
+    """
+    Validate every notify() payload before it is built and sent.
+    在构建和发送之前校验每个notify()负载。
+
+    Args / 参数:
+        mode: 'strict' to raise ToastPayloadError, 'truncate' to trim the payload until it fits / 'strict'抛出ToastPayloadError，'truncate'裁剪负载直到符合限制
+    """
+    global _validation_mode
+    if mode not in (VALIDATE_STRICT, VALIDATE_TRUNCATE):
+        raise ValueError(f"mode must be '{VALIDATE_STRICT}' or '{VALIDATE_TRUNCATE}', got '{mode}'")
+    _validation_mode = mode
+
+
+def disable_validation() -> None:
+    """Stop validating notify() payloads / 停止校验notify()负载"""
+    global _validation_mode
+    _validation_mode = None
+
+
+def get_validation_mode() -> Optional[str]:
+    """Return the active validation mode, or None if disabled / 返回活动的校验模式，禁用时返回None"""
+    return _validation_mode
@@ -0,0 +1,16 @@
+"""Shared test setup: tests run on the in-memory WinRT, so they pass on any platform / 共享测试设置：测试运行在内存WinRT上，因此可在任意平台通过"""
+
+import pytest
+
+from windows11toast import memory_winrt
+
+# Must run before any WinRT-backed module is imported / 必须在导入任何依赖WinRT的模块之前运行
+SHELL = memory_winrt.install(dismiss_after=None)
+
+
+@pytest.fixture
+def shell():
+    """The simulated notification center, with counters reset / 计数器已重置的模拟通知中心"""
+    SHELL.shown = SHELL.updated = 0
+    SHELL.scheduled.clear()
+    return SHELL
@@ -0,0 +1,48 @@
+import pytest
+
+PIL = pytest.importorskip('PIL')
+from PIL import Image
+
+from windows11toast import assets
+from windows11toast.assets import enable_image_pipeline, disable_image_pipeline, prepare_image, INLINE_SIZE
+from windows11toast.enums import ImagePlacement
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield enable_image_pipeline(tmp_path / 'cache')
+    disable_image_pipeline()
+
+
+def _image(path, size=(1200, 900), mode='RGB'):
+    Image.new(mode, size, 'red').save(path)
+    return str(path)
+
+
+def test_resizes_into_cache(cache, tmp_path):
+    src = _image(tmp_path / 'big.png')
+    prepared = prepare_image(src, ImagePlacement.INLINE)
+    assert prepared != src and prepared.endswith('.jpg')
+    with Image.open(prepared) as image:
+        assert image.size[0] <= INLINE_SIZE[0] and image.size[1] <= INLINE_SIZE[1]
+    assert prepare_image(src, ImagePlacement.INLINE) == prepared
+
+
+def test_corrupt_image_falls_back(cache, tmp_path):
+    src = tmp_path / 'broken.png'
+    src.write_bytes(b'\x89PNG\r\n\x1a\n' + b'garbage' * 10)
+    assert prepare_image(str(src)) == str(src)
+
+
+def test_decompression_bomb_falls_back(cache, tmp_path, monkeypatch):
+    src = _image(tmp_path / 'bomb.png', size=(400, 400))
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    assert prepare_image(src) == src
+    assert not list((tmp_path / 'cache').glob('*.tmp'))
+
+
+def test_digest_cache_is_bounded(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, 'MAX_DIGESTS', 2)
+    for i in range(5):
+        prepare_image(_image(tmp_path / f'{i}.png', size=(10 + i, 10)))
+    assert len(cache._digests) == 2
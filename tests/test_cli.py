@@ -0,0 +1,34 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from windows11toast.cli import run_spec, stream
+
+
+def test_run_spec_parses_deliver_at(shell):
+    due = datetime.now(timezone.utc) + timedelta(hours=1)
+    run_spec({'title': 'Later', 'deliver_at': due.isoformat().replace('+00:00', 'Z')})
+    assert len(shell.scheduled) == 1
+    assert shell.scheduled[0].delivery_time.timestamp() == pytest.approx(due.timestamp(), abs=1)
+
+
+def test_run_spec_parses_delay(shell):
+    run_spec({'title': 'Later', 'delay': '60'})
+    assert len(shell.scheduled) == 1
+
+
+def test_run_spec_rejects_unknown_op():
+    with pytest.raises(ValueError):
+        run_spec({'op': 'bogus'})
+
+
+def test_stream_reports_failures_and_keeps_going(shell):
+    lines = io.StringIO('{"title": "one"}\nnot json\n\n{"op": "bogus"}\n{"title": "two"}\n')
+    out = io.StringIO()
+    assert stream(lines, out) == 2
+    reports = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(report['line'], report['ok']) for report in reports] == [(1, True), (2, False), (4, False), (5, True)]
+    assert reports[2]['error'].startswith('ValueError')
+    assert shell.shown == 2
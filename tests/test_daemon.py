@@ -0,0 +1,106 @@
+import json
+import socket
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from windows11toast.client import ToastClient
+from windows11toast.ratelimit import get_rate_limiter
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='uses a Unix socket address')
+
+AUTHKEY = b'secret'
+
+
+@pytest.fixture
+def daemon(tmp_path, shell):
+    from windows11toast.daemon import ToastDaemon
+
+    server = ToastDaemon(str(tmp_path / 'toast.sock'), AUTHKEY, rate=1000, handshake_timeout=0.2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 2.0
+    while server._listener is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield server
+    server.close()
+    thread.join(2.0)
+
+
+def test_send_and_wait(daemon, shell):
+    with ToastClient(daemon.address, AUTHKEY) as client:
+        assert client.send('Hello', 'World', wait=True) == {'ok': True}
+        assert client.send_many([{'op': 'bogus'}], wait=True)[0]['ok'] is False
+    assert shell.shown == 1
+    # The daemon's limiter is its own / 守护进程的限流器是独立的
+    assert daemon.rate_limiter is not None and get_rate_limiter() is None
+
+
+def test_no_reply_unless_requested(daemon):
+    with ToastClient(daemon.address, AUTHKEY) as client:
+        client._connection.send_bytes(b'not json')
+        client._connection.send_bytes(json.dumps({'specs': 'x', 'reply': False}).encode('utf-8'))
+        client.send_many([{'title': 'later'}], wait=False)
+        assert client.send_many([{'op': 'clear_toast'}], wait=True) == [{'ok': True}]
+        assert not client._connection.poll(0.1)
+
+
+def test_bad_authkey_and_silent_client_do_not_block(daemon):
+    with pytest.raises(AuthenticationError):
+        ToastClient(daemon.address, b'wrong')
+    silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    silent.connect(daemon.address)
+    try:
+        with ToastClient(daemon.address, AUTHKEY) as client:
+            assert client.send('Still', 'serving', wait=True) == {'ok': True}
+    finally:
+        silent.close()
+
+
+def test_refuses_to_replace_live_daemon(daemon):
+    from windows11toast.daemon import ToastDaemon
+
+    with pytest.raises(OSError, match='another toast daemon'):
+        ToastDaemon(daemon.address).serve_forever()
+
+
+def test_coalesce_merges_updates_of_one_toast():
+    from windows11toast.daemon import _coalesce
+
+    specs = [
+        {'op': 'update_progress', 'tag': 'a', 'value': 0.1, 'status': 'Copying'},
+        {'op': 'update_progress', 'tag': 'b', 'value': 0.5},
+        {'op': 'update_progress', 'tag': 'a', 'value': 0.2, 'status': None},
+        {'title': 'break'},
+        {'op': 'update_progress', 'tag': 'a', 'value': 0.3},
+    ]
+    assert _coalesce(specs) == [
+        ({'op': 'update_progress', 'tag': 'a', 'value': 0.2, 'status': 'Copying'}, [0, 2]),
+        ({'op': 'update_progress', 'tag': 'b', 'value': 0.5}, [1]),
+        ({'title': 'break'}, [3]),
+        ({'op': 'update_progress', 'tag': 'a', 'value': 0.3}, [4]),
+    ]
+
+
+def test_requests_after_close_get_an_error(daemon):
+    with ToastClient(daemon.address, AUTHKEY) as client:
+        assert client.send('Before', 'close', wait=True) == {'ok': True}
+        daemon.close()
+        assert client.send('After', 'close', wait=True) == {'ok': False, 'error': 'daemon shutting down'}
+
+
+def test_requests_behind_the_sentinel_are_completed(tmp_path):
+    from windows11toast.daemon import ToastDaemon, _Request
+
+    server = ToastDaemon(str(tmp_path / 'toast.sock'))
+    waiting = _Request([{'title': 'late'}, {'title': 'later'}], True)
+    server._queue.put(None)
+    server._queue.put(waiting)
+    server._closed.set()
+    server._send_loop()
+    assert waiting.done.is_set()
+    assert waiting.results == [{'ok': False, 'error': 'daemon shutting down'}] * 2
+    assert not server._enqueue(_Request([{'title': 'refused'}], True))
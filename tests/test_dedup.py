@@ -0,0 +1,26 @@
+from windows11toast import dedup
+from windows11toast.dedup import Deduplicator
+
+
+def test_window_is_fixed(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(dedup.time, 'monotonic', lambda: now[0])
+    deduplicator = Deduplicator(window=5.0)
+    fingerprint = Deduplicator.fingerprint('t', 'b', None, 'app')
+
+    assert deduplicator.check(fingerprint) == 1
+    # Repeats inside the window do not extend it / 窗口内的重复不会延长窗口
+    for offset in (1.0, 2.0, 3.0, 4.0, 4.9):
+        now[0] = 100.0 + offset
+        assert deduplicator.check(fingerprint) > 1
+    now[0] = 105.0
+    assert deduplicator.check(fingerprint) == 1
+    assert deduplicator.suppressed == 5
+
+
+def test_max_entries_evicts_oldest():
+    deduplicator = Deduplicator(window=60.0, max_entries=2)
+    for fingerprint in (1, 2, 3):
+        assert deduplicator.check(fingerprint) == 1
+    assert deduplicator.check(1) == 1
+    assert deduplicator.check(3) == 2
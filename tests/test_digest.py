@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from windows11toast import digest
+from windows11toast.digest import DigestNotifier
+from windows11toast.scheduler import get_scheduler
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    calls = []
+
+    def notify(title, body, **options):
+        calls.append((title, options['tag'], options['suppress_popup']))
+        return object()
+
+    monkeypatch.setattr(digest, 'notify', notify)
+    return calls
+
+
+@pytest.fixture
+def notifiers():
+    """Create DigestNotifiers that are closed after the test / 创建测试结束后关闭的DigestNotifier"""
+    created = []
+
+    def create(**options):
+        notifier = DigestNotifier(**options)
+        created.append(notifier)
+        return notifier
+
+    yield create
+    for notifier in created:
+        notifier.close()
+
+
+def test_updates_do_not_pop_up_again(sent, notifiers):
+    notifier = notifiers(window=60, max_batch=2)
+    for i in range(4):
+        notifier.add(f'event {i}')
+    assert [(title, popup) for title, _, popup in sent] == [('2 new alerts', False), ('4 new alerts', True)]
+    assert sent[0][1] == sent[1][1]
+
+
+def test_window_end_flushes_once(sent, notifiers):
+    notifier = notifiers(window=0.05)
+    notifier.add('a')
+    notifier.add('b')
+    deadline = time.monotonic() + 2.0
+    while not sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert sent == [('2 new alerts', notifier.tag, False)]
+    assert notifier.flush() is None
+
+
+def test_stale_snapshot_is_skipped(sent, notifiers):
+    notifier = notifiers(window=60)
+    notifier.add('a')
+    with notifier._lock:
+        older = notifier._take()
+    notifier.add('b')
+    notifier.flush()
+    assert notifier._show(*older) is None
+    assert sent == [('2 new alerts', notifier.tag, False)]
+
+
+def test_close_shows_pending_events_and_stops_the_timer(sent):
+    scheduler = get_scheduler()
+    pending = scheduler.pending()
+    with DigestNotifier(window=60) as notifier:
+        notifier.add('a')
+        assert scheduler.pending() == pending + 1
+    assert sent == [('1 new alert', notifier.tag, False)]
+    assert scheduler.pending() == pending
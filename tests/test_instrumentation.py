@@ -0,0 +1,14 @@
+from windows11toast.instrumentation import add_timing_hook, remove_timing_hook
+
+
+def test_phases_include_images(shell):
+    from windows11toast.notification import notify
+
+    records = []
+    add_timing_hook(records.append)
+    try:
+        notify('Hello', 'World', image_src='picture.png')
+    finally:
+        remove_timing_hook(records.append)
+    assert list(records[0]['phases']) == ['normalize', 'images', 'build', 'progress_data', 'notifier', 'show']
+    assert abs(sum(records[0]['phases'].values()) - records[0]['total']) < 1e-3
@@ -0,0 +1,45 @@
+import pytest
+
+from windows11toast.legacy import legacy_spec
+from windows11toast.spec import InputSpec, SelectionSpec
+
+
+def test_flat_selections_are_one_selection():
+    spec = legacy_spec('t', 'b', selections=['Yes', 'No'])
+    assert spec.selections == (SelectionSpec('selection', ['Yes', 'No']),)
+
+
+def test_flat_selections_use_selection_id():
+    items = [{'id': 'a', 'content': 'A'}, {'id': 'b', 'content': 'B'}]
+    spec = legacy_spec('t', 'b', selection_id='s', selections=items)
+    assert spec.selections == (SelectionSpec('s', items),)
+
+
+def test_nested_selections_are_several_selections():
+    spec = legacy_spec('t', 'b', selections=[['a', 'b'], {'input': {'id': 'size'}, 'selection': ['S', 'L']}])
+    assert spec.selections == (SelectionSpec('selection', ['a', 'b']), SelectionSpec('size', ['S', 'L']))
+
+
+def test_mixed_selections_raise():
+    with pytest.raises(TypeError):
+        legacy_spec('t', 'b', selections=['a', ['b', 'c']])
+
+
+def test_selection_takes_precedence_over_flat_selections():
+    spec = legacy_spec('t', 'b', selection=['a'], selections=['b', 'c'])
+    assert spec.selections == (SelectionSpec('selection', ['a']),)
+
+
+def test_input_id_takes_precedence_over_inputs():
+    spec = legacy_spec('t', 'b', input_id='reply', inputs=[{'id': 'name'}], input={'id': 'other'})
+    assert spec.inputs == (InputSpec('reply'),)
+
+
+def test_input_takes_precedence_over_inputs():
+    spec = legacy_spec('t', 'b', input={'id': 'reply'}, inputs=[{'id': 'name'}])
+    assert [field.id for field in spec.inputs] == ['reply']
+
+
+def test_every_input_is_kept():
+    spec = legacy_spec('t', 'b', inputs=[{'id': 'name'}, {'id': 'email'}])
+    assert [field.id for field in spec.inputs] == ['name', 'email']
@@ -0,0 +1,44 @@
+import pytest
+
+from windows11toast import progress
+from windows11toast.progress import toast_progress
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    log = []
+    monkeypatch.setattr(progress, 'notify_progress', lambda *args, **kwargs: None)
+    monkeypatch.setattr(progress, 'update_progress',
+                        lambda value, status, text, **kwargs: log.append((status, text)))
+    return log
+
+
+def test_done(statuses):
+    assert list(toast_progress(range(3))) == [0, 1, 2]
+    assert statuses[-1] == ('Done!', '3/3')
+
+
+def test_iterable_raises(statuses):
+    def items():
+        yield 1
+        raise ValueError('bad item')
+
+    with pytest.raises(ValueError):
+        for _ in toast_progress(items(), total=5):
+            pass
+    assert statuses[-1] == ('Failed', '1/5')
+
+
+def test_break_shows_stopped(statuses):
+    for i in toast_progress(range(10)):
+        if i == 3:
+            break
+    assert statuses[-1] == ('Stopped', '3/10')
+
+
+def test_exception_in_loop_body_shows_stopped(statuses):
+    with pytest.raises(KeyError):
+        for i in toast_progress(range(10)):
+            if i == 2:
+                raise KeyError(i)
+    assert statuses[-1] == ('Stopped', '2/10')
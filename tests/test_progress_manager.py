@@ -0,0 +1,64 @@
+from windows11toast import progress_manager
+from windows11toast.progress_manager import ProgressManager
+from windows11toast.scheduler import get_scheduler
+
+
+def test_failed_first_send_is_retried_as_new_toast(monkeypatch):
+    log = []
+    outcomes = [OSError('shell busy'), None, object()]
+
+    def notify_progress(title, status, value, value_string_override, **options):
+        log.append(('notify', value))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def update_progress(value, status, value_string_override, **options):
+        log.append(('update', value))
+
+    monkeypatch.setattr(progress_manager, 'notify_progress', notify_progress)
+    monkeypatch.setattr(progress_manager, 'update_progress', update_progress)
+    manager = ProgressManager(interval=60)
+    bar = manager.bar('Job')
+    manager.flush()
+    # Dropped by the rate limiter / 被限流器丢弃
+    manager.flush()
+    bar.update(0.5)
+    manager.flush()
+    bar.update(0.7)
+    manager.flush()
+    assert log == [('notify', 0.0), ('notify', 0.0), ('notify', 0.5), ('update', 0.7)]
+    assert manager.flush() == 0
+    manager.close()
+
+
+def test_closed_bar_is_kept_until_sent(monkeypatch):
+    log = []
+    outcomes = [None, object()]
+
+    def notify_progress(title, status, value, value_string_override, **options):
+        log.append(('notify', status))
+        return outcomes.pop(0)
+
+    monkeypatch.setattr(progress_manager, 'notify_progress', notify_progress)
+    manager = ProgressManager(interval=60)
+    bar = manager.bar('Job')
+    bar.close('Done!')
+    manager.flush()
+    assert manager.bars == [bar]
+    manager.flush()
+    assert log == [('notify', 'Done!'), ('notify', 'Done!')]
+    assert manager.bars == []
+    manager.close()
+
+
+def test_close_stops_the_flush_loop(monkeypatch):
+    monkeypatch.setattr(progress_manager, 'notify_progress', lambda *args, **kwargs: object())
+    scheduler = get_scheduler()
+    pending = scheduler.pending()
+    manager = ProgressManager(interval=60)
+    manager.bar('Job')
+    assert scheduler.pending() == pending + 1
+    manager.close()
+    assert scheduler.pending() == pending
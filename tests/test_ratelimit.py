@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from windows11toast.metrics import enable_metrics, disable_metrics
+from windows11toast.ratelimit import (
+    RateLimiter, RateLimitExceeded, enable_rate_limit, disable_rate_limit, LIMIT_BLOCK, LIMIT_DELAY, LIMIT_RAISE
+)
+from windows11toast.scheduler import get_scheduler
+
+
+def _shown_total(metrics):
+    return sum(counter['value'] for counter in metrics.as_dict()['counters']
+               if counter['name'] == 'toasts_shown_total')
+
+
+@pytest.fixture
+def metrics():
+    registry = enable_metrics()
+    yield registry
+    disable_metrics()
+    disable_rate_limit()
+
+
+def test_raise_policy():
+    limiter = RateLimiter(rate=1.0, burst=1, policy=LIMIT_RAISE)
+    limiter.submit('app', lambda: None)
+    with pytest.raises(RateLimitExceeded):
+        limiter.submit('app', lambda: None)
+    assert limiter.stats('app')['raised'] == 1
+
+
+def test_delay_counts_shown_when_delivered(shell, metrics):
+    from windows11toast.notification import notify
+
+    enable_rate_limit(rate=10.0, burst=1, policy=LIMIT_DELAY)
+    notify('one')
+    notify('two')
+    assert shell.shown == 1
+    assert _shown_total(metrics) == 1
+    deadline = time.monotonic() + 2.0
+    while shell.shown < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.01)
+    assert shell.shown == 2
+    assert _shown_total(metrics) == 2
+
+
+def test_block_does_not_sleep_on_scheduler_thread():
+    limiter = RateLimiter(rate=2.0, burst=1, policy=LIMIT_BLOCK)
+    shown = []
+    returned_after = []
+    done = threading.Event()
+
+    def show(name):
+        shown.append(name)
+        if len(shown) == 2:
+            done.set()
+
+    def from_scheduler():
+        started = time.monotonic()
+        limiter.submit('app', show, 'a')
+        limiter.submit('app', show, 'b')
+        returned_after.append(time.monotonic() - started)
+
+    get_scheduler().call_later(0, from_scheduler)
+    assert done.wait(2.0)
+    assert shown == ['a', 'b']
+    # Returned without sleeping, 'b' was deferred / 未等待即返回，'b'被推迟
+    assert returned_after[0] < 0.25
+    assert limiter.stats('app')['delayed'] == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from windows11toast.notification import notify, clear_toast
+from windows11toast.progress import notify_progress, update_progress
+from windows11toast.recording import (
+    enable_recording, disable_recording, read_recording, replay, OP_NOTIFY, OP_UPDATE, OP_CLEAR
+)
+
+
+class Scalar:
+    """Number type json cannot encode, like a numpy float32 / json无法编码的数字类型，类似numpy float32"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __float__(self):
+        return float(self.value)
+
+    def __str__(self):
+        return str(self.value)
+
+
+@pytest.fixture
+def path(tmp_path):
+    yield str(tmp_path / 'traffic.jsonl')
+    disable_recording()
+
+
+def test_record_and_replay(shell, path):
+    recorder = enable_recording(path)
+    notify('Hello', 'World', tag='greeting', group='test')
+    notify_progress('Copy', 'Copying', 0.0, tag='copy')
+    update_progress(Scalar(0.5), tag='copy')
+    clear_toast(tag='greeting', group='test')
+    disable_recording()
+    assert recorder.events == 4 and recorder.skipped == 0
+
+    events = list(read_recording(path))
+    assert [op for _, op, _ in events] == [OP_NOTIFY, OP_NOTIFY, OP_UPDATE, OP_CLEAR]
+    assert events[0][2] == [{'title': 'Hello', 'body': 'World', 'app_id': 'Python'}, 'greeting', 'test', None]
+    assert events[2][2][0] == 0.5
+    offsets = [offset for offset, _, _ in events]
+    assert offsets == sorted(offsets)
+
+    shown = shell.shown
+    stats = replay(path, speed=None)
+    assert stats['events'] == 4 and stats['errors'] == 0
+    assert shell.shown == shown + 3
+
+
+def test_recording_never_breaks_a_send(shell, path, monkeypatch):
+    recorder = enable_recording(path)
+
+    def fail(*args, **kwargs):
+        raise ValueError('Circular reference detected')
+
+    monkeypatch.setattr('windows11toast.recording.json.dumps', fail)
+    assert notify('Still', 'shown') is not None
+    assert recorder.skipped == 1 and recorder.events == 0
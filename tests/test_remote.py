@@ -0,0 +1,125 @@
+import http.server
+import threading
+import urllib.error
+
+import pytest
+
+from windows11toast.remote import RemoteImageCache, RemoteImageTooLarge
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'p' * 100
+JPEG = b'\xff\xd8\xff' + b'j' * 100
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # path -> (status, content type, body, etag) / 路径 -> (状态码, 内容类型, 内容, etag)
+    routes = {}
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        status, content_type, body, etag = self.routes.get(self.path, (404, None, b'', None))
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.routes = {}
+    _Handler.requests = []
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_then_cache_hit(server, tmp_path):
+    _Handler.routes['/a'] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path)
+    path = cache.fetch(server.url + '/a')
+    assert path.endswith('.png') and open(path, 'rb').read() == PNG
+    assert cache.fetch(server.url + '/a') == path
+    assert len(_Handler.requests) == 1
+    assert cache._url_locks == {}
+
+
+def test_revalidates_with_etag(server, tmp_path):
+    _Handler.routes['/a'] = (200, 'image/png', PNG, '"v1"')
+    cache = RemoteImageCache(tmp_path, max_age=0)
+    path = cache.fetch(server.url + '/a')
+    assert cache.fetch(server.url + '/a') == path
+    assert _Handler.requests[-1] == ('/a', '"v1"')
+
+
+def test_server_error_uses_stale_copy(server, tmp_path):
+    _Handler.routes['/a'] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path, max_age=0)
+    path = cache.fetch(server.url + '/a')
+    _Handler.routes['/a'] = (503, None, b'', None)
+    assert cache.fetch(server.url + '/a') == path
+
+
+@pytest.mark.parametrize('status', [404, 410])
+def test_gone_removes_entry(server, tmp_path, status):
+    _Handler.routes['/a'] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path, max_age=0)
+    cache.fetch(server.url + '/a')
+    _Handler.routes['/a'] = (status, None, b'', None)
+    with pytest.raises(urllib.error.HTTPError):
+        cache.fetch(server.url + '/a')
+    assert cache.cached_path(server.url + '/a') is None
+    assert list(tmp_path.iterdir()) == []
+    assert cache._total == 0
+
+
+def test_network_error_uses_stale_copy(server, tmp_path):
+    _Handler.routes['/a'] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path, max_age=0, timeout=2)
+    path = cache.fetch(server.url + '/a')
+    server.shutdown()
+    server.server_close()
+    assert cache.fetch(server.url + '/a') == path
+
+
+def test_extension_change_removes_old_file(server, tmp_path):
+    _Handler.routes['/a'] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path, max_age=0)
+    old = cache.fetch(server.url + '/a')
+    _Handler.routes['/a'] = (200, 'image/jpeg', JPEG, None)
+    new = cache.fetch(server.url + '/a')
+    assert new.endswith('.jpg')
+    assert sorted(f.suffix for f in tmp_path.iterdir()) == ['.jpg', '.json']
+    assert not (tmp_path / old).exists()
+
+
+def test_total_size_is_capped(server, tmp_path):
+    for name in 'abcd':
+        _Handler.routes['/' + name] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path, max_bytes=3 * len(PNG))
+    for name in 'abcd':
+        cache.fetch(server.url + '/' + name)
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 3 * len(PNG)
+    assert cache._total == sum(f.stat().st_size for f in tmp_path.iterdir())
+    assert cache.cached_path(server.url + '/d') is not None
+    assert cache.cached_path(server.url + '/a') is None
+
+
+def test_too_large(server, tmp_path):
+    _Handler.routes['/big'] = (200, 'image/png', PNG, None)
+    cache = RemoteImageCache(tmp_path, max_image_bytes=10)
+    with pytest.raises(RemoteImageTooLarge):
+        cache.fetch(server.url + '/big')
+    assert not any(f.suffix == '.tmp' for f in tmp_path.iterdir())
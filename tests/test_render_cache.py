@@ -0,0 +1,70 @@
+import pytest
+
+from windows11toast import notification
+from windows11toast.enums import ImagePlacement, AudioEvent, ToastDuration
+from windows11toast.render_cache import enable_render_cache, disable_render_cache
+from windows11toast.templates import register_template, unregister_template
+
+BASE = {'title': 'Build', 'body': 'Finished', 'buttons': ['Open'], 'image_src': 'https://example.com/a.png',
+        'image_placement': ImagePlacement.HERO}
+
+TEMPLATE = '<toast scenario="{scenario}"><visual><binding template="ToastGeneric"></binding></visual></toast>'
+
+# One change to every rendered field / 每个渲染字段的一处改动
+VARIANTS = [
+    {'buttons': ['Open', 'Close']},
+    {'input_id': 'reply'},
+    {'selection_id': 'pick', 'selections': ['a', 'b']},
+    {'image_placement': ImagePlacement.INLINE},
+    {'audio': AudioEvent.REMINDER},
+    {'duration': ToastDuration.REMINDER},
+    {'duration': ToastDuration.LONG},
+    {'xml': 'render-cache-test'},
+    {'body': 'Failed'},
+    {'on_click': 'https://example.com'},
+]
+
+
+@pytest.fixture
+def shown(shell, monkeypatch):
+    xml = []
+    monkeypatch.setattr(notification, '_show',
+                        lambda notifier, toast, app_id: xml.append(toast.content.get_xml()) or True)
+    register_template('render-cache-test', TEMPLATE)
+    yield xml
+    unregister_template('render-cache-test')
+    disable_render_cache()
+
+
+def _render(shown, **options):
+    notification.notify(**dict(BASE, **options))
+    return shown[-1]
+
+
+def test_tag_and_group_hit_the_cache(shown):
+    cache = enable_render_cache()
+    first = _render(shown, tag='a', group='x')
+    second = _render(shown, tag='b', group='y')
+    assert first == second
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+@pytest.mark.parametrize('variant', VARIANTS, ids=lambda variant: '-'.join(f'{name}={value}' for name, value in variant.items()))
+def test_rendered_fields_miss_the_cache(shown, variant):
+    expected = _render(shown, **variant)
+    cache = enable_render_cache()
+    assert _render(shown) != expected
+    # A stale hit would reuse the base payload / 错误命中会复用基础负载
+    assert _render(shown, **variant) == expected
+    assert cache.stats()['misses'] == 2 and cache.stats()['hits'] == 0
+
+
+def test_stats_count_hits_and_misses(shown):
+    cache = enable_render_cache(max_entries=1)
+    _render(shown)
+    _render(shown)
+    _render(shown, body='Other')
+    _render(shown)
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'hit_rate': 0.25, 'size': 1, 'max_entries': 1}
+    cache.clear()
+    assert cache.stats()['hits'] == cache.stats()['misses'] == cache.stats()['size'] == 0
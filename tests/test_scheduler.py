@@ -0,0 +1,84 @@
+import logging
+import threading
+import time
+
+from windows11toast.metrics import enable_metrics, disable_metrics
+from windows11toast.ratelimit import enable_rate_limit, disable_rate_limit
+from windows11toast.scheduler import ToastScheduler
+
+
+def _wait(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_callbacks_run_in_due_order():
+    scheduler = ToastScheduler()
+    order = []
+    done = threading.Event()
+    now = time.time()
+    scheduler.call_at(now + 0.05, order.append, 'b')
+    scheduler.call_at(now + 0.02, order.append, 'a')
+    scheduler.call_at(now + 0.08, done.set)
+    assert done.wait(2.0)
+    assert order == ['a', 'b']
+
+
+def test_cancel_by_tag():
+    scheduler = ToastScheduler()
+    ran = []
+    scheduler.call_later(0.05, ran.append, 1, tag='t', app_id='app')
+    assert scheduler.cancel('t') == 1
+    time.sleep(0.1)
+    assert ran == [] and scheduler.pending() == 0
+
+
+def test_failing_callback_is_logged_and_counted(caplog):
+    metrics = enable_metrics()
+    try:
+        scheduler = ToastScheduler()
+        done = threading.Event()
+
+        def fail():
+            raise RuntimeError('boom')
+
+        with caplog.at_level(logging.ERROR, logger='windows11toast.scheduler'):
+            scheduler.call_later(0, fail, tag='t', app_id='app')
+            scheduler.call_later(0.02, done.set)
+            assert done.wait(2.0)
+        assert any('failed' in record.getMessage() for record in caplog.records)
+        failed = [counter for counter in metrics.as_dict()['counters'] if counter['name'] == 'toasts_failed_total']
+        assert failed == [{'name': 'toasts_failed_total',
+                           'labels': {'app_id': 'app', 'error_code': 'RuntimeError'}, 'value': 1}]
+    finally:
+        disable_metrics()
+
+
+def test_limits_and_metrics_keep_windows_scheduling(shell):
+    from windows11toast.notification import notify
+
+    metrics = enable_metrics()
+    enable_rate_limit(rate=100.0)
+    try:
+        notify('windows', delay=60, app_id='app')
+        assert len(shell.scheduled) == 1
+        scheduled = [counter for counter in metrics.as_dict()['counters'] if counter['name'] == 'toasts_scheduled_total']
+        assert scheduled == [{'name': 'toasts_scheduled_total', 'labels': {'app_id': 'app'}, 'value': 1}]
+    finally:
+        disable_rate_limit()
+        disable_metrics()
+
+
+def test_refused_schedules_fall_back_to_the_local_timer(shell, monkeypatch):
+    from windows11toast.memory_winrt import ToastNotifier
+    from windows11toast.notification import notify
+
+    def refuse(notifier, scheduled):
+        raise OSError('scheduling is not supported')
+
+    monkeypatch.setattr(ToastNotifier, 'add_to_schedule', refuse)
+    notify('local', delay=0.05)
+    assert shell.scheduled == []
+    assert _wait(lambda: shell.shown == 1)
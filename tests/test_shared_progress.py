@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+
+from windows11toast import shared_progress
+from windows11toast.enums import ImagePlacement
+from windows11toast.shared_progress import SharedProgressStore
+
+
+class _NoMutex:
+    """Stand-in for the Windows named mutex; the tests run in one thread / Windows命名互斥体的替身；测试在单线程中运行"""
+
+    def __init__(self, name):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def open_store(monkeypatch):
+    monkeypatch.setattr(shared_progress, '_NamedMutex', _NoMutex)
+    name = f'w11p-test-{uuid.uuid4().hex[:8]}'
+    stores = []
+
+    def open_store(**options):
+        store = SharedProgressStore(name, **options)
+        stores.append(store)
+        return store
+
+    yield open_store
+    stores[0]._memory.unlink()
+    for store in stores:
+        store.close()
+
+
+def test_records_round_trip_with_enum_values(open_store):
+    store = open_store()
+    assert store.publish('t', {'title': 'Copy', 'image_placement': ImagePlacement.HERO}) == 1
+    assert store.get('t') == ({'title': 'Copy', 'image_placement': 'hero'}, 1)
+    assert store.get('missing') is None
+
+
+def test_update_increments_the_sequence(open_store):
+    store = open_store()
+    assert store.update('t', {'body': 'x'}) is None
+    store.publish('t', {'body': 'start'})
+    assert store.update('t', {'body': 'half'}) == ({'body': 'half'}, 2)
+    # Publishing again keeps the sequence number / 再次发布保留序列号
+    assert store.publish('t', {'body': 'half'}) == 2
+
+
+def test_publish_keeps_updates_from_other_processes(open_store):
+    first, second = open_store(), open_store()
+    first.publish('t', {'body': 'start', 'progress_title': 'Copy'})
+    first.update('t', {'body': 'first'})
+    second.update('t', {'body': 'second'})
+    # The first process shows its own update / 第一个进程显示自己的更新
+    assert first.publish('t', {'body': 'first', 'progress_title': 'Copy'}) == 3
+    assert second.get('t') == ({'body': 'second', 'progress_title': 'Copy'}, 3)
+    # Fields the first process did change are still written / 第一个进程确实更改的字段仍会写入
+    first.publish('t', {'body': 'first', 'progress_title': 'Move'})
+    assert second.get('t')[0] == {'body': 'second', 'progress_title': 'Move'}
+
+
+def test_payload_and_tag_size_errors(open_store):
+    store = open_store(slots=2, record_size=256)
+    with pytest.raises(ValueError, match='bytes'):
+        store.publish('t', {'body': 'x' * 256})
+    with pytest.raises(ValueError, match='tag'):
+        store.publish('t' * 200, {})
+
+
+def test_least_recently_written_record_is_reused(open_store):
+    store = open_store(slots=1)
+    store.publish('a', {'body': 'a'})
+    store.publish('b', {'body': 'b'})
+    assert store.get('a') is None
+    store.remove('b')
+    assert store.get('b') is None
@@ -0,0 +1,75 @@
+import pytest
+
+from windows11toast import notification, templates
+from windows11toast.templates import TemplateCache, register_template, unregister_template
+
+TEMPLATE = ('<toast scenario="{scenario}"><visual><binding template="ToastGeneric">'
+            '<text>Fixed</text></binding></visual></toast>')
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    count = []
+    load_xml = templates.XmlDocument.load_xml
+
+    def counting_load_xml(document, xml):
+        count.append(xml)
+        load_xml(document, xml)
+
+    monkeypatch.setattr(templates.XmlDocument, 'load_xml', counting_load_xml)
+    return count
+
+
+def test_register_parses_once_and_clones(parses):
+    cache = TemplateCache()
+    cache.register('t', TEMPLATE)
+    first = cache.document('t')
+    second = cache.document('t')
+    assert len(parses) == 1
+    assert first is not second and first.get_xml() == second.get_xml()
+    assert cache.stats() == {'templates': 1, 'parsed': 1, 'hits': 2, 'misses': 1}
+
+
+def test_scenarios_are_parsed_separately(parses):
+    cache = TemplateCache()
+    cache.register('t', TEMPLATE)
+    assert 'scenario="reminder"' in cache.document('t', 'reminder').get_xml()
+    assert len(parses) == 2
+
+
+def test_invalidate_and_reregister_parse_again(parses):
+    cache = TemplateCache()
+    cache.register('t', TEMPLATE)
+    cache.invalidate('t')
+    cache.document('t')
+    assert len(parses) == 2
+    cache.register('t', TEMPLATE.replace('Fixed', 'Changed'))
+    assert 'Changed' in cache.document('t').get_xml()
+
+
+def test_unregister_removes_the_template():
+    cache = TemplateCache()
+    cache.register('t', TEMPLATE)
+    cache.unregister('t')
+    assert 't' not in cache
+    assert cache.stats()['parsed'] == 0
+    with pytest.raises(KeyError):
+        cache.document('t')
+
+
+@pytest.mark.parametrize('xml', ['<tile/>', '<toast>', '<toast scenario="{0}"/>'])
+def test_register_rejects_invalid_templates(xml):
+    with pytest.raises(ValueError):
+        TemplateCache().register('t', xml)
+
+
+def test_notify_renders_a_registered_template(shell, monkeypatch):
+    shown = []
+    monkeypatch.setattr(notification, '_show',
+                        lambda notifier, toast, app_id: shown.append(toast.content.get_xml()) or True)
+    register_template('templates-test', TEMPLATE)
+    try:
+        notification.notify('Title', xml='templates-test')
+    finally:
+        unregister_template('templates-test')
+    assert '<text>Fixed</text>' in shown[0] and '<text>Title</text>' in shown[0]
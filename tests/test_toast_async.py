@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from windows11toast.notification import notify, toast_async
+from windows11toast.ratelimit import RateLimitExceeded, enable_rate_limit, disable_rate_limit
+from windows11toast.spec import ToastSpec
+
+
+@pytest.fixture
+def raise_limit():
+    yield enable_rate_limit(rate=0.001, burst=1, policy='raise')
+    disable_rate_limit()
+
+
+def test_rate_limit_error_propagates(shell, raise_limit):
+    notify(ToastSpec('first'))
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(toast_async('second'))
+    assert shell.shown == 1
+
+
+def test_show_error_propagates(shell, monkeypatch):
+    def fail(notification):
+        raise OSError('show failed')
+
+    monkeypatch.setattr(shell, 'show', fail)
+    with pytest.raises(OSError, match='show failed'):
+        asyncio.run(toast_async('hello'))
+
+
+def test_cancel_propagates(shell):
+    async def main():
+        task = asyncio.ensure_future(toast_async('hello'))
+        while not shell.shown:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(main(), 5))
@@ -0,0 +1,52 @@
+import pytest
+
+from windows11toast.constants import MAX_PAYLOAD_BYTES, MAX_BUTTONS, MAX_INPUTS
+from windows11toast.validation import (
+    validate_payload, estimate_payload_size, enable_validation, disable_validation, ToastPayloadError,
+    VALIDATE_TRUNCATE
+)
+
+
+def test_strict_raises():
+    with pytest.raises(ToastPayloadError):
+        validate_payload({'title': 'x', 'buttons': ['b'] * (MAX_BUTTONS + 1)})
+
+
+def test_truncate_shortens_text():
+    payload = validate_payload({'title': 'T', 'body': 'x' * MAX_PAYLOAD_BYTES}, VALIDATE_TRUNCATE)
+    assert payload['body'].endswith('…')
+    assert estimate_payload_size(payload) <= MAX_PAYLOAD_BYTES
+
+
+def test_truncate_raises_when_text_is_not_enough():
+    with pytest.raises(ToastPayloadError):
+        validate_payload({'title': 'T', 'body': 'b', 'image_src': 'x' * MAX_PAYLOAD_BYTES}, VALIDATE_TRUNCATE)
+
+
+def test_truncated_progress_title_reaches_progress_data(shell, monkeypatch):
+    from windows11toast import notification
+
+    shown = []
+    monkeypatch.setattr(notification, '_show', lambda notifier, toast, app_id: shown.append(toast) or True)
+    enable_validation(VALIDATE_TRUNCATE)
+    try:
+        notification.notify(progress_title='p' * MAX_PAYLOAD_BYTES, progress_value=0.5, tag='long-progress')
+    finally:
+        disable_validation()
+    title = shown[0].data.values['title']
+    assert title.endswith('…') and len(title) < MAX_PAYLOAD_BYTES
+    assert notification._notification_cache['long-progress']['progress_title'] == title
+
+
+def test_truncate_trims_selections_to_the_input_limit():
+    selections = [(f's{i}', ('a', 'b')) for i in range(MAX_INPUTS + 2)]
+    payload = validate_payload({'title': 'T', 'selection_inputs': selections}, VALIDATE_TRUNCATE)
+    assert payload['selection_inputs'] == selections[:MAX_INPUTS]
+
+
+def test_truncate_trims_selections_before_text_inputs():
+    inputs = [('reply', None)]
+    selections = [(f's{i}', ('a', 'b')) for i in range(7)]
+    payload = validate_payload({'title': 'T', 'inputs': inputs, 'selection_inputs': selections}, VALIDATE_TRUNCATE)
+    assert payload['inputs'] == inputs
+    assert payload['selection_inputs'] == selections[:MAX_INPUTS - 1]